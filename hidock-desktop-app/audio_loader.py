@@ -0,0 +1,288 @@
+"""
+Audio File Loader for the HiDock Desktop Application.
+
+Decodes recordings to float sample arrays through the cheapest reader that
+can handle them, chosen by probing the file header:
+- WAV files are memory-mapped with scipy and converted in one pass
+- Other formats (and WAV encodings scipy cannot map) go through soundfile
+- Formats libsndfile does not know are decoded by piping through ffmpeg
+- librosa is the last resort and is only imported when a file needs it
+Multichannel audio is mixed down to mono into a single output buffer, so no
+float copy of every channel is made. Long files can also be read block by
+block and written back incrementally as 16-bit PCM.
+"""
+
+import importlib
+import shutil
+import subprocess
+import wave
+from typing import Callable, Iterator, Optional, Tuple
+
+import numpy as np
+from scipy.io import wavfile
+
+try:
+    import soundfile as sf
+except ImportError:
+    sf = None
+
+from config_and_logger import logger
+
+# Formats identified from the first bytes of a file
+FORMAT_WAV = "wav"
+FORMAT_FLAC = "flac"
+FORMAT_OGG = "ogg"
+FORMAT_MP3 = "mp3"
+FORMAT_MP4 = "mp4"
+
+_librosa = None
+
+
+def probe_format(file_path: str) -> Optional[str]:
+    """Identify the container of an audio file from its header, or None if unknown."""
+    with open(file_path, "rb") as f:
+        return format_from_header(f.read(12))
+
+
+def format_from_header(header: bytes) -> Optional[str]:
+    """Identify an audio container from the first (at least 12) bytes of a file, or None if unknown."""
+    if header[:4] in (b"RIFF", b"RIFX") and header[8:12] == b"WAVE":
+        return FORMAT_WAV
+    if header[:4] == b"fLaC":
+        return FORMAT_FLAC
+    if header[:4] == b"OggS":
+        return FORMAT_OGG
+    if header[:3] == b"ID3" or (len(header) >= 2 and header[0] == 0xFF and header[1] & 0xE0 == 0xE0):
+        return FORMAT_MP3
+    if header[4:8] == b"ftyp":
+        return FORMAT_MP4
+    return None
+
+
+def load_audio(file_path: str, dtype=np.float32, mono: bool = True) -> Tuple[np.ndarray, int]:
+    """
+    Load an audio file as floating point samples in [-1, 1)
+
+    Args:
+        file_path: Path to the audio file
+        dtype: float32 or float64
+        mono: Mix multichannel audio down to one channel
+
+    Returns:
+        Tuple of (samples, sample rate). Samples are 1-D when mono is True,
+        otherwise shaped (frames, channels) for multichannel files.
+    """
+    dtype = np.dtype(dtype)
+    file_format = probe_format(file_path)
+    errors = []
+
+    loaders = []
+    if file_format == FORMAT_WAV:
+        loaders.append(_load_wav_mmap)
+    if sf is not None:
+        loaders.append(_load_soundfile)
+    if file_format not in (FORMAT_WAV, FORMAT_FLAC, FORMAT_OGG) and shutil.which("ffmpeg") and shutil.which("ffprobe"):
+        loaders.append(_load_ffmpeg)
+    loaders.append(_load_librosa)
+
+    for loader in loaders:
+        try:
+            return loader(file_path, dtype, mono)
+        except Exception as e:
+            errors.append(f"{loader.__name__}: {e}")
+
+    raise ValueError(f"No decoder could read {file_path} ({'; '.join(errors)})")
+
+
+def open_audio_stream(
+    file_path: str, block_size: int, mono: bool = True, start_time: float = 0.0
+) -> Tuple[int, int, int, Callable[[], Iterator[np.ndarray]]]:
+    """
+    Open an audio file for block-wise reading
+
+    Returns:
+        Tuple of (sample rate, number of frames in the file, channels per
+        block, function returning an iterator over float32 blocks of
+        block_size frames starting start_time seconds in). Blocks are 1-D
+        when mono is True, otherwise (frames, channels).
+    """
+    if probe_format(file_path) == FORMAT_WAV:
+        try:
+            # Memory-mapped, so only the block being converted is read into memory
+            sample_rate, data = wavfile.read(file_path, mmap=True)
+            channels = 1 if mono or data.ndim == 1 else data.shape[1]
+
+            def read_blocks():
+                for start in range(min(int(start_time * sample_rate), len(data)), len(data), block_size):
+                    yield to_float(data[start : start + block_size], np.float32, mono)
+
+            return sample_rate, len(data), channels, read_blocks
+        except ValueError:
+            if sf is None:
+                raise
+
+    if sf is not None:
+        try:
+            info = sf.info(file_path)
+        except sf.SoundFileError as e:
+            # Formats libsndfile does not know (m4a, aac); callers fall back to load_audio
+            raise ValueError(f"Unsupported audio format for streaming: {file_path} ({e})") from e
+        channels = 1 if mono else info.channels
+
+        def read_blocks():
+            with sf.SoundFile(file_path) as audio_file:
+                if start_time:
+                    audio_file.seek(min(int(start_time * info.samplerate), info.frames))
+                for block in audio_file.blocks(blocksize=block_size, dtype="float32", always_2d=True):
+                    if mono:
+                        yield block.mean(axis=1, dtype=np.float32)
+                    else:
+                        yield block if info.channels > 1 else block[:, 0]
+
+        return info.samplerate, info.frames, channels, read_blocks
+
+    raise ValueError(f"Unsupported audio format for streaming: {file_path}")
+
+
+class PCM16BlockWriter:
+    """Write 16-bit audio incrementally, via soundfile when available"""
+
+    def __init__(self, output_path: str, sample_rate: int, channels: int = 1):
+        if sf is not None:
+            self._file = sf.SoundFile(output_path, "w", samplerate=sample_rate, channels=channels, subtype="PCM_16")
+            self._wave = None
+        else:
+            self._file = None
+            self._wave = wave.open(output_path, "wb")
+            self._wave.setnchannels(channels)
+            self._wave.setsampwidth(2)
+            self._wave.setframerate(sample_rate)
+
+    def write(self, block: np.ndarray):
+        if self._file is not None:
+            self._file.write(block)
+        else:
+            self._wave.writeframes((np.clip(block, -1.0, 1.0) * 32767).astype("<i2").tobytes())
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        else:
+            self._wave.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def pcm_scale(samples: np.ndarray) -> Tuple[float, float]:
+    """Offset and scale that map integer PCM samples to [-1, 1): (x - offset) * scale."""
+    if samples.dtype == np.uint8:
+        return 128.0, 1.0 / 128.0
+    if np.issubdtype(samples.dtype, np.integer):
+        return 0.0, 1.0 / float(2 ** (8 * samples.dtype.itemsize - 1))
+    return 0.0, 1.0
+
+
+def to_float(samples: np.ndarray, dtype=np.float32, mono: bool = True) -> np.ndarray:
+    """
+    Convert PCM or float samples to dtype, mixing channels into one buffer
+
+    With mono set, channels are accumulated one at a time into the output
+    array, so a stereo int16 file costs one float buffer of frames samples
+    rather than a float (frames, 2) copy plus the mean.
+    """
+    dtype = np.dtype(dtype)
+    offset, scale = pcm_scale(samples)
+
+    if samples.ndim == 1 or not mono:
+        out = samples.astype(dtype)
+    else:
+        channels = samples.shape[1]
+        out = samples[:, 0].astype(dtype)
+        for channel in range(1, channels):
+            np.add(out, samples[:, channel], out=out, casting="unsafe")
+        offset *= channels
+        scale /= channels
+
+    if offset:
+        out -= dtype.type(offset)
+    if scale != 1.0:
+        out *= dtype.type(scale)
+    return out
+
+
+def _load_wav_mmap(file_path: str, dtype: np.dtype, mono: bool) -> Tuple[np.ndarray, int]:
+    """PCM and float WAV through a memory map; only the converted output is allocated."""
+    sample_rate, data = wavfile.read(file_path, mmap=True)
+    try:
+        return to_float(data, dtype, mono), sample_rate
+    finally:
+        del data
+
+
+def _load_soundfile(file_path: str, dtype: np.dtype, mono: bool) -> Tuple[np.ndarray, int]:
+    info = sf.info(file_path)
+    if info.channels == 1 or not mono:
+        data, sample_rate = sf.read(file_path, dtype=dtype.name)
+        return data, sample_rate
+
+    # Mix blocks into the output instead of reading every channel at once
+    out = np.empty(info.frames, dtype=dtype)
+    position = 0
+    with sf.SoundFile(file_path) as audio_file:
+        for block in audio_file.blocks(blocksize=65536, dtype=dtype.name, always_2d=True):
+            end = position + len(block)
+            np.sum(block, axis=1, out=out[position:end])
+            position = end
+    out = out[:position]
+    out *= dtype.type(1.0 / info.channels)
+    return out, info.samplerate
+
+
+def _load_ffmpeg(file_path: str, dtype: np.dtype, mono: bool) -> Tuple[np.ndarray, int]:
+    """Decode with ffmpeg to raw float32 on a pipe, keeping the native sample rate."""
+    probe = subprocess.run(
+        [
+            "ffprobe",
+            "-v",
+            "error",
+            "-select_streams",
+            "a:0",
+            "-show_entries",
+            "stream=sample_rate,channels",
+            "-of",
+            "csv=p=0",
+            file_path,
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=30,
+    )
+    sample_rate, channels = (int(value) for value in probe.stdout.strip().split(",")[:2])
+
+    command = ["ffmpeg", "-v", "error", "-i", file_path, "-f", "f32le", "-acodec", "pcm_f32le"]
+    if mono:
+        command += ["-ac", "1"]
+    decoded = subprocess.run(command + ["-"], capture_output=True, check=True)
+
+    data = np.frombuffer(decoded.stdout, dtype="<f4")
+    if not mono and channels > 1:
+        data = data.reshape(-1, channels)
+    return data.astype(dtype), sample_rate
+
+
+def _load_librosa(file_path: str, dtype: np.dtype, mono: bool) -> Tuple[np.ndarray, int]:
+    global _librosa
+    if _librosa is None:
+        try:
+            _librosa = importlib.import_module("librosa")
+        except ImportError:
+            raise ValueError(f"Unsupported audio format: {file_path}")
+        logger.info("audio_loader", "_load_librosa", "Imported librosa for formats the fast loaders cannot read")
+
+    data, sample_rate = _librosa.load(file_path, sr=None, mono=mono, dtype=dtype)
+    return (data.T if data.ndim > 1 else data), sample_rate
@@ -13,13 +13,13 @@ Requirements: 9.3, 9.1, 9.2
 import os
 import queue
 import threading
+import time
 import wave
 from dataclasses import dataclass
 from enum import Enum
 from typing import Callable, Dict, List, Optional, Tuple
 
 import numpy as np
-from scipy.io import wavfile
 
 try:
     import pygame
@@ -39,7 +39,13 @@ except ImportError:
     pydub = None
     PYDUB_AVAILABLE = False
 
+from audio_probe import probe_audio
 from config_and_logger import logger
+from progressive_download import ProgressiveDownload
+from speed_renditions import SEGMENT_SECONDS, RenditionSegment, SpeedRenditionCache, SpeedSegmentStream
+from storage_management import record_file_access
+from track_preloader import TrackPreloader
+from waveform_peaks import WaveformPeaks, get_peak_pyramid
 
 
 class PlaybackState(Enum):
@@ -82,6 +88,63 @@ class PlaybackPosition:
     percentage: float
 
 
+class PlaybackClock:
+    """
+    Recording position computed on demand from a monotonic clock
+
+    The position is the anchor position plus the time since the anchor
+    times the speed, so it does not drift the way per-tick deltas summed
+    over a long recording do.
+    """
+
+    def __init__(self):
+        self.speed = 1.0
+        self._anchor_position = 0.0
+        self._anchor_time: Optional[float] = None  # None while stopped or paused
+
+    @property
+    def running(self) -> bool:
+        return self._anchor_time is not None
+
+    @property
+    def position(self) -> float:
+        if self._anchor_time is None:
+            return self._anchor_position
+        return self._anchor_position + (time.monotonic() - self._anchor_time) * self.speed
+
+    def start(self):
+        if self._anchor_time is None:
+            self._anchor_time = time.monotonic()
+
+    def stop(self):
+        self._anchor_position = self.position
+        self._anchor_time = None
+
+    def set_position(self, position: float):
+        self._anchor_position = position
+        if self._anchor_time is not None:
+            self._anchor_time = time.monotonic()
+
+    def set_speed(self, speed: float):
+        self.set_position(self.position)
+        self.speed = speed
+
+    def time_until(self, position: float) -> float:
+        """Wall-clock seconds until position is reached (infinite while stopped)."""
+        if self._anchor_time is None:
+            return float("inf")
+        return (position - self.position) / self.speed
+
+
+@dataclass
+class PositionListener:
+    """A position callback and how often it wants to be called"""
+
+    callback: Callable[[PlaybackPosition], None]
+    interval: float  # Seconds
+    next_due: float = 0.0  # time.monotonic() of the next call
+
+
 class AudioProcessor:
     """Utility class for audio processing and conversion"""
 
@@ -102,6 +165,19 @@ class AudioProcessor:
                 "bitrate": 0,
             }
 
+            # Read the container headers; decoding is only needed for unknown formats
+            probed = probe_audio(filepath)
+            if probed is not None:
+                info.update(
+                    {
+                        "duration": probed.duration,
+                        "sample_rate": probed.sample_rate,
+                        "channels": probed.channels,
+                        "bitrate": probed.bitrate,
+                    }
+                )
+                return info
+
             # Try to get detailed info using pydub if available
             if PYDUB_AVAILABLE:
                 try:
@@ -208,58 +284,24 @@ class AudioProcessor:
 
     @staticmethod
     def extract_waveform_data(filepath: str, max_points: int = 1000) -> Tuple[np.ndarray, int]:
-        """Extract waveform data for visualization"""
+        """
+        Extract waveform data for visualization
+
+        Returns alternating min and max peaks (at most max_points values) so
+        drawing them as a line shows the full envelope, including transients
+        that plain decimation would skip. Peaks come from the cached peak
+        pyramid, so only the first call for a file decodes it.
+        """
         try:
-            if filepath.lower().endswith(".wav"):
-                sample_rate, data = wavfile.read(filepath)
-
-                # Convert to mono if stereo
-                if len(data.shape) > 1:
-                    data = np.mean(data, axis=1)
-
-                # Downsample for visualization if needed
-                if len(data) > max_points:
-                    step = len(data) // max_points
-                    data = data[::step]
-
-                # Normalize to [-1, 1]
-                if data.dtype == np.int16:
-                    data = data.astype(np.float32) / 32768.0
-                elif data.dtype == np.int32:
-                    data = data.astype(np.float32) / 2147483648.0
-
-                return data, sample_rate
-
-            elif PYDUB_AVAILABLE:
-                audio = AudioSegment.from_file(filepath)
-
-                # Convert to numpy array
-                samples = audio.get_array_of_samples()
-                data = np.array(samples, dtype=np.float32)
-
-                # Convert to mono if stereo
-                if audio.channels == 2:
-                    data = data.reshape((-1, 2))
-                    data = np.mean(data, axis=1)
-
-                # Normalize
-                data = data / (2 ** (audio.sample_width * 8 - 1))
-
-                # Downsample for visualization
-                if len(data) > max_points:
-                    step = len(data) // max_points
-                    data = data[::step]
-
-                return data, audio.frame_rate
-
-            else:
-                logger.error(
-                    "AudioProcessor",
-                    "extract_waveform_data",
-                    "No audio processing library available",
-                )
+            peaks = AudioProcessor.get_waveform_peaks(filepath, width=max(max_points // 2, 1))
+            if peaks is None:
                 return np.array([]), 0
 
+            data = np.empty(2 * len(peaks.mins), dtype=np.float32)
+            data[0::2] = peaks.mins
+            data[1::2] = peaks.maxs
+            return data, peaks.sample_rate
+
         except Exception as e:
             logger.error(
                 "AudioProcessor",
@@ -268,6 +310,21 @@ class AudioProcessor:
             )
             return np.array([]), 0
 
+    @staticmethod
+    def get_waveform_peaks(
+        filepath: str, start_time: float = 0.0, end_time: Optional[float] = None, width: int = 1000
+    ) -> Optional[WaveformPeaks]:
+        """Min/max/RMS peaks of a time range of a file at up to width points"""
+        try:
+            return get_peak_pyramid(filepath).viewport(start_time, end_time, width)
+        except Exception as e:
+            logger.error(
+                "AudioProcessor",
+                "get_waveform_peaks",
+                f"Error reading waveform peaks for {filepath}: {e}",
+            )
+            return None
+
 
 class AudioPlaylist:
     """Manages a playlist of audio tracks"""
@@ -278,6 +335,7 @@ class AudioPlaylist:
         self.repeat_mode: RepeatMode = RepeatMode.OFF
         self.shuffle_enabled: bool = False
         self._shuffle_history: List[int] = []
+        self._shuffle_next: Optional[Tuple[int, int]] = None  # (from index, drawn next index)
 
     def add_track(self, filepath: str) -> bool:
         """Add a track to the playlist"""
@@ -310,6 +368,7 @@ class AudioPlaylist:
         try:
             if 0 <= index < len(self.tracks):
                 track = self.tracks.pop(index)
+                self._shuffle_next = None
 
                 # Adjust current index if necessary
                 if index < self.current_index:
@@ -348,6 +407,25 @@ class AudioPlaylist:
         else:
             return self._next_sequential_track()
 
+    def peek_next_track(self) -> Optional[AudioTrack]:
+        """The track next_track() will move to, without moving"""
+        if not self.tracks:
+            return None
+
+        if self.repeat_mode == RepeatMode.ONE:
+            return self.get_current_track()
+
+        if self.shuffle_enabled:
+            if len(self.tracks) <= 1:
+                return self.get_current_track()
+            return self.tracks[self._draw_shuffle_index()]
+
+        if self.current_index < len(self.tracks) - 1:
+            return self.tracks[self.current_index + 1]
+        if self.repeat_mode == RepeatMode.ALL:
+            return self.tracks[0]
+        return None
+
     def previous_track(self) -> Optional[AudioTrack]:
         """Move to the previous track"""
         if not self.tracks:
@@ -382,15 +460,26 @@ class AudioPlaylist:
         if self.current_index >= 0:
             self._shuffle_history.append(self.current_index)
 
-        # Generate next random index (different from current)
+        self.current_index = self._draw_shuffle_index()
+        self._shuffle_next = None
+        return self.get_current_track()
+
+    def _draw_shuffle_index(self) -> int:
+        """Random next index (different from current), drawn once so peeking and moving agree"""
+        if self._shuffle_next is not None:
+            from_index, next_index = self._shuffle_next
+            if from_index == self.current_index and next_index < len(self.tracks):
+                return next_index
+
         import random
 
         available_indices = list(range(len(self.tracks)))
         if self.current_index >= 0:
             available_indices.remove(self.current_index)
 
-        self.current_index = random.choice(available_indices)
-        return self.get_current_track()
+        next_index = random.choice(available_indices)
+        self._shuffle_next = (self.current_index, next_index)
+        return next_index
 
     def set_current_track(self, index: int) -> Optional[AudioTrack]:
         """Set the current track by index"""
@@ -404,6 +493,7 @@ class AudioPlaylist:
         self.tracks.clear()
         self.current_index = -1
         self._shuffle_history.clear()
+        self._shuffle_next = None
 
     def get_total_duration(self) -> float:
         """Get total duration of all tracks in playlist"""
@@ -413,23 +503,46 @@ class AudioPlaylist:
 class EnhancedAudioPlayer:
     """Enhanced audio player with advanced features"""
 
+    QUEUE_AHEAD_SECONDS = 3.0  # Queue the next track this long before the current one ends
+    POSITION_NOTIFY_INTERVAL = 0.1  # Seconds between on_position_changed calls during playback
+    MIXER_CHECK_INTERVAL = 1.0  # Longest the position worker sleeps without checking the mixer
+    END_GRACE_SECONDS = 0.5  # How long past the expected end the mixer may keep playing
+
     def __init__(self, parent_widget=None):
         self.parent = parent_widget
         self.playlist = AudioPlaylist()
         self.state = PlaybackState.STOPPED
+        self.clock = PlaybackClock()
+        self._timeline_changed = threading.Event()  # Wakes the position worker early
         self.current_position = 0.0
         self.volume = 0.7
         self.playback_speed = 1.0
         self.is_muted = False
         self.previous_volume = self.volume
 
-        # Threading and events
+        # Speed renditions: cached complete files, or segments streamed from the position
+        self.speed_renditions = SpeedRenditionCache()
+        self._segment_stream: Optional[SpeedSegmentStream] = None
+        self._queued_segment: Optional[RenditionSegment] = None
+
+        # The upcoming track is prepared ahead and queued behind the current one
+        self.preloader = TrackPreloader(self.speed_renditions)
+        self._queued_track: Optional[AudioTrack] = None
+
+        # Download of the loaded track when it is played while still arriving
+        self._download: Optional[ProgressiveDownload] = None
+
+        # Threading and events; the lock serializes changes to what the mixer plays
+        self._playback_lock = threading.RLock()
         self.position_update_thread = None
         self.stop_position_thread = threading.Event()
         self.position_queue = queue.Queue()
 
-        # Callbacks
+        # Callbacks; on_position_changed is called every POSITION_NOTIFY_INTERVAL,
+        # other position listeners at the interval they ask for
         self.on_position_changed: Optional[Callable[[PlaybackPosition], None]] = None
+        self._position_listeners: List[PositionListener] = []
+        self._on_position_changed_listener: Optional[PositionListener] = None  # Schedule of on_position_changed
         self.on_state_changed: Optional[Callable[[PlaybackState], None]] = None
         self.on_track_changed: Optional[Callable[[Optional[AudioTrack]], None]] = None
         self.on_playlist_changed: Optional[Callable[[], None]] = None
@@ -462,15 +575,36 @@ class EnhancedAudioPlayer:
                 f"Failed to initialize audio: {e}",
             )
 
-    def load_track(self, filepath: str) -> bool:
-        """Load a single track"""
+    @property
+    def current_position(self) -> float:
+        """Playback position in seconds of the recording"""
+        return self.clock.position
+
+    @current_position.setter
+    def current_position(self, position: float):
+        self.clock.set_position(position)
+        self._timeline_changed.set()
+
+    def add_position_listener(self, callback: Callable[[PlaybackPosition], None], interval: float = 0.25):
+        """Call callback with the position at most every interval seconds during playback"""
+        self._position_listeners.append(PositionListener(callback, interval))
+        self._timeline_changed.set()
+
+    def remove_position_listener(self, callback: Callable[[PlaybackPosition], None]):
+        self._position_listeners = [listener for listener in self._position_listeners if listener.callback != callback]
+
+    def load_track(self, filepath: str, download: Optional[ProgressiveDownload] = None) -> bool:
+        """Load a single track, optionally one that is still being downloaded to filepath"""
         try:
             # Stop previous playback and reset position
             self.stop()
             self.current_position = 0.0
             self.playlist.clear()
+            self._take_download(download)
 
             if self.playlist.add_track(filepath):
+                if download is not None:
+                    self.playlist.tracks[0].title = os.path.basename(download.output_path)
                 self.playlist.set_current_track(0)
                 # Reset position to zero when loading new track
                 self.current_position = 0.0
@@ -493,6 +627,7 @@ class EnhancedAudioPlayer:
         try:
             self.stop()
             self.playlist.clear()
+            self._take_download(None)
 
             loaded_count = 0
             for filepath in filepaths:
@@ -522,6 +657,7 @@ class EnhancedAudioPlayer:
 
             if self.state == PlaybackState.PAUSED:
                 pygame.mixer.music.unpause()
+                self.clock.start()
                 self._set_state(PlaybackState.PLAYING)
                 self._start_position_thread()
                 return True
@@ -529,37 +665,16 @@ class EnhancedAudioPlayer:
             elif self.state == PlaybackState.STOPPED:
                 self._set_state(PlaybackState.LOADING)
 
-                # Always load the original file for simplicity
-                # Speed adjustment will be handled by creating pre-processed files
-                file_to_load = current_track.filepath
-
-                if self.playback_speed != 1.0:
-                    # Create speed-adjusted audio file
-                    logger.info(
-                        "EnhancedAudioPlayer",
-                        "play",
-                        f"Attempting to create speed-adjusted file at {self.playback_speed}x",
-                    )
-                    if self._create_speed_adjusted_audio(current_track.filepath, self.playback_speed):
-                        file_to_load = self._get_temp_speed_file()
-                        logger.info(
-                            "EnhancedAudioPlayer",
-                            "play",
-                            f"Using speed-adjusted file: {file_to_load}",
-                        )
-                    else:
-                        logger.warning(
-                            "EnhancedAudioPlayer",
-                            "play",
-                            "Failed to create speed-adjusted file, using original",
-                        )
-
-                pygame.mixer.music.load(file_to_load)
-                pygame.mixer.music.play(start=self.current_position)
-                pygame.mixer.music.set_volume(self.volume if not self.is_muted else 0.0)
+                with self._playback_lock:
+                    start = self._load_playback_file(current_track, self.current_position)
+                    pygame.mixer.music.play(start=start)
+                    pygame.mixer.music.set_volume(self.volume if not self.is_muted else 0.0)
+                    self.clock.start()
 
                 self._set_state(PlaybackState.PLAYING)
                 self._start_position_thread()
+                record_file_access(current_track.filepath, "playback")
+                self._preload_next()
                 return True
 
             return False
@@ -574,6 +689,7 @@ class EnhancedAudioPlayer:
         try:
             if self.state == PlaybackState.PLAYING and PYGAME_AVAILABLE:
                 pygame.mixer.music.pause()
+                self.clock.stop()
                 self._set_state(PlaybackState.PAUSED)
                 self._stop_position_thread()
                 return True
@@ -585,8 +701,11 @@ class EnhancedAudioPlayer:
     def stop(self) -> bool:
         """Stop playback"""
         try:
-            if PYGAME_AVAILABLE and pygame.mixer.get_init():
-                pygame.mixer.music.stop()
+            with self._playback_lock:
+                if PYGAME_AVAILABLE and pygame.mixer.get_init():
+                    pygame.mixer.music.stop()
+                self._close_segment_stream()
+                self.clock.stop()
 
             self._set_state(PlaybackState.STOPPED)
             self.current_position = 0.0
@@ -609,24 +728,22 @@ class EnhancedAudioPlayer:
 
             was_playing = self.state == PlaybackState.PLAYING
 
-            if PYGAME_AVAILABLE:
-                pygame.mixer.music.stop()
-
-                # Load appropriate file (speed-adjusted or original)
-                file_to_load = current_track.filepath
-                if self.playback_speed != 1.0:
-                    if self._create_speed_adjusted_audio(current_track.filepath, self.playback_speed):
-                        file_to_load = self._get_temp_speed_file()
+            with self._playback_lock:
+                if PYGAME_AVAILABLE:
+                    pygame.mixer.music.stop()
 
-                pygame.mixer.music.load(file_to_load)
+                    # Load appropriate file (speed rendition or original)
+                    start = self._load_playback_file(current_track, position)
 
-                if was_playing:
-                    pygame.mixer.music.play(start=position)
-                    self._set_state(PlaybackState.PLAYING)
-                else:
-                    self._set_state(PlaybackState.STOPPED)
+                    if was_playing:
+                        pygame.mixer.music.play(start=start)
+                        self.clock.start()
+                        self._set_state(PlaybackState.PLAYING)
+                    else:
+                        self.clock.stop()
+                        self._set_state(PlaybackState.STOPPED)
 
-            self.current_position = position
+                self.current_position = position
             self._notify_position_changed()
             return True
 
@@ -714,10 +831,12 @@ class EnhancedAudioPlayer:
     def set_repeat_mode(self, mode: RepeatMode):
         """Set repeat mode"""
         self.playlist.repeat_mode = mode
+        self._preload_next()
 
     def set_shuffle(self, enabled: bool):
         """Enable or disable shuffle"""
         self.playlist.shuffle_enabled = enabled
+        self._preload_next()
 
     def set_playback_speed(self, speed: float) -> bool:
         """Set playback speed (0.25x to 2.0x)"""
@@ -726,6 +845,8 @@ class EnhancedAudioPlayer:
             speed = max(0.25, min(2.0, speed))
             old_speed = self.playback_speed
             self.playback_speed = speed
+            self.clock.set_speed(speed)
+            self._timeline_changed.set()
 
             logger.info(
                 "EnhancedAudioPlayer",
@@ -742,33 +863,18 @@ class EnhancedAudioPlayer:
                     f"Restarting playback at {current_position:.1f}s with new speed {speed}x",
                 )
 
-                # Stop current playback
-                pygame.mixer.music.stop()
+                with self._playback_lock:
+                    # Stop current playback
+                    pygame.mixer.music.stop()
 
-                # Create new speed-adjusted file if needed
-                current_track = self.playlist.get_current_track()
-                if current_track:
-                    file_to_load = current_track.filepath
-                    if speed != 1.0:
-                        if self._create_speed_adjusted_audio(current_track.filepath, speed):
-                            file_to_load = self._get_temp_speed_file()
-                            logger.info(
-                                "EnhancedAudioPlayer",
-                                "set_playback_speed",
-                                f"Created new speed-adjusted file: {file_to_load}",
-                            )
-                        else:
-                            logger.warning(
-                                "EnhancedAudioPlayer",
-                                "set_playback_speed",
-                                "Failed to create speed-adjusted file, using original",
-                            )
-
-                    # Load and play with new speed
-                    pygame.mixer.music.load(file_to_load)
-                    pygame.mixer.music.play(start=current_position)
-                    pygame.mixer.music.set_volume(self.volume if not self.is_muted else 0.0)
+                    # Continue from the same point of the recording at the new speed
+                    current_track = self.playlist.get_current_track()
+                    if current_track:
+                        start = self._load_playback_file(current_track, current_position)
+                        pygame.mixer.music.play(start=start)
+                        pygame.mixer.music.set_volume(self.volume if not self.is_muted else 0.0)
 
+            self._preload_next()
             return True
         except Exception as e:
             logger.error(
@@ -826,94 +932,37 @@ class EnhancedAudioPlayer:
     def _stop_position_thread(self):
         """Stop the position update thread"""
         self.stop_position_thread.set()
-        if self.position_update_thread and self.position_update_thread.is_alive():
-            self.position_update_thread.join(timeout=1.0)
+        self._timeline_changed.set()
+        thread = self.position_update_thread
+        if thread and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=1.0)
 
     def _position_update_worker(self):
-        """Worker thread for updating playback position"""
+        """
+        Worker thread that follows the playback timeline
+
+        Instead of ticking at a fixed rate, the worker sleeps until the next
+        thing that is due: a position listener, queuing the next segment or
+        track, or the end of the track. Seeks, speed changes and stops wake
+        it early, and the mixer is checked at least every MIXER_CHECK_INTERVAL.
+        """
         logger.debug(
             "EnhancedAudioPlayer",
             "_position_update_worker",
             "Position update thread started",
         )
 
-        # Track actual elapsed time for better accuracy
-        import time
-
-        last_update_time = time.time()
-
         while not self.stop_position_thread.is_set():
             try:
-                if self.state == PlaybackState.PLAYING and PYGAME_AVAILABLE:
-                    # Check if music is still playing
-                    music_busy = pygame.mixer.music.get_busy()
-
-                    if music_busy:
-                        # Use actual elapsed time for more accurate position tracking
-                        current_time = time.time()
-                        elapsed = current_time - last_update_time
-                        last_update_time = current_time
-
-                        # Update position based on actual elapsed time
-                        # When using speed-adjusted files, position tracking is 1:1 with real time
-                        self.current_position += elapsed
-
-                        current_track = self.playlist.get_current_track()
-                        if current_track:
-                            # Use the actual audio file duration, not device metadata
-                            actual_duration = current_track.duration
-
-                            if self.current_position >= actual_duration:
-                                # Track ended, move to next or stop
-                                if self.playlist.repeat_mode == RepeatMode.ONE:
-                                    self.current_position = 0.0
-                                    self.seek(0.0)
-                                    last_update_time = time.time()  # Reset timing
-                                else:
-                                    next_track = self.playlist.next_track()
-                                    if next_track:
-                                        self.current_position = 0.0
-                                        self._notify_track_changed()
-                                        self.play()
-                                        last_update_time = time.time()  # Reset timing
-                                    else:
-                                        self.stop()
-                                        break
-
-                        self._notify_position_changed()
-                    else:
-                        # Music stopped playing - check if we've reached the end
-                        current_track = self.playlist.get_current_track()
-                        if current_track and self.current_position >= (current_track.duration - 0.5):  # 0.5s tolerance
-                            # Track ended naturally
-                            logger.info(
-                                "EnhancedAudioPlayer",
-                                "_position_update_worker",
-                                f"Track ended at {self.current_position:.1f}s of {current_track.duration:.1f}s",
-                            )
-
-                            if self.playlist.repeat_mode == RepeatMode.ONE:
-                                self.current_position = 0.0
-                                self.seek(0.0)
-                                last_update_time = time.time()  # Reset timing
-                            else:
-                                next_track = self.playlist.next_track()
-                                if next_track:
-                                    self.current_position = 0.0
-                                    self._notify_track_changed()
-                                    self.play()
-                                    last_update_time = time.time()  # Reset timing
-                                else:
-                                    # No more tracks - stop playback
-                                    self.stop()
-                                    break
-                        else:
-                            # Music stopped for other reasons (manual stop, error)
-                            if self.state == PlaybackState.PLAYING:
-                                self.stop()
-                            break
-
-                time.sleep(0.05)  # Update every 50ms for smoother tracking
+                self._timeline_changed.clear()
+                with self._playback_lock:
+                    if self.state != PlaybackState.PLAYING or not PYGAME_AVAILABLE:
+                        break
+                    wait = self._advance_timeline()
+                    if wait is None:
+                        break
+                wait = min(wait, self._notify_due_position_listeners())
+                self._timeline_changed.wait(max(wait, 0.005))
 
             except Exception as e:
                 logger.error(
@@ -923,100 +972,240 @@ class EnhancedAudioPlayer:
                 )
                 break
 
-    def _create_speed_adjusted_audio(self, filepath: str, speed: float) -> bool:
-        """Create a temporary audio file with adjusted playback speed"""
-        try:
-            if not PYDUB_AVAILABLE:
-                logger.warning(
-                    "EnhancedAudioPlayer",
-                    "_create_speed_adjusted_audio",
-                    "Pydub not available - cannot create speed-adjusted audio",
-                )
-                return False
-
-            logger.info(
-                "EnhancedAudioPlayer",
-                "_create_speed_adjusted_audio",
-                f"Creating speed-adjusted audio: {speed}x from {filepath}",
-            )
-
-            # Load audio with pydub
-            audio = AudioSegment.from_file(filepath)
-
-            # Change speed by manipulating sample rate
-            if speed != 1.0:
-                # This approach changes both speed and pitch (like old tape players)
-                # First, we change the frame rate which effectively speeds up/slows down
-                new_sample_rate = int(audio.frame_rate * speed)
+    def _advance_timeline(self) -> Optional[float]:
+        """
+        Act on whatever is due at the current position
 
-                # Create new audio segment with modified frame rate
-                # This actually changes the playback speed
-                speed_adjusted_audio = audio._spawn(audio.raw_data, overrides={"frame_rate": new_sample_rate})
+        Returns:
+            Seconds until something is next due, or None once playback has ended
+        """
+        current_track = self.playlist.get_current_track()
+        if current_track is None:
+            self.stop()
+            return None
 
-                # Convert back to standard sample rate for pygame compatibility
-                speed_adjusted_audio = speed_adjusted_audio.set_frame_rate(44100)
+        position = self.current_position
+        duration = current_track.duration
+        wait = self.MIXER_CHECK_INTERVAL
+
+        # Once the queued segment has started, render and queue the one after it
+        if self._queued_segment is not None:
+            if position >= self._queued_segment.source_start:
+                self._queue_next_segment()
+            if self._queued_segment is not None:
+                wait = min(wait, self.clock.time_until(self._queued_segment.source_start))
+
+        # Queue the preloaded next track so the mixer moves on without a gap
+        if self._queued_track is None and self._queued_segment is None:
+            queue_at = duration - self.QUEUE_AHEAD_SECONDS * self.playback_speed
+            if position >= queue_at:
+                self._queue_next_track()
+                if self._queued_track is None:
+                    wait = min(wait, 0.25)  # Still preparing; try again shortly
             else:
-                # No speed change needed
-                speed_adjusted_audio = audio.set_frame_rate(44100)
-
-            # Get temporary file path
-            temp_file = self._get_temp_speed_file()
+                wait = min(wait, self.clock.time_until(queue_at))
+
+        if position < duration:
+            if not pygame.mixer.music.get_busy():
+                return self._handle_mixer_stopped(current_track)
+            return min(wait, self.clock.time_until(duration))
+
+        # The timeline has reached the end of the track
+        if self._queued_track is not None:
+            self._advance_to_queued_track()
+            return 0.0
+        if pygame.mixer.music.get_busy() and position < duration + self.END_GRACE_SECONDS * self.playback_speed:
+            return 0.05  # The mixer is finishing the last buffers
+        return self._start_following_track(current_track)
+
+    def _handle_mixer_stopped(self, current_track: AudioTrack) -> Optional[float]:
+        """The mixer went idle before the timeline reached the end of the track"""
+        if self._segment_stream is not None:
+            # Segments ran out before the next was queued; continue from here
+            pygame.mixer.music.play(start=self._load_playback_file(current_track, self.current_position))
+            return 0.0
+        if self.current_position >= current_track.duration - self.END_GRACE_SECONDS:
+            return self._start_following_track(current_track)
+        # Music stopped for other reasons (manual stop, error)
+        self.stop()
+        return None
 
-            # Clean up any existing temp file
-            if os.path.exists(temp_file):
-                try:
-                    os.remove(temp_file)
-                    logger.debug(
-                        "EnhancedAudioPlayer",
-                        "_create_speed_adjusted_audio",
-                        f"Removed existing temp file: {temp_file}",
-                    )
-                except Exception as e:
-                    logger.warning(
-                        "EnhancedAudioPlayer",
-                        "_create_speed_adjusted_audio",
-                        f"Could not remove existing temp file: {e}",
-                    )
+    def _start_following_track(self, finished_track: AudioTrack) -> Optional[float]:
+        """Start the track that follows finished_track, or stop at the end of the playlist"""
+        logger.info(
+            "EnhancedAudioPlayer",
+            "_position_update_worker",
+            f"Track ended at {self.current_position:.1f}s of {finished_track.duration:.1f}s",
+        )
+        next_track = self.playlist.next_track()
+        if next_track is None:
+            self.stop()
+            return None
 
-            # Export the speed-adjusted audio to WAV format
-            speed_adjusted_audio.export(temp_file, format="wav")
+        pygame.mixer.music.play(start=self._load_playback_file(next_track, 0.0))
+        self.current_position = 0.0
+        if next_track is not finished_track:
+            self._notify_track_changed()
+            record_file_access(next_track.filepath, "playback")
+        self._notify_position_changed()
+        self._preload_next()
+        return 0.0
+
+    def _notify_due_position_listeners(self) -> float:
+        """Call the listeners whose interval has passed; returns seconds until the next is due."""
+        listeners = list(self._position_listeners)
+        if self.on_position_changed:
+            listeners.append(self._default_position_listener())
+        if not listeners:
+            return float("inf")
+
+        now = time.monotonic()
+        due = [listener for listener in listeners if listener.next_due <= now]
+        if due:
+            position = self.get_position()
+            for listener in due:
+                listener.next_due = now + listener.interval
+                self._call_position_listener(listener.callback, position)
+        return min(listener.next_due for listener in listeners) - now
+
+    def _default_position_listener(self) -> PositionListener:
+        listener = self._on_position_changed_listener
+        if listener is None or listener.callback is not self.on_position_changed:
+            listener = PositionListener(self.on_position_changed, self.POSITION_NOTIFY_INTERVAL)
+            self._on_position_changed_listener = listener
+        return listener
+
+    def _load_playback_file(self, track: AudioTrack, position: float) -> float:
+        """
+        Load the file that plays track at the current speed from position
+
+        Speed 1.0 plays the original. Other speeds use the cached rendition
+        when there is one; otherwise playback starts on segments rendered from
+        position while the complete rendition is rendered in the background
+        for later plays and seeks. A track still downloading is read through
+        the download, which waits for (and fetches first) the bytes needed.
+
+        Returns:
+            Start offset in seconds within the loaded file
+        """
+        self._close_segment_stream()
+        self._queued_track = None  # Loading drops whatever the mixer had queued
+        speed = self.playback_speed
+
+        download = self._progressive_download(track)
+        downloading = download is not None and not download.is_complete
+        filepath = download.path if download is not None else track.filepath
+
+        prepared = None if downloading else self.preloader.get(filepath, speed)
+        if prepared is not None:
+            pygame.mixer.music.load(prepared.source(), prepared.namehint)
+            return position / speed
+
+        source = filepath if downloading else self.preloader.playable_source(filepath)
+        if speed == 1.0:
+            self.speed_renditions.cancel()  # A rendition for the previous speed is no longer needed
+            self._load_source(source, download if downloading else None)
+            return position
 
-            # Verify the file was created and has content
-            if os.path.exists(temp_file) and os.path.getsize(temp_file) > 0:
-                logger.info(
-                    "EnhancedAudioPlayer",
-                    "_create_speed_adjusted_audio",
-                    f"Successfully created speed-adjusted audio at {speed}x: {temp_file} "
-                    f"({os.path.getsize(temp_file)} bytes)",
-                )
-                return True
+        try:
+            if downloading:
+                # Segments are rendered from the part file, so wait for the audio around position
+                if not download.wait_for_time(position, 2 * SEGMENT_SECONDS, track.duration):
+                    raise IOError(f"Audio at {position:.1f}s has not arrived: {download.error or 'timed out'}")
             else:
-                logger.error(
-                    "EnhancedAudioPlayer",
-                    "_create_speed_adjusted_audio",
-                    f"Temp file was not created properly: {temp_file}",
-                )
-                return False
-
+                rendition = self.speed_renditions.get(source, speed)
+                if rendition:
+                    pygame.mixer.music.load(rendition)
+                    return position / speed
+                self.speed_renditions.render_async(source, speed)
+
+            self._segment_stream = SpeedSegmentStream(source, speed, position)
+            segment = self._segment_stream.next_segment()
+            if segment is not None:
+                pygame.mixer.music.load(segment.path)
+                self._queue_next_segment()
+                return 0.0
         except Exception as e:
-            logger.error(
+            logger.warning(
                 "EnhancedAudioPlayer",
-                "_create_speed_adjusted_audio",
-                f"Error creating speed-adjusted audio: {e}",
+                "_load_playback_file",
+                f"Failed to prepare {speed}x playback, using original: {e}",
             )
-            return False
 
-    def _get_temp_speed_file(self) -> str:
-        """Get the path for temporary speed-adjusted audio file"""
-        import tempfile
+        self._close_segment_stream()
+        self._load_source(source, download if downloading else None)
+        return position
 
-        return os.path.join(tempfile.gettempdir(), f"hidock_speed_adjusted_{self.playback_speed}x.wav")
+    def _load_source(self, source: str, download: Optional[ProgressiveDownload] = None):
+        if download is not None:
+            pygame.mixer.music.load(download.open(), download.namehint)
+        else:
+            pygame.mixer.music.load(source)
+
+    def _take_download(self, download: Optional[ProgressiveDownload]):
+        """Play from download from now on, cancelling the previous one so it releases the device"""
+        previous = self._download
+        self._download = download
+        if previous is not None and previous is not download:
+            previous.cancel()
+
+    def _progressive_download(self, track: AudioTrack) -> Optional[ProgressiveDownload]:
+        """The download the track is played from, if it was loaded while downloading"""
+        download = self._download
+        if download is not None and track.filepath in (download.part_path, download.output_path):
+            return download
+        return None
 
-        logger.debug(
-            "EnhancedAudioPlayer",
-            "_position_update_worker",
-            "Position update thread stopped",
-        )
+    def _queue_next_segment(self):
+        """Render the next streamed segment and queue it behind the playing one"""
+        segment = self._segment_stream.next_segment() if self._segment_stream else None
+        self._queued_segment = segment
+        if segment is not None:
+            pygame.mixer.music.queue(segment.path)
+
+    def _preload_next(self):
+        """Start preparing the track the playlist moves to next"""
+        next_track = self.playlist.peek_next_track()
+        if self._queued_track is not None and next_track is not self._queued_track:
+            # Repeat or shuffle changed; the position worker queues the new next track
+            self._queued_track = None
+        if next_track is not None:
+            self.preloader.preload(next_track.filepath, self.playback_speed)
+
+    def _queue_next_track(self):
+        """Queue the next track behind the current one once it is prepared"""
+        next_track = self.playlist.peek_next_track()
+        if next_track is None:
+            return
+        prepared = self.preloader.get(next_track.filepath, self.playback_speed)
+        if prepared is None:
+            self.preloader.preload(next_track.filepath, self.playback_speed)
+            return
+        pygame.mixer.music.queue(prepared.source(), prepared.namehint)
+        self._queued_track = next_track
+
+    def _advance_to_queued_track(self):
+        """Follow the mixer onto the queued track, keeping the time already played of it"""
+        previous_track = self.playlist.get_current_track()
+        queued_track = self._queued_track
+        self._queued_track = None
+        self._close_segment_stream()
+
+        self.playlist.next_track()
+        if self.playlist.get_current_track() is not queued_track and queued_track in self.playlist.tracks:
+            self.playlist.set_current_track(self.playlist.tracks.index(queued_track))
+        self.current_position = max(0.0, self.current_position - previous_track.duration)
+
+        if queued_track is not previous_track:
+            self._notify_track_changed()
+        record_file_access(queued_track.filepath, "playback")
+        self._preload_next()
+
+    def _close_segment_stream(self):
+        if self._segment_stream is not None:
+            self._segment_stream.close()
+        self._segment_stream = None
+        self._queued_segment = None
 
     def _set_state(self, new_state: PlaybackState):
         """Set playback state and notify listeners"""
@@ -1025,27 +1214,25 @@ class EnhancedAudioPlayer:
             self._notify_state_changed()
 
     def _notify_position_changed(self):
-        """Notify position change listeners"""
+        """Notify all position listeners now, e.g. after a seek or stop"""
+        callbacks = [listener.callback for listener in self._position_listeners]
         if self.on_position_changed:
-            try:
-                position = self.get_position()
-                logger.debug(
-                    "EnhancedAudioPlayer",
-                    "_notify_position_changed",
-                    f"Notifying position: {position.current_time:.1f}s",
-                )
-                self.on_position_changed(position)
-            except Exception as e:
-                logger.error(
-                    "EnhancedAudioPlayer",
-                    "_notify_position_changed",
-                    f"Error in position callback: {e}",
-                )
-        else:
-            logger.debug(
+            callbacks.append(self.on_position_changed)
+        if not callbacks:
+            return
+
+        position = self.get_position()
+        for callback in callbacks:
+            self._call_position_listener(callback, position)
+
+    def _call_position_listener(self, callback: Callable[[PlaybackPosition], None], position: PlaybackPosition):
+        try:
+            callback(position)
+        except Exception as e:
+            logger.error(
                 "EnhancedAudioPlayer",
                 "_notify_position_changed",
-                "No position callback registered",
+                f"Error in position callback: {e}",
             )
 
     def _notify_state_changed(self):
@@ -1090,6 +1277,9 @@ class EnhancedAudioPlayer:
         try:
             self.stop()
             self._stop_position_thread()
+            self._take_download(None)
+            self.preloader.shutdown()
+            self.speed_renditions.shutdown()
 
             if PYGAME_AVAILABLE and pygame.mixer.get_init():
                 pygame.mixer.quit()
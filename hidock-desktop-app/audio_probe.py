@@ -0,0 +1,289 @@
+"""
+Header-Only Audio Probing for the HiDock Desktop Application.
+
+Reads duration, sample rate, channels and bitrate from container headers
+instead of decoding the audio:
+- WAV: the RIFF fmt and data chunk headers
+- MPEG audio (HiDock .hda/.hta, .mp3): the first frame header, a Xing/Info or
+  VBRI frame count when present, otherwise the byte count for constant
+  bitrate files or a walk over the frame headers for variable bitrate ones
+- FLAC: the STREAMINFO block
+Results are cached by (path, mtime, size), so probing a file again is free
+until it changes. Any seekable binary file can be probed too, such as a
+recording still on the device opened as a DeviceFile.
+"""
+
+import io
+import mmap
+import os
+import struct
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from audio_loader import FORMAT_FLAC, FORMAT_MP3, FORMAT_WAV, format_from_header
+from config_and_logger import logger
+
+HEADER_READ_SIZE = 65536  # Bytes read to find headers, enough to skip typical ID3 tags and RIFF chunks
+CBR_CHECK_FRAMES = 16  # Frames whose bitrates must agree before a file is treated as constant bitrate
+MPEG_EXTENSIONS = (".hda", ".hta", ".mp3")  # Scanned for frames even when the file does not start with one
+
+# Bitrates in kb/s by (version, layer); MPEG-2.5 shares the MPEG-2 tables
+_MPEG_BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MPEG_SAMPLE_RATES = {1: (44100, 48000, 32000), 2: (22050, 24000, 16000), 25: (11025, 12000, 8000)}
+
+
+@dataclass
+class AudioInfo:
+    """Stream properties read from a file's headers"""
+
+    format: str
+    duration: float
+    sample_rate: int
+    channels: int
+    bitrate: int  # Bits per second
+
+
+@dataclass
+class MPEGFrameHeader:
+    """One decoded MPEG audio frame header"""
+
+    version: int  # 1, 2 or 25 (MPEG-2.5)
+    layer: int
+    bitrate: int  # Bits per second
+    sample_rate: int
+    channels: int
+    frame_length: int  # Bytes, including the header
+    samples: int  # Samples per channel in the frame
+
+
+def probe_audio(file_path: str) -> Optional[AudioInfo]:
+    """
+    Stream properties of an audio file from its headers
+
+    Returns:
+        AudioInfo, or None if the format is not recognized or the headers
+        are damaged (callers can then fall back to decoding).
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return _probe_cached(os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=4096)
+def _probe_cached(file_path: str, mtime_ns: int, size: int) -> Optional[AudioInfo]:
+    try:
+        with open(file_path, "rb") as f:
+            return probe_audio_file(f, size, file_path)
+    except Exception as e:
+        logger.debug("audio_probe", "_probe_cached", f"Header probe failed for {file_path}: {e}")
+        return None
+
+
+def probe_audio_file(f, size: int, name: str = "") -> Optional[AudioInfo]:
+    """
+    Stream properties from the headers of an open, seekable binary file of size bytes
+
+    Only the headers are read (plus the frame headers of variable bitrate
+    MPEG files without a frame count). Unlike probe_audio, errors propagate
+    and nothing is cached. The file name, if given, lets HiDock recordings
+    and MP3s with leading junk be scanned for their first frame; other files
+    are only treated as MPEG audio when they start with a frame or ID3 tag.
+    """
+    f.seek(0)
+    header = f.read(HEADER_READ_SIZE)
+    if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+        return _probe_wav(f, size)
+    if header[:4] == b"fLaC":
+        return _probe_flac(header, size)
+    if format_from_header(header[:12]) == FORMAT_MP3 or name.lower().endswith(MPEG_EXTENSIONS):
+        return _probe_mpeg(f, header, size)
+    return None
+
+
+def _probe_wav(f, size: int) -> Optional[AudioInfo]:
+    """Walk the RIFF chunks up to the data chunk, reading only chunk headers."""
+    f.seek(12)
+    fmt = None
+    while True:
+        chunk = f.read(8)
+        if len(chunk) < 8:
+            return None
+        chunk_id, chunk_size = struct.unpack("<4sI", chunk)
+        if chunk_id == b"fmt ":
+            fmt = struct.unpack("<HHIIHH", f.read(16))
+            f.seek(chunk_size - 16 + (chunk_size & 1), os.SEEK_CUR)
+        elif chunk_id == b"data":
+            if fmt is None:
+                return None
+            # Streamed or truncated files carry a placeholder size
+            data_size = min(chunk_size, size - f.tell())
+            break
+        else:
+            f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+
+    audio_format, channels, sample_rate, byte_rate, block_align, _ = fmt
+    if not sample_rate or not channels:
+        return None
+    if audio_format in (1, 3, 0xFFFE) and block_align:
+        duration = (data_size // block_align) / sample_rate
+    else:
+        # Compressed payloads: the average byte rate is all there is
+        duration = data_size / byte_rate if byte_rate else 0.0
+    return AudioInfo(FORMAT_WAV, duration, sample_rate, channels, byte_rate * 8)
+
+
+def _probe_flac(header: bytes, size: int) -> Optional[AudioInfo]:
+    """Read the STREAMINFO block that always follows the fLaC marker."""
+    if len(header) < 42 or header[4] & 0x7F != 0:
+        return None
+    fields = int.from_bytes(header[18:26], "big")
+    sample_rate = fields >> 44
+    channels = ((fields >> 41) & 0x7) + 1
+    total_samples = fields & ((1 << 36) - 1)
+    if not sample_rate:
+        return None
+    duration = total_samples / sample_rate
+    bitrate = int(size * 8 / duration) if duration else 0
+    return AudioInfo(FORMAT_FLAC, duration, sample_rate, channels, bitrate)
+
+
+def parse_mpeg_header(data: bytes, offset: int = 0) -> Optional[MPEGFrameHeader]:
+    """Decode the 4-byte MPEG audio frame header at offset, or None if it is not one."""
+    if offset + 4 > len(data) or data[offset] != 0xFF or data[offset + 1] & 0xE0 != 0xE0:
+        return None
+    b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+    version = {0: 25, 2: 2, 3: 1}.get((b1 >> 3) & 0x3)
+    layer = {1: 3, 2: 2, 3: 1}.get((b1 >> 1) & 0x3)
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 0x3
+    if version is None or layer is None or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    bitrate = _MPEG_BITRATES[(min(version, 2), layer)][bitrate_index] * 1000
+    sample_rate = _MPEG_SAMPLE_RATES[version][rate_index]
+    padding = (b2 >> 1) & 0x1
+    if layer == 1:
+        samples = 384
+        frame_length = (12 * bitrate // sample_rate + padding) * 4
+    elif layer == 3 and version != 1:
+        samples = 576
+        frame_length = 72 * bitrate // sample_rate + padding
+    else:
+        samples = 1152
+        frame_length = 144 * bitrate // sample_rate + padding
+    channels = 1 if b3 >> 6 == 3 else 2
+    return MPEGFrameHeader(version, layer, bitrate, sample_rate, channels, frame_length, samples)
+
+
+def _find_first_frame(header: bytes) -> Optional[Tuple[int, MPEGFrameHeader]]:
+    """Offset and header of the first frame that is followed by a matching frame."""
+    offset = header.find(b"\xff")
+    while 0 <= offset < len(header) - 4:
+        frame = parse_mpeg_header(header, offset)
+        if frame is not None:
+            # A lone sync word turns up by chance in other data, two matching headers in a row do not
+            following = parse_mpeg_header(header, offset + frame.frame_length)
+            stream = (frame.version, frame.layer, frame.sample_rate)
+            if following is not None and (following.version, following.layer, following.sample_rate) == stream:
+                return offset, frame
+        offset = header.find(b"\xff", offset + 1)
+    return None
+
+
+def _vbr_frame_count(header: bytes, offset: int, frame: MPEGFrameHeader) -> Optional[int]:
+    """Frame count from a Xing/Info or VBRI header in the first frame, if there is one."""
+    side_info = (17 if frame.channels == 1 else 32) if frame.version == 1 else (9 if frame.channels == 1 else 17)
+    xing = offset + 4 + side_info
+    if header[xing : xing + 4] in (b"Xing", b"Info"):
+        flags = struct.unpack(">I", header[xing + 4 : xing + 8])[0]
+        if flags & 0x1:
+            return struct.unpack(">I", header[xing + 8 : xing + 12])[0]
+    vbri = offset + 36
+    if header[vbri : vbri + 4] == b"VBRI":
+        return struct.unpack(">I", header[vbri + 14 : vbri + 18])[0]
+    return None
+
+
+def _probe_mpeg(f, header: bytes, size: int) -> Optional[AudioInfo]:
+    # Skip an ID3v2 tag, which may be larger than the first read
+    start = 0
+    if header[:3] == b"ID3" and len(header) >= 10:
+        tag_size = (header[6] << 21) | (header[7] << 14) | (header[8] << 7) | header[9]
+        start = 10 + tag_size + (10 if header[5] & 0x10 else 0)
+        f.seek(start)
+        header = f.read(HEADER_READ_SIZE)
+
+    found = _find_first_frame(header)
+    if found is None:
+        return None
+    offset, frame = found
+
+    frame_count = _vbr_frame_count(header, offset, frame)
+    if frame_count:
+        duration = frame_count * frame.samples / frame.sample_rate
+        bitrate = int((size - start - offset) * 8 / duration) if duration else frame.bitrate
+        return AudioInfo(FORMAT_MP3, duration, frame.sample_rate, frame.channels, bitrate)
+
+    # Constant bitrate if the first frames agree; the payload size then gives the duration
+    audio_end = size
+    f.seek(max(size - 128, 0))
+    if f.read(3) == b"TAG":
+        audio_end -= 128
+
+    position = offset
+    bitrates = set()
+    for _ in range(CBR_CHECK_FRAMES):
+        current = parse_mpeg_header(header, position)
+        if current is None:
+            break
+        bitrates.add(current.bitrate)
+        position += current.frame_length
+
+    if len(bitrates) <= 1:
+        duration = (audio_end - start - offset) * 8 / frame.bitrate
+        return AudioInfo(FORMAT_MP3, duration, frame.sample_rate, frame.channels, frame.bitrate)
+
+    # Variable bitrate without a frame count: walk the frame headers
+    frames, position = _walk_frames(f, start + offset, audio_end)
+    duration = frames * frame.samples / frame.sample_rate
+    bitrate = int((position - start - offset) * 8 / duration) if duration else frame.bitrate
+    return AudioInfo(FORMAT_MP3, duration, frame.sample_rate, frame.channels, bitrate)
+
+
+def _walk_frames(f, position: int, audio_end: int) -> Tuple[int, int]:
+    """Count consecutive frames from position; returns (frames, offset after the last one)."""
+    try:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, io.UnsupportedOperation):
+        data = None
+
+    frames = 0
+    if data is not None:
+        with data:
+            while position < audio_end:
+                current = parse_mpeg_header(data, position)
+                if current is None:
+                    break
+                frames += 1
+                position += current.frame_length
+        return frames, position
+
+    # Files without a descriptor are read header by header
+    while position < audio_end:
+        f.seek(position)
+        current = parse_mpeg_header(f.read(4))
+        if current is None:
+            break
+        frames += 1
+        position += current.frame_length
+    return frames, position
@@ -10,11 +10,21 @@ This module provides advanced audio processing and enhancement features:
 Requirements: 9.3, 3.1, 3.2
 """
 
+import collections
+import dataclasses
+import importlib.util
+import multiprocessing
 import os
+import queue
+import shutil
+import sqlite3
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
 
 import numpy as np
-
-# import scipy.fft as fft  # Future: frequency domain analysis
+import scipy.fft as fft
 import scipy.signal as signal
 from scipy.io import wavfile
 
@@ -23,21 +33,20 @@ from scipy.io import wavfile
 
 # from scipy.ndimage import median_filter  # Future: noise reduction
 
+# librosa is only imported by audio_loader when a file needs it
 try:
-    import librosa
     import soundfile as sf
 
-    ADVANCED_AUDIO_AVAILABLE = True
+    ADVANCED_AUDIO_AVAILABLE = importlib.util.find_spec("librosa") is not None
 except ImportError:
     ADVANCED_AUDIO_AVAILABLE = False
-    librosa = None
     sf = None
-# import queue  # Future: threaded audio processing
-# import tempfile  # Future: temporary file management
-# import threading  # Future: background processing
+import tempfile
 from dataclasses import dataclass
+from datetime import datetime
 from enum import Enum
-from typing import Dict, List, Optional, Tuple
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 # from typing import Union  # Future: union type annotations
 
@@ -58,7 +67,10 @@ try:
 except ImportError:
     PYDUB_AVAILABLE = False
 
+from audio_loader import PCM16BlockWriter, load_audio, open_audio_stream
+from audio_resampler import resample_file
 from config_and_logger import logger
+from result_cache import ResultCache, get_result_cache
 
 
 class ProcessingQuality(Enum):
@@ -78,6 +90,20 @@ class NoiseReductionMethod(Enum):
     DEEP_LEARNING = "deep_learning"
 
 
+class CompressorMode(Enum):
+    """Dynamic range compressor modes"""
+
+    STATIC = "static"  # Instantaneous per-sample gain curve
+    ENVELOPE = "envelope"  # Envelope follower with attack and release
+
+
+class SamplePrecision(Enum):
+    """Floating-point precision of samples between processing stages"""
+
+    FLOAT32 = "float32"  # Half the memory and bandwidth; what librosa and WAV decoding produce
+    FLOAT64 = "float64"  # Reference precision
+
+
 @dataclass
 class AudioProcessingSettings:
     """Settings for audio processing operations"""
@@ -91,6 +117,15 @@ class AudioProcessingSettings:
     noise_reduction_strength: float = 0.5  # 0.0 to 1.0
     silence_threshold: float = -40.0  # dB
     silence_min_duration: float = 0.5  # seconds
+    compressor_mode: CompressorMode = CompressorMode.STATIC
+    compressor_attack_ms: float = 10.0
+    compressor_release_ms: float = 100.0
+    precision: SamplePrecision = SamplePrecision.FLOAT32
+    noise_profile_device: Optional[str] = None  # Device serial whose stored noise profile to use
+    noise_profile_environment: str = "default"  # Room or setting tag of the noise profile
+    streaming: bool = False  # Process in fixed-size blocks through temporary files
+    streaming_min_duration: Optional[float] = None  # Also stream recordings at least this long (seconds)
+    stream_block_size: int = 262144  # Samples per block in streaming mode
 
 
 @dataclass
@@ -106,15 +141,670 @@ class ProcessingResult:
     dynamic_range_db: float = 0.0
     peak_level_db: float = 0.0
     rms_level_db: float = 0.0
+    speech_segments: Optional[np.ndarray] = None  # [start, end) sample indices kept by silence removal
     error_message: Optional[str] = None
 
 
+# Bump when a processing stage changes its output, so cached results are not reused:
+# 2: spectral subtraction and the spectral centroid on shared STFT frames
+# 3: float32 sample precision by default
+# 4: per-device noise profiles in spectral subtraction
+# 5: header-probed loaders instead of librosa
+PROCESSING_VERSION = 5
+
+# Settings that change how the pipeline runs but not what it produces
+_EXECUTION_SETTINGS = {"streaming", "streaming_min_duration", "stream_block_size"}
+_STREAMING_SETTINGS = {"streaming", "streaming_min_duration"}
+
+
+def _settings_cache_key(settings: AudioProcessingSettings) -> Dict:
+    """The settings that determine processing output, for result cache keys"""
+    execution_settings = _EXECUTION_SETTINGS
+    if NOISEREDUCE_AVAILABLE and settings.noise_reduction_strength > 0:
+        # Streaming uses spectral subtraction where the in-memory path would use noisereduce
+        execution_settings = _EXECUTION_SETTINGS - _STREAMING_SETTINGS
+    return {
+        field.name: getattr(settings, field.name)
+        for field in dataclasses.fields(settings)
+        if field.name not in execution_settings
+    }
+
+
+# Standard de-emphasis time constant (75 microseconds)
+DEEMPHASIS_TAU = 75e-6
+
+
+def _deemphasis_alpha(sample_rate: int) -> float:
+    """Pole of the one-pole de-emphasis filter y[n] = alpha * y[n-1] + (1 - alpha) * x[n]"""
+    return float(np.exp(-1 / (sample_rate * DEEMPHASIS_TAU)))
+
+
+@lru_cache(maxsize=32)
+def design_enhancement_sos(sample_rate: int, include_deemphasis: bool = False) -> np.ndarray:
+    """
+    Design the cascaded enhancement filter for a sample rate
+
+    The chain is a 2nd-order 80 Hz high-pass (above 8 kHz sample rates),
+    a 4th-order 8 kHz low-pass (above 16 kHz) and optionally the one-pole
+    de-emphasis filter, all as second-order sections. Results are cached per
+    sample rate, so callers must not modify the returned array.
+    """
+    sections = []
+    nyquist = sample_rate / 2
+
+    # Gentle high-pass filter to remove low-frequency noise
+    if sample_rate > 8000:
+        high_cutoff = min(80, nyquist * 0.01)  # 80 Hz or 1% of Nyquist
+        sections.append(signal.butter(2, high_cutoff / nyquist, btype="high", output="sos"))
+
+    # Gentle low-pass filter for anti-aliasing
+    if sample_rate > 16000:
+        low_cutoff = min(8000, nyquist * 0.9)  # 8 kHz or 90% of Nyquist
+        sections.append(signal.butter(4, low_cutoff / nyquist, btype="low", output="sos"))
+
+    if include_deemphasis:
+        alpha = _deemphasis_alpha(sample_rate)
+        sections.append(np.array([[1 - alpha, 0.0, 0.0, 1.0, -alpha, 0.0]]))
+
+    return np.vstack(sections) if sections else np.empty((0, 6))
+
+
+class SOSFilterChain:
+    """
+    Cascaded second-order-section filter that carries its state across blocks
+
+    Coefficients and state are kept in dtype, so float32 blocks are filtered
+    in float32 instead of being promoted.
+    """
+
+    def __init__(self, sos: np.ndarray, dtype=np.float64):
+        self.dtype = np.dtype(dtype)
+        self.sos = sos.astype(self.dtype, copy=False)
+        self.zi = np.zeros((sos.shape[0], 2), dtype=self.dtype)
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Filter the next block, continuing from the previous block's state"""
+        if self.sos.shape[0] == 0:
+            return block.copy()
+        filtered, self.zi = signal.sosfilt(self.sos, block.astype(self.dtype, copy=False), zi=self.zi)
+        return filtered
+
+    def reset(self):
+        """Forget the filter history, e.g. before a new signal"""
+        self.zi = np.zeros((self.sos.shape[0], 2), dtype=self.dtype)
+
+
+class EnvelopeCompressor:
+    """
+    Peak envelope follower compressor that can be fed block by block
+
+    The envelope is tracked on per-block peaks (one recursion step per
+    block_ms block instead of per sample) and the gain is interpolated back
+    to sample resolution between block centres. Samples after the last
+    complete block centre wait for the next call, so feeding a signal in
+    pieces and then calling flush() gives the same output as one pass.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        ratio: float,
+        threshold: float,
+        attack_ms: float,
+        release_ms: float,
+        block_ms: float = 2.0,
+    ):
+        self.block_size = max(1, int(sample_rate * block_ms / 1000))
+        self.ratio = ratio
+        self.threshold = threshold
+
+        # One-pole smoothing coefficients per block step
+        block_seconds = self.block_size / sample_rate
+        self.attack_coeff = np.exp(-block_seconds / max(attack_ms / 1000, 1e-6))
+        self.release_coeff = np.exp(-block_seconds / max(release_ms / 1000, 1e-6))
+        self.reset()
+
+    def reset(self):
+        """Forget the envelope and any held-back samples"""
+        self._level = 0.0
+        self._pending = None  # Samples not yet output
+        self._pending_start = 0  # Absolute index of _pending[0]
+        self._blocks_done = 0
+        self._last_center = None
+        self._last_gain = None
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Compress the next block; output lags input by up to 1.5 envelope blocks"""
+        pending = block if self._pending is None else np.concatenate((self._pending, block))
+        unanalysed = self._blocks_done * self.block_size - self._pending_start
+        num_blocks = (len(pending) - unanalysed) // self.block_size
+
+        if num_blocks == 0:
+            self._pending = pending.copy()
+            return pending[:0].copy()
+
+        analysed_end = unanalysed + num_blocks * self.block_size
+        block_peaks = np.abs(pending[unanalysed:analysed_end]).reshape(num_blocks, self.block_size).max(axis=1)
+        return self._emit(pending, block_peaks, final=False)
+
+    def flush(self) -> np.ndarray:
+        """Output everything still held back, treating the trailing partial block as zero-padded"""
+        if self._pending is None:
+            return np.empty(0)
+
+        pending = self._pending
+        tail = pending[self._blocks_done * self.block_size - self._pending_start :]
+        block_peaks = np.abs(tail).max(keepdims=True) if len(tail) else np.empty(0)
+        output = self._emit(pending, block_peaks, final=True)
+        self.reset()
+        return output
+
+    def _emit(self, pending: np.ndarray, block_peaks: np.ndarray, final: bool) -> np.ndarray:
+        envelope = np.empty(len(block_peaks))
+        level = self._level
+        for i, peak in enumerate(block_peaks.tolist()):
+            coeff = self.attack_coeff if peak > level else self.release_coeff
+            level = coeff * level + (1 - coeff) * peak
+            envelope[i] = level
+        self._level = level
+
+        # Gain computer in dB: reduce everything above the threshold by the ratio
+        envelope_db = 20 * np.log10(np.maximum(envelope, 1e-10))
+        gains = 10 ** (np.minimum(0.0, (self.threshold - envelope_db) * (1 - 1 / self.ratio)) / 20)
+        centers = (self._blocks_done + np.arange(len(block_peaks))) * self.block_size + self.block_size / 2
+        self._blocks_done += len(block_peaks)
+
+        if self._last_center is not None:
+            centers = np.concatenate(([self._last_center], centers))
+            gains = np.concatenate(([self._last_gain], gains))
+
+        # Samples past the last centre need the next block's gain to interpolate
+        end = len(pending) if final else int(np.ceil(centers[-1])) - self._pending_start
+        positions = np.arange(self._pending_start, self._pending_start + end)
+        output = (pending[:end] * np.interp(positions, centers, gains)).astype(pending.dtype, copy=False)
+
+        self._last_center, self._last_gain = centers[-1], gains[-1]
+        self._pending = pending[end:].copy()
+        self._pending_start += end
+        return output
+
+
+@lru_cache(maxsize=8)
+def _hann_window(frame_size: int, dtype: str = "float32") -> np.ndarray:
+    """Periodic Hann window (cached, callers must not modify)"""
+    return signal.get_window("hann", frame_size).astype(dtype)
+
+
+def _subtraction_gain(magnitude: np.ndarray, noise_spectrum: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Per-bin gain of spectral subtraction
+
+    Equivalent to max(magnitude - alpha * noise, 0.1 * magnitude) / magnitude,
+    applied to the complex spectrum so the phase is kept without angle/exp.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # fmax maps the 0/0 of silent bins to the floor; they stay zero either way
+        return np.fmax(1 - alpha * noise_spectrum / magnitude, np.float32(0.1))
+
+
+def _overlap_add(frames: np.ndarray, hop_size: int) -> np.ndarray:
+    """Sum frames placed hop_size apart into one signal"""
+    num_frames, frame_size = frames.shape
+    output = np.zeros((num_frames - 1) * hop_size + frame_size, dtype=frames.dtype)
+    # Each hop-sized slice of a frame lands on consecutive, non-overlapping output spans
+    for part in range(frame_size // hop_size):
+        columns = slice(part * hop_size, (part + 1) * hop_size)
+        output[part * hop_size : part * hop_size + num_frames * hop_size] += frames[:, columns].reshape(-1)
+    return output
+
+
+class SpectralFrames:
+    """
+    Short-time spectrum of one version of a signal, shared between stages
+
+    Hann-windowed frames with 75% overlap, padded like scipy.signal.stft (half
+    a frame of zeros at each end, the end rounded up to whole hops). Spectra
+    are computed once and stored as complex64 (complex128 for float64
+    signals); the magnitude is derived on first use. Noise estimation,
+    subtraction and the noise reduction metric all read the same frames, and a
+    stage that reshapes the spectrum produces a new version with apply_gain()
+    which to_signal() turns back into samples.
+    """
+
+    CHUNK_FRAMES = 4096
+
+    def __init__(self, spectra: np.ndarray, sample_rate: int, frame_size: int, length: int):
+        self.spectra = spectra
+        self.sample_rate = sample_rate
+        self.frame_size = frame_size
+        self.hop_size = frame_size // 4
+        self.length = length
+        self._magnitude = None
+
+    @classmethod
+    def from_signal(cls, audio_data: np.ndarray, sample_rate: int, frame_size: int = 1024) -> "SpectralFrames":
+        """Compute the spectrum of a signal, frame_size // 4 samples per hop"""
+        hop_size = frame_size // 4
+        half = frame_size // 2
+        dtype = np.float64 if audio_data.dtype == np.float64 else np.float32
+        padded = np.zeros(half + len(audio_data) + half + (-len(audio_data) % hop_size), dtype=dtype)
+        padded[half : half + len(audio_data)] = audio_data
+
+        num_frames = (len(padded) - frame_size) // hop_size + 1
+        frames = np.lib.stride_tricks.sliding_window_view(padded, frame_size)[::hop_size]
+        window = _hann_window(frame_size, padded.dtype.name)
+        spectra = np.empty((num_frames, frame_size // 2 + 1), dtype=np.result_type(dtype, np.complex64))
+        for start in range(0, num_frames, cls.CHUNK_FRAMES):
+            spectra[start : start + cls.CHUNK_FRAMES] = fft.rfft(frames[start : start + cls.CHUNK_FRAMES] * window)
+        return cls(spectra, sample_rate, frame_size, len(audio_data))
+
+    @property
+    def magnitude(self) -> np.ndarray:
+        if self._magnitude is None:
+            self._magnitude = np.abs(self.spectra)
+        return self._magnitude
+
+    def noise_frames(self, seconds: float = 0.5) -> int:
+        """Number of leading frames covering the given time"""
+        return int(seconds * self.sample_rate / self.hop_size)
+
+    def noise_spectrum(self, seconds: float = 0.5) -> np.ndarray:
+        """Average magnitude of the leading frames, taken as the noise floor"""
+        return self.magnitude[: self.noise_frames(seconds)].mean(axis=0)
+
+    def apply_gain(self, gain: np.ndarray) -> "SpectralFrames":
+        """New version of the signal with each bin scaled by gain (phase unchanged)"""
+        return SpectralFrames(
+            (self.spectra * gain).astype(self.spectra.dtype, copy=False), self.sample_rate, self.frame_size, self.length
+        )
+
+    def to_signal(self) -> np.ndarray:
+        """Inverse transform by weighted overlap-add, trimmed to the original length"""
+        num_frames = len(self.spectra)
+        real_dtype = self.spectra.real.dtype
+        window = _hann_window(self.frame_size, real_dtype.name)
+        output = np.zeros((num_frames - 1) * self.hop_size + self.frame_size, dtype=real_dtype)
+        norm = np.zeros_like(output)
+
+        for start in range(0, num_frames, self.CHUNK_FRAMES):
+            chunk = self.spectra[start : start + self.CHUNK_FRAMES]
+            frames = fft.irfft(chunk, n=self.frame_size) * window
+            span = slice(
+                start * self.hop_size, start * self.hop_size + (len(frames) - 1) * self.hop_size + self.frame_size
+            )
+            output[span] += _overlap_add(frames, self.hop_size)
+            norm[span] += _overlap_add(np.broadcast_to(window**2, frames.shape), self.hop_size)
+
+        output /= np.where(norm > 1e-10, norm, 1.0)
+        half = self.frame_size // 2
+        return output[half : half + self.length]
+
+
+@dataclass
+class NoiseProfile:
+    """Average noise magnitude spectrum of one device in one environment"""
+
+    device_serial: str
+    environment: str
+    sample_rate: int
+    frame_size: int
+    spectrum: np.ndarray  # Mean magnitude per SpectralFrames bin
+    frame_count: int = 0  # Frames the estimate is based on
+    updated: Optional[str] = None
+
+
+class NoiseProfileStore:
+    """
+    Noise profiles per device serial and environment tag, kept in SQLite
+
+    Profiles are learned from the quietest frames of recordings rather than
+    from their first half second, and each recording that is learned from is
+    merged into the running average, so later files can skip estimation.
+    """
+
+    QUIET_FRACTION = 0.1  # Share of lowest-energy frames treated as noise
+    MAX_WEIGHT_FRAMES = 20000  # Cap on the old estimate's weight, so profiles keep adapting
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else Path.home() / ".hidock" / "cache"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / "noise_profiles.db"
+        self._init_database()
+
+    def _init_database(self):
+        """Initialize the noise profile table."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS noise_profiles (
+                    device_serial TEXT,
+                    environment TEXT,
+                    sample_rate INTEGER,
+                    frame_size INTEGER,
+                    spectrum BLOB,
+                    frame_count INTEGER,
+                    updated TEXT,
+                    PRIMARY KEY (device_serial, environment, sample_rate, frame_size)
+                )
+            """
+            )
+            conn.commit()
+
+    def get(
+        self, device_serial: str, environment: str, sample_rate: int, frame_size: int = 1024
+    ) -> Optional[NoiseProfile]:
+        """Stored profile for a device, environment and sample rate, if any."""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                """
+                SELECT spectrum, frame_count, updated FROM noise_profiles
+                WHERE device_serial = ? AND environment = ? AND sample_rate = ? AND frame_size = ?
+            """,
+                (device_serial, environment, sample_rate, frame_size),
+            ).fetchone()
+        if row is None:
+            return None
+        return NoiseProfile(
+            device_serial=device_serial,
+            environment=environment,
+            sample_rate=sample_rate,
+            frame_size=frame_size,
+            spectrum=np.frombuffer(row[0], dtype=np.float32).copy(),
+            frame_count=row[1],
+            updated=row[2],
+        )
+
+    def save(self, profile: NoiseProfile):
+        """Store or replace a profile."""
+        profile.updated = datetime.now().isoformat()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO noise_profiles
+                (device_serial, environment, sample_rate, frame_size, spectrum, frame_count, updated)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+                (
+                    profile.device_serial,
+                    profile.environment,
+                    profile.sample_rate,
+                    profile.frame_size,
+                    profile.spectrum.astype(np.float32).tobytes(),
+                    profile.frame_count,
+                    profile.updated,
+                ),
+            )
+            conn.commit()
+
+    def learn(
+        self,
+        device_serial: str,
+        environment: str,
+        audio_data: np.ndarray,
+        sample_rate: int,
+        frame_size: int = 1024,
+    ) -> NoiseProfile:
+        """Estimate the noise in a recording and merge it into the stored profile."""
+        frames = SpectralFrames.from_signal(audio_data, sample_rate, frame_size)
+        spectrum, frame_count = self.estimate_noise_spectrum(frames)
+
+        profile = self.get(device_serial, environment, sample_rate, frame_size)
+        if profile is None:
+            profile = NoiseProfile(device_serial, environment, sample_rate, frame_size, spectrum, frame_count)
+        else:
+            old_weight = min(profile.frame_count, self.MAX_WEIGHT_FRAMES)
+            profile.spectrum = (profile.spectrum * old_weight + spectrum * frame_count) / (old_weight + frame_count)
+            profile.frame_count += frame_count
+
+        self.save(profile)
+        logger.info(
+            "NoiseProfileStore",
+            "learn",
+            f"Noise profile {device_serial}/{environment} at {sample_rate} Hz now covers {profile.frame_count} frames",
+        )
+        return profile
+
+    @classmethod
+    def estimate_noise_spectrum(cls, frames: SpectralFrames) -> Tuple[np.ndarray, int]:
+        """Mean magnitude of the lowest-energy frames, and how many frames that was"""
+        energy = np.einsum("ij,ij->i", frames.magnitude, frames.magnitude)
+        count = max(1, int(len(energy) * cls.QUIET_FRACTION))
+        quietest = np.argpartition(energy, count - 1)[:count]
+        return frames.magnitude[quietest].mean(axis=0).astype(np.float32), count
+
+    def fingerprint(self, device_serial: str, environment: str) -> str:
+        """Changes whenever any profile of the device and environment is updated."""
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                """
+                SELECT sample_rate, frame_size, updated FROM noise_profiles
+                WHERE device_serial = ? AND environment = ? ORDER BY sample_rate, frame_size
+            """,
+                (device_serial, environment),
+            ).fetchall()
+        return ";".join(f"{rate}/{size}@{updated}" for rate, size, updated in rows)
+
+
+class StreamingSpectralSubtractor:
+    """
+    Spectral subtraction noise reduction fed block by block
+
+    Matches AudioEnhancer._spectral_subtraction (SpectralFrames layout, noise
+    spectrum averaged over the first noise_seconds unless a stored profile
+    spectrum is given) but keeps only about one frame of history,
+    reconstructing by weighted overlap-add. Output lags input by up to a
+    frame and is complete once flush() is called.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        strength: float,
+        frame_size: int = 1024,
+        noise_seconds: float = 0.5,
+        noise_spectrum: Optional[np.ndarray] = None,
+    ):
+        self.frame_size = frame_size
+        self.hop_size = frame_size // 4
+        self.alpha = strength * 2.0  # Oversubtraction factor
+        self.noise_frames = max(1, int(noise_seconds * sample_rate / self.hop_size))
+        self.window = _hann_window(frame_size)
+        self.noise_spectrum = noise_spectrum
+        self.noise_reduction_db = 0.0
+        self._noise_measured = False
+
+        # Half a frame of leading zeros, like the boundary padding of scipy.signal.stft
+        self._input = np.zeros(frame_size // 2, dtype=np.float32)
+        self._overlap = np.zeros(frame_size - self.hop_size, dtype=np.float32)
+        self._overlap_norm = np.zeros(frame_size - self.hop_size, dtype=np.float32)
+        self._samples_in = 0
+        self._samples_out = 0
+        self._lead_in = frame_size // 2  # Output samples belonging to the boundary padding
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Denoise the next block, returning whatever output is complete"""
+        self._input = np.concatenate((self._input, block.astype(np.float32, copy=False)))
+        self._samples_in += len(block)
+
+        if not self._noise_measured:
+            if len(self._input) < (self.noise_frames - 1) * self.hop_size + self.frame_size:
+                return np.empty(0, dtype=np.float32)
+            self._estimate_noise()
+
+        return self._trim(self._overlap_add(final=False))
+
+    def flush(self) -> np.ndarray:
+        """Pad the end like scipy.signal.stft and return the remaining output"""
+        padding = self.frame_size // 2 + (-self._samples_in % self.hop_size)
+        self._input = np.concatenate((self._input, np.zeros(padding, dtype=np.float32)))
+        if not self._noise_measured:
+            self._estimate_noise()
+        return self._trim(self._overlap_add(final=True))
+
+    def _frames(self, count: int) -> np.ndarray:
+        available = (len(self._input) - self.frame_size) // self.hop_size + 1
+        frames = np.lib.stride_tricks.sliding_window_view(self._input, self.frame_size)[:: self.hop_size]
+        return frames[: min(count, available)]
+
+    def _estimate_noise(self):
+        magnitude = np.abs(fft.rfft(self._frames(self.noise_frames) * self.window))
+        if self.noise_spectrum is None:
+            self.noise_spectrum = magnitude.mean(axis=0)
+        enhanced = magnitude * _subtraction_gain(magnitude, self.noise_spectrum, self.alpha)
+        self.noise_reduction_db = float(20 * np.log10(np.mean(magnitude) / np.mean(enhanced)))
+        self._noise_measured = True
+
+    def _overlap_add(self, final: bool) -> np.ndarray:
+        num_frames = max(0, (len(self._input) - self.frame_size) // self.hop_size + 1)
+        overlap_size = self.frame_size - self.hop_size
+        output = np.zeros(num_frames * self.hop_size + overlap_size, dtype=np.float32)
+        norm = np.zeros_like(output)
+        output[:overlap_size] += self._overlap
+        norm[:overlap_size] += self._overlap_norm
+
+        if num_frames:
+            spectrum = fft.rfft(self._frames(num_frames) * self.window)
+            spectrum *= _subtraction_gain(np.abs(spectrum), self.noise_spectrum, self.alpha)
+            frames = fft.irfft(spectrum, n=self.frame_size) * self.window
+            output += _overlap_add(frames, self.hop_size)
+            norm += _overlap_add(np.broadcast_to(self.window**2, frames.shape), self.hop_size)
+            self._input = self._input[num_frames * self.hop_size :]
+
+        complete = len(output) if final else num_frames * self.hop_size
+        self._overlap = output[complete:]
+        self._overlap_norm = norm[complete:]
+        return output[:complete] / np.where(norm[:complete] > 1e-10, norm[:complete], 1.0)
+
+    def _trim(self, output: np.ndarray) -> np.ndarray:
+        skip = min(self._lead_in, len(output))
+        self._lead_in -= skip
+        output = output[skip : skip + self._samples_in - self._samples_out]
+        self._samples_out += len(output)
+        return output.astype(np.float32, copy=False)
+
+
+class LevelStatistics:
+    """
+    Running peak, RMS and level percentiles over blocks of samples
+
+    Percentiles come from a 0.01 dB histogram of sample magnitudes, so memory
+    does not grow with the length of the signal.
+    """
+
+    MIN_DB = -200.0
+    MAX_DB = 20.0
+    BIN_DB = 0.01
+
+    def __init__(self):
+        self.count = 0
+        self.zero_count = 0
+        self.sum_squares = 0.0
+        self.peak = 0.0
+        self.histogram = np.zeros(int(round((self.MAX_DB - self.MIN_DB) / self.BIN_DB)), dtype=np.int64)
+
+    def update(self, block: np.ndarray):
+        """Add a block of samples"""
+        if len(block) == 0:
+            return
+        magnitude = np.abs(block).astype(np.float64)
+        self.count += len(magnitude)
+        self.sum_squares += float(np.dot(magnitude, magnitude))
+        self.peak = max(self.peak, float(magnitude.max()))
+
+        nonzero = magnitude[magnitude > 0]
+        self.zero_count += len(magnitude) - len(nonzero)
+        bins = np.floor((20 * np.log10(nonzero) - self.MIN_DB) / self.BIN_DB).astype(np.int64)
+        np.clip(bins, 0, len(self.histogram) - 1, out=bins)
+        self.histogram += np.bincount(bins, minlength=len(self.histogram))
+
+    @property
+    def rms(self) -> float:
+        return float(np.sqrt(self.sum_squares / self.count)) if self.count else 0.0
+
+    def level_at(self, fraction: float) -> float:
+        """Magnitude of the sample at position int(fraction * count) in sorted order"""
+        rank = int(fraction * self.count)
+        if rank < self.zero_count:
+            return 0.0
+        cumulative = self.zero_count + np.cumsum(self.histogram)
+        bin_index = int(np.searchsorted(cumulative, rank, side="right"))
+        return float(10 ** ((self.MIN_DB + (bin_index + 0.5) * self.BIN_DB) / 20))
+
+    def summary(self) -> Dict:
+        """Peak, RMS and 95th/10th percentile dynamic range in dB"""
+        percentile_95 = self.level_at(0.95)
+        percentile_10 = self.level_at(0.10)
+        return {
+            "peak_level_db": float(20 * np.log10(self.peak)) if self.peak > 0 else -np.inf,
+            "rms_level_db": float(20 * np.log10(self.rms)) if self.rms > 0 else -np.inf,
+            "dynamic_range_db": float(20 * np.log10(percentile_95 / percentile_10)) if percentile_10 > 0 else 0.0,
+        }
+
+
+class AudioAnalyzer:
+    """
+    Single-pass audio analysis over blocks of samples
+
+    Combines LevelStatistics with a running Welch power spectrum (Hann
+    windows of 1024 samples, 50% overlap, mean removed per segment) for the
+    spectral centroid. The result only depends on the samples, not on how
+    they were split into blocks.
+    """
+
+    def __init__(self, sample_rate: int, segment_size: int = 1024):
+        self.sample_rate = sample_rate
+        self.segment_size = segment_size
+        self.step = segment_size // 2
+        self.window = signal.get_window("hann", segment_size)
+        self.levels = LevelStatistics()
+        self._power_sum = np.zeros(segment_size // 2 + 1)
+        self._segments = 0
+        self._tail = np.empty(0)
+
+    def update(self, block: np.ndarray):
+        """Add the next block of samples"""
+        self.levels.update(block)
+
+        data = np.concatenate((self._tail, block))
+        num_segments = (len(data) - self.segment_size) // self.step + 1 if len(data) >= self.segment_size else 0
+        if num_segments:
+            segments = np.lib.stride_tricks.sliding_window_view(data, self.segment_size)[:: self.step][:num_segments]
+            segments = segments - segments.mean(axis=1, keepdims=True)
+            spectrum = np.fft.rfft(segments * self.window, axis=1)
+            self._power_sum += (spectrum.real**2 + spectrum.imag**2).sum(axis=0)
+            self._segments += num_segments
+        self._tail = data[num_segments * self.step :]
+
+    def _spectral_centroid(self) -> float:
+        if self._segments == 0:
+            # Shorter than one segment: Welch over what there is
+            freqs, psd = signal.welch(self._tail, self.sample_rate, nperseg=len(self._tail))
+        else:
+            freqs = np.fft.rfftfreq(self.segment_size, 1 / self.sample_rate)
+            psd = self._power_sum.copy()
+            # One-sided spectrum: every bin except DC and Nyquist counts twice
+            psd[1:-1] *= 2
+        return float(np.sum(freqs * psd) / np.sum(psd))
+
+    def result(self) -> Dict:
+        """Analysis in the format of AudioEnhancer._analyze_audio"""
+        if self.levels.count == 0:
+            raise ValueError("No samples analysed")
+        analysis = self.levels.summary()
+        analysis["spectral_centroid"] = self._spectral_centroid()
+        analysis["duration"] = self.levels.count / self.sample_rate
+        return analysis
+
+
 class AudioEnhancer:
     """Advanced audio enhancement and processing"""
 
-    def __init__(self, settings: AudioProcessingSettings = None):
+    def __init__(self, settings: AudioProcessingSettings = None, noise_profiles: Optional[NoiseProfileStore] = None):
         self.settings = settings or AudioProcessingSettings()
+        self.noise_profiles = noise_profiles
         self.temp_files = []
+        self.dtype = np.dtype(self.settings.precision.value)
+        self.precision_fixups: List[str] = []  # Stages whose output had to be cast to self.dtype
 
     def __del__(self):
         """Clean up temporary files"""
@@ -149,11 +839,16 @@ class AudioEnhancer:
         try:
             logger.info("AudioEnhancer", "process_audio_file", f"Processing {input_path}")
 
+            stream = self._open_stream_if_streaming(input_path)
+            if stream is not None:
+                return self._process_audio_file_streaming(input_path, output_path, progress_callback, stream)
+
             if progress_callback:
                 progress_callback(0, "Loading audio file...")
 
             # Load audio
             audio_data, sample_rate = self._load_audio(input_path)
+            audio_data = self._check_precision(audio_data, "load")
             original_duration = len(audio_data) / sample_rate
 
             if progress_callback:
@@ -170,6 +865,7 @@ class AudioEnhancer:
                 audio_data, noise_reduction_db = self._reduce_noise(
                     audio_data, sample_rate, self.settings.noise_reduction_strength
                 )
+                audio_data = self._check_precision(audio_data, "noise_reduction")
             else:
                 noise_reduction_db = 0.0
 
@@ -177,7 +873,7 @@ class AudioEnhancer:
                 progress_callback(40, "Detecting and removing silence...")
 
             # Remove silence
-            audio_data, silence_removed = self._remove_silence(
+            audio_data, silence_removed, speech_segments = self._remove_silence(
                 audio_data,
                 sample_rate,
                 threshold_db=self.settings.silence_threshold,
@@ -189,6 +885,7 @@ class AudioEnhancer:
 
             # Apply audio enhancement
             audio_data = self._enhance_audio_quality(audio_data, sample_rate)
+            audio_data = self._check_precision(audio_data, "enhancement")
 
             if progress_callback:
                 progress_callback(80, "Normalizing audio levels...")
@@ -196,6 +893,7 @@ class AudioEnhancer:
             # Normalize audio
             if self.settings.normalize_audio:
                 audio_data = self._normalize_audio(audio_data, self.settings.target_lufs)
+                audio_data = self._check_precision(audio_data, "normalization")
 
             if progress_callback:
                 progress_callback(90, "Saving processed audio...")
@@ -217,6 +915,7 @@ class AudioEnhancer:
                 processed_duration=processed_duration,
                 noise_reduction_db=noise_reduction_db,
                 silence_removed_seconds=silence_removed,
+                speech_segments=speech_segments,
                 dynamic_range_db=final_analysis["dynamic_range_db"],
                 peak_level_db=final_analysis["peak_level_db"],
                 rms_level_db=final_analysis["rms_level_db"],
@@ -234,38 +933,242 @@ class AudioEnhancer:
             logger.error("AudioEnhancer", "process_audio_file", f"Processing failed: {e}")
             return ProcessingResult(success=False, error_message=str(e))
 
-    def _load_audio(self, file_path: str) -> Tuple[np.ndarray, int]:
-        """Load audio file and return data and sample rate"""
-        try:
-            # Try librosa first (supports more formats)
-            if librosa is not None:
-                audio_data, sample_rate = librosa.load(file_path, sr=None, mono=False)
+    def _check_precision(self, audio_data: np.ndarray, stage: str) -> np.ndarray:
+        """
+        Stage boundary check of the precision policy
 
-                # Convert to mono if stereo
-                if audio_data.ndim > 1:
-                    audio_data = np.mean(audio_data, axis=0)
+        Every stage is expected to return samples in self.dtype. A stage that
+        does not (e.g. a library promoting to float64) is logged, recorded in
+        precision_fixups and cast back, so later stages never run at the
+        wrong precision.
+        """
+        if audio_data.dtype == self.dtype:
+            return audio_data
+        logger.warning(
+            "AudioEnhancer",
+            "_check_precision",
+            f"{stage} returned {audio_data.dtype}, expected {self.dtype}",
+        )
+        self.precision_fixups.append(stage)
+        return audio_data.astype(self.dtype)
+
+    def _open_stream_if_streaming(
+        self, input_path: str
+    ) -> Optional[Tuple[int, int, Callable[[], Iterator[np.ndarray]]]]:
+        """
+        Open the file for block-wise processing if it should not be loaded whole
 
-                return audio_data, sample_rate
+        Returns:
+            The opened stream (as _open_audio_stream), or None to load the file
+        """
+        if not self.settings.streaming and self.settings.streaming_min_duration is None:
+            return None
+        try:
+            stream = self._open_audio_stream(input_path, self.settings.stream_block_size)
+        except Exception:
+            return None
+        sample_rate, num_samples, _ = stream
+        if self.settings.streaming or num_samples / sample_rate >= self.settings.streaming_min_duration:
+            return stream
+        return None
+
+    def _open_audio_stream(
+        self, file_path: str, block_size: int
+    ) -> Tuple[int, int, Callable[[], Iterator[np.ndarray]]]:
+        """
+        Open an audio file for block-wise reading
 
-            # Fallback to scipy for WAV files
-            elif file_path.lower().endswith(".wav"):
-                sample_rate, audio_data = wavfile.read(file_path)
+        Returns:
+            Tuple of (sample rate, number of samples, function returning an
+            iterator over mono float32 blocks of block_size samples)
+        """
+        sample_rate, num_samples, _, read_blocks = open_audio_stream(file_path, block_size)
+        return sample_rate, num_samples, read_blocks
+
+    @staticmethod
+    def _iter_segment_blocks(audio_data: np.ndarray, segments: np.ndarray, block_size: int) -> Iterator[np.ndarray]:
+        """Yield the concatenation of audio_data[start:end] for each segment in block_size pieces"""
+        pieces = []
+        buffered = 0
+        for start, end in segments:
+            position = int(start)
+            while position < end:
+                take = min(int(end) - position, block_size - buffered)
+                pieces.append(np.asarray(audio_data[position : position + take]))
+                buffered += take
+                position += take
+                if buffered == block_size:
+                    yield np.concatenate(pieces)
+                    pieces = []
+                    buffered = 0
+        if buffered:
+            yield np.concatenate(pieces)
+
+    def _create_temp_file(self, suffix: str) -> str:
+        handle, path = tempfile.mkstemp(suffix=suffix, prefix="hidock_")
+        os.close(handle)
+        self.temp_files.append(path)
+        return path
+
+    def _remove_temp_file(self, path: str):
+        try:
+            os.remove(path)
+            self.temp_files.remove(path)
+        except (OSError, ValueError) as e:
+            logger.warning("AudioEnhancer", "_remove_temp_file", f"Failed to remove {path}: {e}")
 
-                # Convert to float and normalize
-                if audio_data.dtype == np.int16:
-                    audio_data = audio_data.astype(np.float32) / 32768.0
-                elif audio_data.dtype == np.int32:
-                    audio_data = audio_data.astype(np.float32) / 2147483648.0
+    def _process_audio_file_streaming(
+        self,
+        input_path: str,
+        output_path: str,
+        progress_callback=None,
+        stream: Optional[Tuple[int, int, Callable[[], Iterator[np.ndarray]]]] = None,
+    ) -> ProcessingResult:
+        """
+        Process an audio file in fixed-size blocks with bounded memory
 
-                # Convert to mono if stereo
-                if audio_data.ndim > 1:
-                    audio_data = np.mean(audio_data, axis=1)
+        Runs the same stages as process_audio_file in three passes over the
+        audio, keeping intermediate signals in temporary float32 files:
+        noise reduction (streaming spectral subtraction) is written to disk and
+        analysed for speech segments; the kept segments are filtered and
+        compressed with carried state while their loudness is measured; the
+        normalization gain from that measurement is applied while writing the
+        output. The noisereduce library is not used in this mode.
 
-                return audio_data, sample_rate
+        stream is the file already opened by _open_stream_if_streaming.
+        """
+        block_size = self.settings.stream_block_size
+        sample_rate, num_samples, read_blocks = stream or self._open_audio_stream(input_path, block_size)
+        if num_samples == 0:
+            raise ValueError(f"No audio samples in {input_path}")
+        original_duration = num_samples / sample_rate
+
+        logger.info(
+            "AudioEnhancer",
+            "_process_audio_file_streaming",
+            f"Streaming {original_duration:.1f}s in blocks of {block_size} samples",
+        )
+
+        denoised_path = self._create_temp_file(".f32")
+        enhanced_path = self._create_temp_file(".f32")
+        denoised = enhanced = None
+        try:
+            # Pass 1: noise reduction to disk
+            strength = self.settings.noise_reduction_strength
+            subtractor = None
+            if strength > 0:
+                subtractor = StreamingSpectralSubtractor(
+                    sample_rate, strength, noise_spectrum=self._noise_profile_spectrum(sample_rate)
+                )
+            samples_read = 0
+            with open(denoised_path, "wb") as denoised_file:
+                for block in read_blocks():
+                    samples_read += len(block)
+                    if subtractor:
+                        block = subtractor.process(block)
+                    block.astype(np.float32, copy=False).tofile(denoised_file)
+                    if progress_callback:
+                        progress_callback(40 * samples_read / num_samples, "Applying noise reduction...")
+                if subtractor:
+                    subtractor.flush().tofile(denoised_file)
+            noise_reduction_db = subtractor.noise_reduction_db if subtractor else 0.0
+
+            # Silence detection on the denoised signal
+            if progress_callback:
+                progress_callback(40, "Detecting and removing silence...")
+            denoised = np.memmap(denoised_path, dtype=np.float32, mode="r")
+            speech_segments = self.detect_speech_segments(
+                denoised,
+                sample_rate,
+                threshold_db=self.settings.silence_threshold,
+                min_duration=self.settings.silence_min_duration,
+            )
+            kept_segments = speech_segments if len(speech_segments) else np.array([[0, len(denoised)]])
+            processed_samples = int(np.sum(kept_segments[:, 1] - kept_segments[:, 0]))
+            silence_removed = (len(denoised) - processed_samples) / sample_rate
+
+            # Pass 2: filtering and compression, measuring loudness for normalization
+            filter_chain = self.create_filter_chain(sample_rate)
+            compressor = None
+            if self.settings.compressor_mode == CompressorMode.ENVELOPE:
+                compressor = EnvelopeCompressor(
+                    sample_rate,
+                    2.0,
+                    -20.0,
+                    self.settings.compressor_attack_ms,
+                    self.settings.compressor_release_ms,
+                )
+            loudness = LevelStatistics()
+            samples_done = 0
+            with open(enhanced_path, "wb") as enhanced_file:
+                for block in self._iter_segment_blocks(denoised, kept_segments, block_size):
+                    samples_done += len(block)
+                    block = filter_chain.process(block)
+                    if compressor:
+                        block = compressor.process(block)
+                    else:
+                        block = self._apply_compression(block, ratio=2.0, threshold=-20.0)
+                    loudness.update(block)
+                    block.astype(np.float32).tofile(enhanced_file)
+                    if progress_callback:
+                        progress_callback(
+                            60 + 20 * samples_done / processed_samples,
+                            "Enhancing audio quality...",
+                        )
+                if compressor:
+                    block = compressor.flush()
+                    loudness.update(block)
+                    block.astype(np.float32).tofile(enhanced_file)
+
+            # Pass 3: normalization gain from the measured loudness, written to the output
+            gain = 1.0
+            if self.settings.normalize_audio and loudness.rms > 0:
+                gain = self._normalization_gain(loudness.rms, loudness.peak, self.settings.target_lufs)
 
-            else:
-                raise ValueError(f"Unsupported audio format: {file_path}")
+            if progress_callback:
+                progress_callback(80, "Normalizing and saving audio...")
+            enhanced = np.memmap(enhanced_path, dtype=np.float32, mode="r")
+            final_analyzer = AudioAnalyzer(sample_rate)
+            with PCM16BlockWriter(output_path, sample_rate) as writer:
+                for start in range(0, len(enhanced), block_size):
+                    block = enhanced[start : start + block_size] * np.float32(gain)
+                    final_analyzer.update(block)
+                    writer.write(block)
+
+        finally:
+            # Memory maps must be released first; Windows does not delete mapped files
+            del denoised, enhanced
+            self._remove_temp_file(denoised_path)
+            self._remove_temp_file(enhanced_path)
 
+        if progress_callback:
+            progress_callback(100, "Processing complete!")
+
+        final_analysis = final_analyzer.result()
+        processed_duration = processed_samples / sample_rate
+        logger.info(
+            "AudioEnhancer",
+            "_process_audio_file_streaming",
+            f"Processing complete. Duration: {original_duration:.1f}s -> {processed_duration:.1f}s",
+        )
+
+        return ProcessingResult(
+            success=True,
+            output_path=output_path,
+            original_duration=original_duration,
+            processed_duration=processed_duration,
+            noise_reduction_db=noise_reduction_db,
+            silence_removed_seconds=silence_removed,
+            speech_segments=speech_segments,
+            dynamic_range_db=final_analysis["dynamic_range_db"],
+            peak_level_db=final_analysis["peak_level_db"],
+            rms_level_db=final_analysis["rms_level_db"],
+        )
+
+    def _load_audio(self, file_path: str) -> Tuple[np.ndarray, int]:
+        """Load audio file as mono samples of the working dtype and return data and sample rate"""
+        try:
+            return load_audio(file_path, self.dtype)
         except Exception as e:
             raise Exception(f"Failed to load audio file {file_path}: {e}")
 
@@ -284,35 +1187,23 @@ class AudioEnhancer:
         except Exception as e:
             raise Exception(f"Failed to save audio file {output_path}: {e}")
 
-    def _analyze_audio(self, audio_data: np.ndarray, sample_rate: int) -> Dict:
-        """Analyze audio characteristics"""
-        try:
-            # Calculate basic metrics
-            peak_level = np.max(np.abs(audio_data))
-            rms_level = np.sqrt(np.mean(audio_data**2))
-
-            # Convert to dB
-            peak_level_db = 20 * np.log10(peak_level) if peak_level > 0 else -np.inf
-            rms_level_db = 20 * np.log10(rms_level) if rms_level > 0 else -np.inf
-
-            # Calculate dynamic range (simplified)
-            sorted_samples = np.sort(np.abs(audio_data))
-            percentile_95 = sorted_samples[int(0.95 * len(sorted_samples))]
-            percentile_10 = sorted_samples[int(0.10 * len(sorted_samples))]
-
-            dynamic_range_db = 20 * np.log10(percentile_95 / percentile_10) if percentile_10 > 0 else 0
-
-            # Spectral analysis
-            freqs, psd = signal.welch(audio_data, sample_rate, nperseg=1024)
-            spectral_centroid = np.sum(freqs * psd) / np.sum(psd)
+    def _analyze_audio(
+        self,
+        audio_data: np.ndarray,
+        sample_rate: int,
+        block_size: int = 262144,
+    ) -> Dict:
+        """
+        Analyze audio characteristics
 
-            return {
-                "peak_level_db": peak_level_db,
-                "rms_level_db": rms_level_db,
-                "dynamic_range_db": dynamic_range_db,
-                "spectral_centroid": spectral_centroid,
-                "duration": len(audio_data) / sample_rate,
-            }
+        One pass over the signal in blocks (see AudioAnalyzer). Percentiles
+        come from a 0.01 dB level histogram instead of sorting the samples.
+        """
+        try:
+            analyzer = AudioAnalyzer(sample_rate)
+            for start in range(0, len(audio_data), block_size):
+                analyzer.update(audio_data[start : start + block_size])
+            return analyzer.result()
 
         except Exception as e:
             logger.error("AudioEnhancer", "_analyze_audio", f"Analysis failed: {e}")
@@ -324,9 +1215,23 @@ class AudioEnhancer:
                 "duration": 0,
             }
 
-    def _reduce_noise(self, audio_data: np.ndarray, sample_rate: int, strength: float) -> Tuple[np.ndarray, float]:
-        """Apply noise reduction to audio"""
+    def _reduce_noise(
+        self,
+        audio_data: np.ndarray,
+        sample_rate: int,
+        strength: float,
+    ) -> Tuple[np.ndarray, float]:
+        """
+        Apply noise reduction to audio
+
+        With a stored noise profile for the configured device and environment,
+        spectral subtraction uses it directly instead of estimating the noise.
+        """
         try:
+            profile_spectrum = self._noise_profile_spectrum(sample_rate)
+            if profile_spectrum is not None and strength > 0:
+                return self._spectral_subtraction(audio_data, sample_rate, strength, profile_spectrum)
+
             if NOISEREDUCE_AVAILABLE and strength > 0:
                 # Use noisereduce library if available
                 reduced_audio = nr.reduce_noise(
@@ -352,54 +1257,83 @@ class AudioEnhancer:
             logger.warning("AudioEnhancer", "_reduce_noise", f"Noise reduction failed: {e}")
             return audio_data, 0.0
 
-    def _spectral_subtraction(
-        self, audio_data: np.ndarray, sample_rate: int, strength: float
-    ) -> Tuple[np.ndarray, float]:
-        """Simple spectral subtraction noise reduction"""
-        try:
-            # Parameters
-            frame_size = 1024
-            hop_size = frame_size // 4
-            alpha = strength * 2.0  # Oversubtraction factor
+    def _noise_profile_spectrum(self, sample_rate: int, frame_size: int = 1024) -> Optional[np.ndarray]:
+        """Stored noise spectrum for the configured device and environment, if there is one"""
+        device_serial = self.settings.noise_profile_device
+        if not device_serial:
+            return None
+        if self.noise_profiles is None:
+            self.noise_profiles = NoiseProfileStore()
+
+        profile = self.noise_profiles.get(
+            device_serial, self.settings.noise_profile_environment, sample_rate, frame_size
+        )
+        if profile is None:
+            logger.info(
+                "AudioEnhancer",
+                "_noise_profile_spectrum",
+                f"No noise profile for {device_serial}/{self.settings.noise_profile_environment} at {sample_rate} Hz",
+            )
+            return None
+        return profile.spectrum
 
-            # Estimate noise from first 0.5 seconds
-            noise_frames = int(0.5 * sample_rate / hop_size)
+    def learn_noise_profile(
+        self, input_path: str, device_serial: Optional[str] = None, environment: Optional[str] = None
+    ) -> NoiseProfile:
+        """
+        Learn the noise floor of a recording into the stored profile
 
-            # STFT
-            f, t, stft_data = signal.stft(
-                audio_data,
-                sample_rate,
-                nperseg=frame_size,
-                noverlap=frame_size - hop_size,
-            )
+        Args:
+            input_path: Recording made with the device in the environment
+            device_serial: Device serial (defaults to settings.noise_profile_device)
+            environment: Environment tag (defaults to settings.noise_profile_environment)
 
-            # Estimate noise spectrum (average of first frames)
-            noise_spectrum = np.mean(np.abs(stft_data[:, :noise_frames]), axis=1, keepdims=True)
+        Returns:
+            The updated NoiseProfile
+        """
+        device_serial = device_serial or self.settings.noise_profile_device
+        if not device_serial:
+            raise ValueError("A device serial is required to learn a noise profile")
+        if self.noise_profiles is None:
+            self.noise_profiles = NoiseProfileStore()
 
-            # Apply spectral subtraction
-            magnitude = np.abs(stft_data)
-            phase = np.angle(stft_data)
+        audio_data, sample_rate = self._load_audio(input_path)
+        return self.noise_profiles.learn(
+            device_serial, environment or self.settings.noise_profile_environment, audio_data, sample_rate
+        )
 
-            # Subtract noise
-            enhanced_magnitude = magnitude - alpha * noise_spectrum
+    def _spectral_subtraction(
+        self,
+        audio_data: np.ndarray,
+        sample_rate: int,
+        strength: float,
+        noise_spectrum: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, float]:
+        """
+        Simple spectral subtraction noise reduction
+
+        The spectrum is computed once and read for the noise estimate, the
+        gain and the noise reduction metric. noise_spectrum (e.g. from a
+        stored NoiseProfile) replaces the estimate from the first 0.5 seconds.
+        """
+        try:
+            alpha = strength * 2.0  # Oversubtraction factor
+            frames = SpectralFrames.from_signal(audio_data, sample_rate)
 
-            # Apply spectral floor (prevent over-subtraction)
-            spectral_floor = 0.1 * magnitude
-            enhanced_magnitude = np.maximum(enhanced_magnitude, spectral_floor)
+            # Estimate noise spectrum from the first 0.5 seconds
+            noise_frames = frames.noise_frames(0.5)
+            if noise_spectrum is None:
+                noise_spectrum = frames.noise_spectrum(0.5)
 
-            # Reconstruct signal
-            enhanced_stft = enhanced_magnitude * np.exp(1j * phase)
-            _, enhanced_audio = signal.istft(
-                enhanced_stft,
-                sample_rate,
-                nperseg=frame_size,
-                noverlap=frame_size - hop_size,
-            )
+            # Subtract the noise, with a spectral floor at 10% of the magnitude to prevent over-subtraction
+            gain = _subtraction_gain(frames.magnitude, noise_spectrum, alpha)
+            enhanced_audio = frames.apply_gain(gain).to_signal()
 
-            # Calculate noise reduction
-            noise_reduction_db = 20 * np.log10(np.mean(noise_spectrum) / np.mean(enhanced_magnitude[:, :noise_frames]))
+            # Calculate noise reduction over the first 0.5 seconds
+            enhanced_noise = frames.magnitude[:noise_frames] * gain[:noise_frames]
+            noise_reduction_db = 20 * np.log10(np.mean(frames.magnitude[:noise_frames]) / np.mean(enhanced_noise))
 
-            return enhanced_audio[: len(audio_data)], noise_reduction_db
+            return enhanced_audio, float(noise_reduction_db)
 
         except Exception as e:
             logger.error(
@@ -409,55 +1343,81 @@ class AudioEnhancer:
             )
             return audio_data, 0.0
 
+    @staticmethod
+    def _frame_rms(audio_data: np.ndarray, frame_size: int, hop_size: int, chunk_frames: int = 4096) -> np.ndarray:
+        """
+        RMS energy of every frame starting at 0, hop_size, ... (excluding the final partial frame)
+
+        Uses a running sum of squares, computed chunk by chunk so the float64
+        scratch space stays bounded for long recordings.
+        """
+        num_frames = max(0, -(-(len(audio_data) - frame_size) // hop_size))
+        rms = np.empty(num_frames)
+
+        for first in range(0, num_frames, chunk_frames):
+            last = min(first + chunk_frames, num_frames)
+            offset = first * hop_size
+            chunk = audio_data[offset : (last - 1) * hop_size + frame_size].astype(np.float64)
+            sum_squares = np.concatenate(([0.0], np.cumsum(chunk * chunk)))
+            starts = np.arange(last - first) * hop_size
+            rms[first:last] = (sum_squares[starts + frame_size] - sum_squares[starts]) / frame_size
+
+        np.sqrt(np.maximum(rms, 0.0, out=rms), out=rms)
+        return rms
+
+    def detect_speech_segments(
+        self,
+        audio_data: np.ndarray,
+        sample_rate: int,
+        threshold_db: float = -40.0,
+        min_duration: float = 0.5,
+    ) -> np.ndarray:
+        """
+        Find speech segments with a 25 ms / 10 ms frame-energy detector
+
+        Returns:
+            Array of shape (n, 2) with [start, end) sample indices of each
+            segment at least min_duration long.
+        """
+        threshold_linear = 10 ** (threshold_db / 20)
+        frame_size = int(0.025 * sample_rate)  # 25ms frames
+        hop_size = int(0.010 * sample_rate)  # 10ms hop
+
+        is_speech = self._frame_rms(audio_data, frame_size, hop_size) > threshold_linear
+        num_frames = len(is_speech)
+
+        # Run boundaries: +1 where speech starts, -1 at the first silent frame after it
+        edges = np.diff(np.concatenate(([0], is_speech.astype(np.int8), [0])))
+        start_frames = np.flatnonzero(edges == 1)
+        end_frames = np.flatnonzero(edges == -1)
+
+        starts = start_frames * hop_size
+        # Speech running into the last frame continues to the end of the audio
+        ends = np.where(end_frames < num_frames, end_frames * hop_size, len(audio_data))
+
+        keep = (ends - starts) / sample_rate >= min_duration
+        return np.column_stack((starts[keep], ends[keep])).astype(np.int64)
+
     def _remove_silence(
         self,
         audio_data: np.ndarray,
         sample_rate: int,
         threshold_db: float = -40.0,
         min_duration: float = 0.5,
-    ) -> Tuple[np.ndarray, float]:
-        """Remove silence from audio"""
+    ) -> Tuple[np.ndarray, float, np.ndarray]:
+        """
+        Remove silence from audio
+
+        Returns:
+            Tuple of (trimmed audio, seconds removed, speech segments as
+            [start, end) sample indices into the original audio)
+        """
         try:
-            # Convert threshold to linear scale
-            threshold_linear = 10 ** (threshold_db / 20)
-
-            # Calculate frame-based energy
-            frame_size = int(0.025 * sample_rate)  # 25ms frames
-            hop_size = int(0.010 * sample_rate)  # 10ms hop
-
-            frames = []
-            for i in range(0, len(audio_data) - frame_size, hop_size):
-                frame = audio_data[i : i + frame_size]
-                energy = np.sqrt(np.mean(frame**2))
-                frames.append((i, energy > threshold_linear))
-
-            # Find continuous speech segments
-            speech_segments = []
-            current_start = None
-
-            for i, (frame_start, is_speech) in enumerate(frames):
-                if is_speech and current_start is None:
-                    current_start = frame_start
-                elif not is_speech and current_start is not None:
-                    # End of speech segment
-                    segment_duration = (frame_start - current_start) / sample_rate
-                    if segment_duration >= min_duration:
-                        speech_segments.append((current_start, frame_start))
-                    current_start = None
-
-            # Handle case where speech continues to end
-            if current_start is not None:
-                segment_duration = (len(audio_data) - current_start) / sample_rate
-                if segment_duration >= min_duration:
-                    speech_segments.append((current_start, len(audio_data)))
+            speech_segments = self.detect_speech_segments(audio_data, sample_rate, threshold_db, min_duration)
 
             # Concatenate speech segments
-            if speech_segments:
-                processed_audio = []
-                for start, end in speech_segments:
-                    processed_audio.append(audio_data[start:end])
-
-                result_audio = np.concatenate(processed_audio)
+            if len(speech_segments):
+                result_audio = np.concatenate([audio_data[start:end] for start, end in speech_segments])
                 silence_removed = (len(audio_data) - len(result_audio)) / sample_rate
 
                 logger.info(
@@ -466,42 +1426,34 @@ class AudioEnhancer:
                     f"Removed {silence_removed:.1f}s of silence",
                 )
 
-                return result_audio, silence_removed
+                return result_audio, silence_removed, speech_segments
             else:
                 # No speech detected, return original
-                return audio_data, 0.0
+                return audio_data, 0.0, speech_segments
 
         except Exception as e:
             logger.error("AudioEnhancer", "_remove_silence", f"Silence removal failed: {e}")
-            return audio_data, 0.0
+            return audio_data, 0.0, np.empty((0, 2), dtype=np.int64)
+
+    def create_filter_chain(self, sample_rate: int) -> SOSFilterChain:
+        """Create a stateful enhancement filter chain for block-by-block processing"""
+        include_deemphasis = self.settings.quality == ProcessingQuality.HIGH_QUALITY
+        return SOSFilterChain(design_enhancement_sos(sample_rate, include_deemphasis), self.dtype)
 
     def _enhance_audio_quality(self, audio_data: np.ndarray, sample_rate: int) -> np.ndarray:
         """Apply audio quality enhancement"""
         try:
-            enhanced_audio = audio_data.copy()
-
-            # Apply gentle high-pass filter to remove low-frequency noise
-            if sample_rate > 8000:  # Only for higher sample rates
-                nyquist = sample_rate / 2
-                high_cutoff = min(80, nyquist * 0.01)  # 80 Hz or 1% of Nyquist
-
-                sos = signal.butter(2, high_cutoff / nyquist, btype="high", output="sos")
-                enhanced_audio = signal.sosfilt(sos, enhanced_audio)
-
-            # Apply gentle low-pass filter for anti-aliasing
-            if sample_rate > 16000:
-                nyquist = sample_rate / 2
-                low_cutoff = min(8000, nyquist * 0.9)  # 8 kHz or 90% of Nyquist
-
-                sos = signal.butter(4, low_cutoff / nyquist, btype="low", output="sos")
-                enhanced_audio = signal.sosfilt(sos, enhanced_audio)
+            # High-pass, low-pass and (in high quality mode) de-emphasis as one filter pass
+            enhanced_audio = self.create_filter_chain(sample_rate).process(audio_data)
 
             # Apply gentle compression to even out dynamics
-            enhanced_audio = self._apply_compression(enhanced_audio, ratio=2.0, threshold=-20.0)
-
-            # Apply de-emphasis if needed (reverse pre-emphasis)
-            if self.settings.quality == ProcessingQuality.HIGH_QUALITY:
-                enhanced_audio = self._apply_deemphasis(enhanced_audio, sample_rate)
+            enhanced_audio = self._apply_compression(
+                enhanced_audio,
+                ratio=2.0,
+                threshold=-20.0,
+                sample_rate=sample_rate,
+                mode=self.settings.compressor_mode,
+            )
 
             return enhanced_audio
 
@@ -509,26 +1461,42 @@ class AudioEnhancer:
             logger.error("AudioEnhancer", "_enhance_audio_quality", f"Enhancement failed: {e}")
             return audio_data
 
-    def _apply_compression(self, audio_data: np.ndarray, ratio: float = 2.0, threshold: float = -20.0) -> np.ndarray:
-        """Apply dynamic range compression"""
+    def _apply_compression(
+        self,
+        audio_data: np.ndarray,
+        ratio: float = 2.0,
+        threshold: float = -20.0,
+        sample_rate: Optional[int] = None,
+        mode: CompressorMode = CompressorMode.STATIC,
+    ) -> np.ndarray:
+        """
+        Apply dynamic range compression
+
+        STATIC mode applies the gain curve to each sample's magnitude directly.
+        ENVELOPE mode needs sample_rate and follows the signal's peak envelope
+        with the configured attack and release times.
+        """
         try:
+            if mode == CompressorMode.ENVELOPE and sample_rate:
+                return self._apply_envelope_compression(
+                    audio_data,
+                    sample_rate,
+                    ratio,
+                    threshold,
+                    self.settings.compressor_attack_ms,
+                    self.settings.compressor_release_ms,
+                )
+
             # Convert threshold to linear scale
             threshold_linear = 10 ** (threshold / 20)
 
-            # Simple compression algorithm
+            # Compress the part of each sample's magnitude above the threshold, preserving sign
+            magnitude = np.abs(audio_data)
+            above = magnitude > threshold_linear
             compressed_audio = audio_data.copy()
-
-            for i in range(len(compressed_audio)):
-                sample_abs = abs(compressed_audio[i])
-
-                if sample_abs > threshold_linear:
-                    # Apply compression above threshold
-                    excess = sample_abs - threshold_linear
-                    compressed_excess = excess / ratio
-                    new_amplitude = threshold_linear + compressed_excess
-
-                    # Preserve sign
-                    compressed_audio[i] = new_amplitude * np.sign(compressed_audio[i])
+            compressed_audio[above] = np.copysign(
+                threshold_linear + (magnitude[above] - threshold_linear) / ratio, audio_data[above]
+            )
 
             return compressed_audio
 
@@ -536,25 +1504,22 @@ class AudioEnhancer:
             logger.error("AudioEnhancer", "_apply_compression", f"Compression failed: {e}")
             return audio_data
 
-    def _apply_deemphasis(self, audio_data: np.ndarray, sample_rate: int) -> np.ndarray:
-        """Apply de-emphasis filter"""
-        try:
-            # Standard de-emphasis filter (75 μs time constant)
-            tau = 75e-6  # 75 microseconds
-            alpha = np.exp(-1 / (sample_rate * tau))
-
-            # First-order IIR filter: y[n] = alpha * y[n-1] + (1-alpha) * x[n]
-            deemphasized = np.zeros_like(audio_data)
-            deemphasized[0] = audio_data[0]
-
-            for i in range(1, len(audio_data)):
-                deemphasized[i] = alpha * deemphasized[i - 1] + (1 - alpha) * audio_data[i]
-
-            return deemphasized
-
-        except Exception as e:
-            logger.error("AudioEnhancer", "_apply_deemphasis", f"De-emphasis failed: {e}")
-            return audio_data
+    def _apply_envelope_compression(
+        self,
+        audio_data: np.ndarray,
+        sample_rate: int,
+        ratio: float,
+        threshold: float,
+        attack_ms: float,
+        release_ms: float,
+        block_ms: float = 2.0,
+    ) -> np.ndarray:
+        """Compress using a peak envelope follower evaluated block-wise (see EnvelopeCompressor)"""
+        if len(audio_data) == 0:
+            return audio_data.copy()
+
+        compressor = EnvelopeCompressor(sample_rate, ratio, threshold, attack_ms, release_ms, block_ms)
+        return np.concatenate((compressor.process(audio_data), compressor.flush())).astype(audio_data.dtype, copy=False)
 
     def _normalize_audio(self, audio_data: np.ndarray, target_lufs: float = -23.0) -> np.ndarray:
         """Normalize audio to target LUFS level"""
@@ -563,21 +1528,8 @@ class AudioEnhancer:
             current_rms = np.sqrt(np.mean(audio_data**2))
 
             if current_rms > 0:
-                # Convert target LUFS to linear scale (approximation)
-                target_rms = 10 ** (target_lufs / 20)
-
-                # Calculate gain needed
-                gain = target_rms / current_rms
-
-                # Apply gain with limiting to prevent clipping
-                normalized_audio = audio_data * gain
-
-                # Soft limiting
-                peak = np.max(np.abs(normalized_audio))
-                if peak > 0.95:  # Leave some headroom
-                    normalized_audio = normalized_audio * (0.95 / peak)
-
-                return normalized_audio
+                gain = self._normalization_gain(current_rms, np.max(np.abs(audio_data)), target_lufs)
+                return audio_data * audio_data.dtype.type(gain)
             else:
                 return audio_data
 
@@ -585,6 +1537,18 @@ class AudioEnhancer:
             logger.error("AudioEnhancer", "_normalize_audio", f"Normalization failed: {e}")
             return audio_data
 
+    @staticmethod
+    def _normalization_gain(current_rms: float, current_peak: float, target_lufs: float) -> float:
+        """Gain that brings the RMS level to target_lufs, limited so the peak stays below 0.95"""
+        # Convert target LUFS to linear scale (approximation)
+        target_rms = 10 ** (target_lufs / 20)
+        gain = target_rms / current_rms
+
+        # Soft limiting: leave some headroom
+        if current_peak * gain > 0.95:
+            gain = 0.95 / current_peak
+        return gain
+
     def convert_format(
         self,
         input_path: str,
@@ -601,53 +1565,106 @@ class AudioEnhancer:
                 f"Converting {input_path} to {target_format}",
             )
 
-            if PYDUB_AVAILABLE:
-                # Use pydub for format conversion
-                audio = AudioSegment.from_file(input_path)
-
-                # Resample if needed
-                if target_sample_rate and audio.frame_rate != target_sample_rate:
-                    audio = audio.set_frame_rate(target_sample_rate)
-
-                # Set bit depth
-                if target_bit_depth == 16:
-                    audio = audio.set_sample_width(2)
-                elif target_bit_depth == 24:
-                    audio = audio.set_sample_width(3)
-                elif target_bit_depth == 32:
-                    audio = audio.set_sample_width(4)
+            if not PYDUB_AVAILABLE or (target_format.lower() == "wav" and target_bit_depth == 16):
+                # Stream through the polyphase resampler in bounded memory
+                try:
+                    resample_file(
+                        input_path,
+                        output_path,
+                        target_sample_rate,
+                        mono=False,
+                        block_size=self.settings.stream_block_size,
+                    )
+                    logger.info("AudioEnhancer", "convert_format", "Conversion successful")
+                    return True
+                except ValueError as e:
+                    if not PYDUB_AVAILABLE:
+                        raise
+                    logger.debug("AudioEnhancer", "convert_format", f"Streaming conversion unavailable: {e}")
+
+            # Use pydub for format conversion
+            audio = AudioSegment.from_file(input_path)
 
-                # Export with format
-                audio.export(output_path, format=target_format)
+            # Resample if needed
+            if target_sample_rate and audio.frame_rate != target_sample_rate:
+                audio = audio.set_frame_rate(target_sample_rate)
 
-                logger.info("AudioEnhancer", "convert_format", "Conversion successful")
-                return True
+            # Set bit depth
+            if target_bit_depth == 16:
+                audio = audio.set_sample_width(2)
+            elif target_bit_depth == 24:
+                audio = audio.set_sample_width(3)
+            elif target_bit_depth == 32:
+                audio = audio.set_sample_width(4)
 
-            else:
-                # Fallback: Load and save with different format
-                audio_data, sample_rate = self._load_audio(input_path)
-
-                if target_sample_rate and sample_rate != target_sample_rate:
-                    # Simple resampling
-                    audio_data = signal.resample(
-                        audio_data,
-                        int(len(audio_data) * target_sample_rate / sample_rate),
-                    )
-                    sample_rate = target_sample_rate
+            # Export with format
+            audio.export(output_path, format=target_format)
 
-                self._save_audio(audio_data, sample_rate, output_path)
-                return True
+            logger.info("AudioEnhancer", "convert_format", "Conversion successful")
+            return True
 
         except Exception as e:
             logger.error("AudioEnhancer", "convert_format", f"Format conversion failed: {e}")
             return False
 
-    def batch_process(self, input_files: List[str], output_dir: str, progress_callback=None) -> List[ProcessingResult]:
-        """Process multiple audio files"""
+    def batch_process(
+        self,
+        input_files: List[str],
+        output_dir: str,
+        progress_callback=None,
+        max_workers: Optional[int] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> List[ProcessingResult]:
+        """
+        Process multiple audio files
+
+        Files are processed in a pool of max_workers processes (one per CPU
+        core by default, max_workers=1 processes them in this process).
+
+        Args:
+            input_files: Paths of the audio files to enhance
+            output_dir: Directory for the "<name>_enhanced.wav" outputs
+            progress_callback: Optional callback(percent, message) for overall
+                progress, updated as each file reports its own progress
+            max_workers: Number of worker processes
+            cancel_event: When set, files that have not started are skipped
+                and reported as cancelled; files already running complete
+
+        Returns:
+            One ProcessingResult per input file, in input order
+        """
+        total_files = len(input_files)
+        output_files = [
+            os.path.join(output_dir, f"{os.path.splitext(os.path.basename(input_file))[0]}_enhanced.wav")
+            for input_file in input_files
+        ]
+        workers = min(max_workers or os.cpu_count() or 1, total_files)
+
+        if workers <= 1:
+            results = self._batch_process_serial(input_files, output_files, progress_callback, cancel_event)
+        else:
+            results = self._batch_process_parallel(input_files, output_files, progress_callback, workers, cancel_event)
+
+        if progress_callback:
+            progress_callback(100, "Batch processing complete!")
+
+        return results
+
+    def _batch_process_serial(
+        self,
+        input_files: List[str],
+        output_files: List[str],
+        progress_callback,
+        cancel_event: Optional[threading.Event],
+    ) -> List[ProcessingResult]:
         results = []
         total_files = len(input_files)
 
-        for i, input_file in enumerate(input_files):
+        for i, (input_file, output_file) in enumerate(zip(input_files, output_files)):
+            if cancel_event is not None and cancel_event.is_set():
+                results.append(ProcessingResult(success=False, error_message="Cancelled"))
+                continue
+
             try:
                 if progress_callback:
                     progress_callback(
@@ -655,12 +1672,13 @@ class AudioEnhancer:
                         f"Processing {os.path.basename(input_file)}",
                     )
 
-                # Generate output filename
-                base_name = os.path.splitext(os.path.basename(input_file))[0]
-                output_file = os.path.join(output_dir, f"{base_name}_enhanced.wav")
+                def file_progress(percent, message, i=i, input_file=input_file):
+                    progress_callback(
+                        (i + percent / 100) / total_files * 100, f"{os.path.basename(input_file)}: {message}"
+                    )
 
                 # Process file
-                result = self.process_audio_file(input_file, output_file)
+                result = self.process_audio_file(input_file, output_file, file_progress if progress_callback else None)
                 results.append(result)
 
             except Exception as e:
@@ -671,12 +1689,165 @@ class AudioEnhancer:
                 )
                 results.append(ProcessingResult(success=False, error_message=str(e)))
 
-        if progress_callback:
-            progress_callback(100, "Batch processing complete!")
+        return results
+
+    def _batch_process_parallel(
+        self,
+        input_files: List[str],
+        output_files: List[str],
+        progress_callback,
+        max_workers: int,
+        cancel_event: Optional[threading.Event],
+    ) -> List[ProcessingResult]:
+        """
+        Process files in a pool of worker processes
+
+        A worker process that dies (crash, out of memory) breaks the whole
+        pool, and every file it was running fails with BrokenProcessPool.
+        Those files are then rerun one at a time, each in its own pool, so
+        only the file that kills its worker is reported as failed; the rest
+        continue in a new pool.
+        """
+        total_files = len(input_files)
+        results: List[Optional[ProcessingResult]] = [None] * total_files
+        file_progress = [0.0] * total_files
+        progress_queue = multiprocessing.get_context().Queue() if progress_callback else None
+
+        logger.info(
+            "AudioEnhancer",
+            "batch_process",
+            f"Processing {total_files} files with {max_workers} worker processes",
+        )
+
+        def report_progress():
+            # Forward per-file progress from the workers, as an overall percentage
+            while progress_queue is not None:
+                try:
+                    index, percent, message = progress_queue.get_nowait()
+                except queue.Empty:
+                    return
+                file_progress[index] = percent
+                progress_callback(
+                    sum(file_progress) / total_files,
+                    f"{os.path.basename(input_files[index])}: {message}",
+                )
 
+        def run_pool(indices: collections.deque, workers: int) -> List[int]:
+            """Run the files in indices; returns those in flight when the pool broke."""
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_batch_worker,
+                initargs=(progress_queue,),
+            ) as executor:
+                # Submit only as many files as there are workers, so cancelling skips everything not yet started
+                futures = {}
+                broken = False
+                in_flight = []
+
+                while (indices and not broken) or futures:
+                    cancelled = cancel_event is not None and cancel_event.is_set()
+                    while not cancelled and not broken and indices and len(futures) < workers:
+                        index = indices.popleft()
+                        try:
+                            future = executor.submit(
+                                _batch_worker,
+                                self.settings,
+                                self.noise_profiles,
+                                index,
+                                input_files[index],
+                                output_files[index],
+                            )
+                        except BrokenProcessPool:
+                            indices.appendleft(index)
+                            broken = True
+                            break
+                        futures[future] = index
+
+                    if cancelled:
+                        while indices:
+                            results[indices.popleft()] = ProcessingResult(success=False, error_message="Cancelled")
+                        if not futures:
+                            break
+
+                    done, _ = wait(futures, timeout=0.1, return_when=FIRST_COMPLETED)
+                    report_progress()
+
+                    for future in done:
+                        index = futures.pop(future)
+                        try:
+                            results[index] = future.result()
+                            file_progress[index] = 100.0
+                        except BrokenProcessPool:
+                            in_flight.append(index)
+                            broken = True
+                        except Exception as e:
+                            logger.error(
+                                "AudioEnhancer",
+                                "batch_process",
+                                f"Failed to process {input_files[index]}: {e}",
+                            )
+                            results[index] = ProcessingResult(success=False, error_message=str(e))
+                            file_progress[index] = 100.0
+            return in_flight
+
+        pending = collections.deque(range(total_files))
+        while pending:
+            # Files not yet submitted when a pool breaks stay in pending for the next pool
+            in_flight = run_pool(pending, max_workers)
+            if not in_flight:
+                continue
+            logger.warning(
+                "AudioEnhancer",
+                "batch_process",
+                f"A worker process died; rerunning {len(in_flight)} file(s) one at a time",
+            )
+            for index in sorted(in_flight):
+                file_progress[index] = 0.0
+                if run_pool(collections.deque([index]), 1):
+                    logger.error(
+                        "AudioEnhancer",
+                        "batch_process",
+                        f"Worker process died while processing {input_files[index]}",
+                    )
+                    results[index] = ProcessingResult(
+                        success=False, error_message="Worker process died while processing the file"
+                    )
+                    file_progress[index] = 100.0
+
+        report_progress()
         return results
 
 
+# Progress queue of the current batch, set in each worker process by _init_batch_worker
+_batch_progress_queue = None
+
+
+def _init_batch_worker(progress_queue):
+    """Process pool initializer: remember the queue used to report progress"""
+    global _batch_progress_queue
+    _batch_progress_queue = progress_queue
+
+
+def _batch_worker(
+    settings: AudioProcessingSettings,
+    noise_profiles: Optional[NoiseProfileStore],
+    index: int,
+    input_path: str,
+    output_path: str,
+) -> ProcessingResult:
+    """Enhance one file of a batch in a worker process"""
+    progress_queue = _batch_progress_queue
+
+    def file_progress(percent, message):
+        progress_queue.put((index, percent, message))
+
+    enhancer = AudioEnhancer(settings, noise_profiles)
+    try:
+        return enhancer.process_audio_file(input_path, output_path, file_progress if progress_queue else None)
+    finally:
+        enhancer.cleanup_temp_files()
+
+
 class AudioFormatConverter:
     """Specialized audio format converter"""
 
@@ -796,25 +1967,95 @@ def enhance_audio_file(
     output_path: str,
     settings: AudioProcessingSettings = None,
     progress_callback=None,
+    use_cache: bool = True,
+    cache: Optional[ResultCache] = None,
+    noise_profiles: Optional[NoiseProfileStore] = None,
 ) -> ProcessingResult:
     """
     Convenience function to enhance a single audio file
 
+    Enhanced outputs are cached by input content, settings and output
+    format, so enhancing the same recording again copies the cached result.
+    With settings.noise_profile_device set, the key also covers the state of
+    that device's noise profiles, so relearning a profile invalidates it.
+
     Args:
         input_path: Path to input audio file
         output_path: Path for enhanced output file
         settings: Processing settings (optional)
         progress_callback: Progress callback function (optional)
+        use_cache: Whether to use the result cache
+        cache: Result cache to use instead of the shared one under ~/.hidock/cache
+        noise_profiles: Noise profile store to use instead of the one under ~/.hidock/cache
 
     Returns:
         ProcessingResult with operation details
     """
-    enhancer = AudioEnhancer(settings)
+    settings = settings or AudioProcessingSettings()
+    cache_key = None
+    if settings.noise_profile_device and noise_profiles is None:
+        noise_profiles = NoiseProfileStore()
+
+    if use_cache:
+        try:
+            cache = cache or get_result_cache()
+            profile_fingerprint = None
+            if settings.noise_profile_device:
+                profile_fingerprint = noise_profiles.fingerprint(
+                    settings.noise_profile_device, settings.noise_profile_environment
+                )
+            cache_key = ResultCache.make_key(
+                "enhance",
+                PROCESSING_VERSION,
+                NOISEREDUCE_AVAILABLE,
+                cache.file_hash(input_path),
+                _settings_cache_key(settings),
+                profile_fingerprint,
+                os.path.splitext(output_path)[1].lower(),
+            )
+            cached = cache.get_file(cache_key)
+            if cached:
+                cached_path, metadata = cached
+                shutil.copyfile(cached_path, output_path)
+                logger.info("enhance_audio_file", "cache", f"Using cached enhancement of {input_path}")
+                if progress_callback:
+                    progress_callback(100, "Processing complete!")
+                return _result_from_cache(metadata, output_path)
+        except Exception as e:
+            logger.warning("enhance_audio_file", "cache", f"Result cache unavailable: {e}")
+            cache_key = None
+
+    enhancer = AudioEnhancer(settings, noise_profiles)
     try:
-        return enhancer.process_audio_file(input_path, output_path, progress_callback)
+        result = enhancer.process_audio_file(input_path, output_path, progress_callback)
     finally:
         enhancer.cleanup_temp_files()
 
+    if cache_key and result.success:
+        try:
+            cache.put_file(cache_key, output_path, _result_to_cache(result))
+        except Exception as e:
+            logger.warning("enhance_audio_file", "cache", f"Failed to cache enhancement: {e}")
+
+    return result
+
+
+def _result_to_cache(result: ProcessingResult) -> Dict:
+    metadata = dataclasses.asdict(result)
+    del metadata["output_path"]
+    for name, value in metadata.items():
+        # NumPy scalars and arrays to their JSON-friendly Python equivalents
+        if isinstance(value, (np.generic, np.ndarray)):
+            metadata[name] = value.tolist()
+    return metadata
+
+
+def _result_from_cache(metadata: Dict, output_path: str) -> ProcessingResult:
+    metadata = dict(metadata, output_path=output_path)
+    if metadata.get("speech_segments") is not None:
+        metadata["speech_segments"] = np.array(metadata["speech_segments"], dtype=np.int64).reshape(-1, 2)
+    return ProcessingResult(**metadata)
+
 
 def convert_audio_format(input_path: str, output_path: str, target_format: str, quality: str = "high") -> bool:
     """
@@ -836,22 +2077,65 @@ def convert_audio_format(input_path: str, output_path: str, target_format: str,
         converter.cleanup_temp_files()
 
 
-def get_audio_analysis(file_path: str) -> Dict:
+def get_audio_analysis(file_path: str, use_cache: bool = True, cache: Optional[ResultCache] = None) -> Dict:
     """
     Get detailed analysis of audio file
 
+    Results are kept in memory per file path, modification time and size,
+    and in the result cache by file content.
+
     Args:
         file_path: Path to audio file
+        use_cache: Whether to use the persistent result cache
+        cache: Result cache to use instead of the shared one under ~/.hidock/cache
 
     Returns:
         Dictionary with audio analysis results
     """
-    enhancer = AudioEnhancer()
     try:
-        audio_data, sample_rate = enhancer._load_audio(file_path)
-        return enhancer._analyze_audio(audio_data, sample_rate)
+        stat = os.stat(file_path)
+        if use_cache and cache is None:
+            cache = get_result_cache()
+        return dict(_analyze_file(os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size, cache))
     except Exception as e:
         logger.error("get_audio_analysis", "analysis", f"Analysis failed: {e}")
         return {}
+
+
+@lru_cache(maxsize=256)
+def _analyze_file(file_path: str, mtime_ns: int, size: int, cache: Optional[ResultCache]) -> Dict:
+    """Analyze a file version; mtime_ns and size are only part of the memo key"""
+    cache_key = None
+    if cache is not None:
+        try:
+            cache_key = ResultCache.make_key("analysis", PROCESSING_VERSION, cache.file_hash(file_path))
+            cached = cache.get_value(cache_key)
+            if cached is not None:
+                return cached
+        except Exception as e:
+            logger.warning("get_audio_analysis", "cache", f"Result cache unavailable: {e}")
+            cache_key = None
+
+    enhancer = AudioEnhancer()
+    try:
+        try:
+            sample_rate, _, read_blocks = enhancer._open_audio_stream(file_path, 262144)
+            blocks = read_blocks()
+        except Exception:
+            # Formats only the full loader understands
+            audio_data, sample_rate = enhancer._load_audio(file_path)
+            blocks = [audio_data]
+
+        analyzer = AudioAnalyzer(sample_rate)
+        for block in blocks:
+            analyzer.update(block)
+        analysis = analyzer.result()
     finally:
         enhancer.cleanup_temp_files()
+
+    if cache_key:
+        try:
+            cache.put_value(cache_key, analysis)
+        except Exception as e:
+            logger.warning("get_audio_analysis", "cache", f"Failed to cache analysis: {e}")
+    return analysis
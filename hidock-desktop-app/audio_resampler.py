@@ -0,0 +1,191 @@
+"""
+Polyphase Sample Rate Conversion for the HiDock Desktop Application.
+
+Converts between sample rates with a rational up/down polyphase FIR filter,
+the same design and alignment as scipy.signal.resample_poly, but fed block
+by block with state carried between blocks:
+- Memory is bounded by the block size, not the recording length
+- Filter designs are cached per (up, down) ratio, so 16k/24k/44.1k/48k
+  conversions reuse them
+- Only the output samples that are kept are computed
+"""
+
+from fractions import Fraction
+from functools import lru_cache
+from math import gcd
+from typing import Optional, Tuple
+
+import numpy as np
+import scipy.signal as signal
+from numpy.lib.stride_tricks import sliding_window_view
+
+from audio_loader import PCM16BlockWriter, open_audio_stream
+from config_and_logger import logger
+
+MAX_PHASES = 640  # Largest up or down factor before the ratio is approximated
+
+
+def rational_ratio(from_rate: float, to_rate: float) -> Tuple[int, int]:
+    """Smallest (up, down) with to_rate / from_rate == up / down, approximated beyond MAX_PHASES."""
+    if float(from_rate).is_integer() and float(to_rate).is_integer():
+        divisor = gcd(int(from_rate), int(to_rate))
+        up, down = int(to_rate) // divisor, int(from_rate) // divisor
+        if max(up, down) <= MAX_PHASES:
+            return up, down
+
+    ratio = Fraction(to_rate / from_rate).limit_denominator(MAX_PHASES)
+    while max(ratio.numerator, ratio.denominator) > MAX_PHASES:
+        ratio = ratio.limit_denominator(ratio.denominator // 2)
+    logger.info("audio_resampler", "rational_ratio", f"Approximating {from_rate}->{to_rate} Hz as {ratio}")
+    return ratio.numerator, ratio.denominator
+
+
+@lru_cache(maxsize=32)
+def design_polyphase_filter(up: int, down: int, dtype: str = "float32") -> Tuple[np.ndarray, int]:
+    """
+    Kaiser-windowed lowpass split into polyphase branches
+
+    Returns:
+        Tuple of (branches, half_len). branches[p] holds the taps of phase p
+        in reverse order, ready to be dotted with a window of input samples.
+    """
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    taps = signal.firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0)) * up
+
+    num_taps = -(-len(taps) // up)
+    padded = np.zeros(num_taps * up)
+    padded[: len(taps)] = taps
+    branches = padded.reshape(num_taps, up).T[:, ::-1]
+    branches = np.ascontiguousarray(branches, dtype=dtype)
+    branches.flags.writeable = False
+    return branches, half_len
+
+
+class PolyphaseResampler:
+    """
+    Stateful rational resampler
+
+    Feeding a signal through process() in blocks of any size and then
+    calling flush() gives the same samples as resample_poly on the whole
+    signal. Input may be 1-D or shaped (frames, channels). Equal rates pass
+    samples straight through.
+    """
+
+    def __init__(self, from_rate: float, to_rate: float, dtype=np.float32):
+        self.from_rate = from_rate
+        self.to_rate = to_rate
+        self.dtype = np.dtype(dtype)
+        self.up, self.down = rational_ratio(from_rate, to_rate)
+        self.passthrough = self.up == self.down == 1
+        if self.passthrough:
+            self.branches, self.half_len = None, 0
+            self.num_taps = 1
+        else:
+            self.branches, self.half_len = design_polyphase_filter(self.up, self.down, self.dtype.name)
+            self.num_taps = self.branches.shape[1]
+        self.reset()
+
+    def reset(self):
+        """Forget all input, ready for a new signal."""
+        self._buffer = None
+        self._frame_shape = ()  # Channel layout of the input, () for 1-D
+        self._base = -self.num_taps  # Input index of _buffer[0]; samples before 0 are zeros
+        self._input_count = 0
+        self._output_count = 0
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Feed input samples and return the output samples they complete."""
+        block = np.asarray(block, dtype=self.dtype)
+        self._frame_shape = block.shape[1:]
+        if self.passthrough:
+            return block.copy()
+        if self._buffer is None:
+            self._buffer = np.zeros((self.num_taps,) + block.shape[1:], dtype=self.dtype)
+        self._buffer = np.concatenate([self._buffer, block])
+        self._input_count += len(block)
+
+        # Output m needs input up to (m * down + half_len) // up
+        ready = (self._input_count * self.up - 1 - self.half_len) // self.down + 1
+        return self._produce(max(ready, self._output_count))
+
+    def flush(self) -> np.ndarray:
+        """Return the remaining output, treating the input as ended."""
+        if self._buffer is None:
+            return np.zeros((0,) + self._frame_shape, dtype=self.dtype)
+        total = -(-self._input_count * self.up // self.down)
+        last_input = ((total - 1) * self.down + self.half_len) // self.up
+        padding = max(0, last_input + 1 - self._input_count)
+        self._buffer = np.concatenate([self._buffer, np.zeros((padding,) + self._buffer.shape[1:], dtype=self.dtype)])
+        return self._produce(total)
+
+    def _produce(self, end: int) -> np.ndarray:
+        start = self._output_count
+        count = end - start
+        output = np.empty((max(count, 0),) + self._buffer.shape[1:], dtype=self.dtype)
+
+        if count > 0:
+            windows = sliding_window_view(self._buffer, self.num_taps, axis=0)
+            # Outputs up apart share a phase and step down input samples
+            for offset in range(min(self.up, count)):
+                position = (start + offset) * self.down + self.half_len
+                first = position // self.up - self.num_taps + 1 - self._base
+                output[offset :: self.up] = windows[first :: self.down][: len(output[offset :: self.up])] @ (
+                    self.branches[position % self.up]
+                )
+            self._output_count = end
+
+        # Drop input no later output can reach
+        keep_from = (self._output_count * self.down + self.half_len) // self.up - self.num_taps + 1
+        drop = max(0, keep_from - self._base)
+        if drop:
+            self._buffer = self._buffer[drop:]
+            self._base += drop
+        return output
+
+
+def resample(audio: np.ndarray, from_rate: float, to_rate: float, block_size: int = 262144) -> np.ndarray:
+    """Resample a whole signal, working through it in blocks."""
+    resampler = PolyphaseResampler(from_rate, to_rate, audio.dtype if audio.dtype.kind == "f" else np.float32)
+    blocks = [resampler.process(audio[start : start + block_size]) for start in range(0, len(audio), block_size)]
+    return np.concatenate(blocks + [resampler.flush()])
+
+
+def resample_file(
+    input_path: str,
+    output_path: str,
+    to_rate: Optional[int] = None,
+    speed: float = 1.0,
+    mono: bool = True,
+    block_size: int = 262144,
+) -> int:
+    """
+    Resample an audio file to 16-bit PCM without loading it whole
+
+    Args:
+        input_path: Source audio file
+        output_path: Output file (WAV, or any format soundfile can write)
+        to_rate: Output sample rate (defaults to the input's)
+        speed: Playback speed factor; the input is treated as recorded at
+            speed times its rate, changing speed and pitch together
+        mono: Mix the input down to one channel
+        block_size: Input samples read per block
+
+    Returns:
+        Number of frames written
+    """
+    sample_rate, _, channels, read_blocks = open_audio_stream(input_path, block_size, mono=mono)
+    to_rate = to_rate or sample_rate
+    resampler = PolyphaseResampler(sample_rate * speed, to_rate)
+
+    written = 0
+    with PCM16BlockWriter(output_path, to_rate, channels) as writer:
+        for block in read_blocks():
+            output = resampler.process(block)
+            writer.write(output)
+            written += len(output)
+        output = resampler.flush()
+        if len(output):
+            writer.write(output)
+            written += len(output)
+    return written
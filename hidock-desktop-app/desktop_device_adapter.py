@@ -5,6 +5,8 @@ This adapter wraps the existing HiDockJensen class to implement the unified
 IDeviceInterface, providing consistent API across platforms.
 """
 
+import io
+
 # import threading  # Commented out - not used in current implementation
 import time
 
@@ -14,8 +16,10 @@ from datetime import datetime
 # from pathlib import Path  # Commented out - not used, may be needed for future file operations
 from typing import Callable, Dict, List, Optional  # Removed Any - not used
 
+from audio_probe import AudioInfo, probe_audio_file
 from config_and_logger import logger
 from constants import DEFAULT_PRODUCT_ID, DEFAULT_VENDOR_ID
+from device_file import open_device_file
 from device_interface import (
     AudioRecording,
     ConnectionStats,
@@ -411,6 +415,30 @@ class DesktopDeviceAdapter(IDeviceInterface):
         finally:
             self.remove_progress_listener(f"download_{recording_id}")
 
+    def open_recording(self, recording_id: str, file_size: int, device_lock=None) -> io.BufferedReader:
+        """
+        Open a recording on the device as a seekable read-only file.
+
+        Only the blocks that are read are transferred, so headers or short
+        excerpts can be inspected without downloading the recording.
+        """
+        if not self.is_connected():
+            raise ConnectionError("No device connected")
+        return open_device_file(self.jensen_device, recording_id, file_size, device_lock=device_lock)
+
+    async def probe_recording(self, recording_id: str, file_size: int) -> Optional[AudioInfo]:
+        """Read the format and exact duration of a recording from its headers on the device."""
+        try:
+            with self.open_recording(recording_id, file_size) as recording_file:
+                return probe_audio_file(recording_file, file_size, recording_id)
+        except Exception as e:
+            logger.warning(
+                "DesktopDeviceAdapter",
+                "probe_recording",
+                f"Failed to probe {recording_id}: {e}",
+            )
+            return None
+
     async def delete_recording(
         self,
         recording_id: str,
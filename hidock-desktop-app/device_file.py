@@ -0,0 +1,189 @@
+"""
+Random-Access Device Files for the HiDock Desktop Application.
+
+Exposes a recording on the device as a read-only, seekable binary file built
+on HiDockJensen.get_file_block, so header probing, duration checks and
+partial reads transfer only the bytes they touch instead of the whole file:
+- Reads are served from an LRU cache of fixed-size blocks
+- Consecutive missing blocks are fetched with a single device request
+- Sequential reads grow a read-ahead window, so scanning a file costs few
+  round trips, while scattered reads fetch just their blocks
+"""
+
+import io
+import threading
+from collections import OrderedDict
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Optional
+
+from config_and_logger import logger
+
+DEVICE_BLOCK_SIZE = 32 * 1024  # Bytes per cached block
+CACHE_BLOCKS = 64  # Blocks kept per file (2 MB)
+MAX_READ_AHEAD_BLOCKS = 8  # Largest sequential read-ahead window, also the largest single request
+FETCH_RETRIES = 3
+
+
+@dataclass
+class BlockCacheStats:
+    """Block cache counters of one device file"""
+
+    hits: int = 0
+    misses: int = 0
+    requests: int = 0  # get_file_block calls
+    bytes_fetched: int = 0
+
+
+class DeviceFile(io.RawIOBase):
+    """
+    Read-only file over a recording on the device
+
+    Args:
+        device: HiDockJensen, or anything with get_file_block(filename, offset, length)
+        filename: Name of the recording on the device
+        file_length: Size of the recording in bytes
+        block_size: Bytes per cached block
+        cache_blocks: Blocks kept in the LRU cache
+        device_lock: Lock held around each device request
+    """
+
+    def __init__(
+        self,
+        device,
+        filename: str,
+        file_length: int,
+        block_size: int = DEVICE_BLOCK_SIZE,
+        cache_blocks: int = CACHE_BLOCKS,
+        device_lock=None,
+    ):
+        super().__init__()
+        self.device = device
+        self.filename = filename
+        self.file_length = file_length
+        self.block_size = block_size
+        self.cache_blocks = max(cache_blocks, MAX_READ_AHEAD_BLOCKS)
+        self.device_lock = device_lock
+        self.stats = BlockCacheStats()
+
+        self._blocks: "OrderedDict[int, bytes]" = OrderedDict()
+        self._position = 0
+        self._next_sequential_block = 0  # Block a sequential reader asks for next
+        self._read_ahead = 1
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return self.filename
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self.file_length
+        elif whence != io.SEEK_SET:
+            raise ValueError(f"Invalid whence {whence}")
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self._position = offset
+        return offset
+
+    def tell(self) -> int:
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed file")
+        view = memoryview(buffer).cast("B")
+        end = min(self._position + len(view), self.file_length)
+        if end <= self._position:
+            return 0
+
+        with self._lock:
+            written = 0
+            position = self._position
+            while position < end:
+                index, offset = divmod(position, self.block_size)
+                block = self._block(index)
+                count = min(len(block) - offset, end - position)
+                if count <= 0:
+                    break
+                view[written : written + count] = block[offset : offset + count]
+                written += count
+                position += count
+
+        self._position = position
+        return written
+
+    def _block(self, index: int) -> bytes:
+        block = self._blocks.get(index)
+        if block is not None:
+            self._blocks.move_to_end(index)
+            self.stats.hits += 1
+            self._track_sequence(index, hit=True)
+            return block
+
+        self.stats.misses += 1
+        self._track_sequence(index, hit=False)
+        last_block = (self.file_length - 1) // self.block_size
+        count = 1
+        while count < self._read_ahead and index + count <= last_block and (index + count) not in self._blocks:
+            count += 1
+        self._fetch(index, count)
+        return self._blocks[index]
+
+    def _track_sequence(self, index: int, hit: bool):
+        """Grow the read-ahead window on sequential misses, reset it on a jump."""
+        if index == self._next_sequential_block:
+            if not hit:
+                self._read_ahead = min(self._read_ahead * 2, MAX_READ_AHEAD_BLOCKS)
+        elif index + 1 != self._next_sequential_block:
+            self._read_ahead = 1
+        self._next_sequential_block = index + 1
+
+    def _fetch(self, first_block: int, count: int):
+        """Fetch consecutive blocks with one request (more if the device returns less)."""
+        offset = first_block * self.block_size
+        end = min((first_block + count) * self.block_size, self.file_length)
+        data = bytearray()
+        retries = 0
+        while offset + len(data) < end:
+            with self.device_lock or nullcontext():
+                chunk = self.device.get_file_block(self.filename, offset + len(data), end - offset - len(data))
+            self.stats.requests += 1
+            if not chunk:
+                retries += 1
+                if retries >= FETCH_RETRIES:
+                    raise OSError(f"Could not read {self.filename} at byte {offset + len(data)}")
+                continue
+            data += chunk[: end - offset - len(data)]
+        self.stats.bytes_fetched += len(data)
+
+        for index in range(count):
+            self._blocks[first_block + index] = bytes(data[index * self.block_size : (index + 1) * self.block_size])
+        while len(self._blocks) > self.cache_blocks:
+            self._blocks.popitem(last=False)
+
+        logger.debug(
+            "DeviceFile",
+            "_fetch",
+            f"Fetched {count} block(s) of {self.filename} at byte {first_block * self.block_size}",
+        )
+
+    def close(self):
+        self._blocks.clear()
+        super().close()
+
+
+def open_device_file(
+    device, filename: str, file_length: int, buffer_size: Optional[int] = None, device_lock=None
+) -> io.BufferedReader:
+    """A DeviceFile wrapped in a BufferedReader, for code expecting a regular binary file."""
+    raw = DeviceFile(device, filename, file_length, device_lock=device_lock)
+    return io.BufferedReader(raw, buffer_size or io.DEFAULT_BUFFER_SIZE)
@@ -178,15 +178,18 @@ class FileActionsMixin:
             and op.status in [FileOperationStatus.PENDING, FileOperationStatus.IN_PROGRESS]
         ]
 
-        if not download_operations:
+        # The download for playback runs outside the operation queue
+        playback_cancelled = self._cancel_playback_download()
+
+        if not download_operations and not playback_cancelled:
             logger.info("CLI", "No Downloads", "No active downloads to cancel.")
             return
 
-        cancelled_count = 0
+        cancelled_count = 1 if playback_cancelled else 0
         for operation in download_operations:
             if self.file_operations_manager.cancel_operation(operation.operation_id):
                 cancelled_count += 1
-            self.update_status_bar(progress_text=f"Cancelled {cancelled_count} download(s).")
+        self.update_status_bar(progress_text=f"Cancelled {cancelled_count} download(s).")
 
     def cancel_selected_downloads_gui(self, selected_filenames):
         """Cancels download operations for selected files."""
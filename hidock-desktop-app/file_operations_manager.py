@@ -27,6 +27,7 @@ from typing import Any, Callable, Dict, List, Optional
 
 from config_and_logger import logger
 from device_interface import OperationProgress
+from storage_management import record_file_access, set_storage_cache_dir
 
 
 class FileOperationType(Enum):
@@ -286,6 +287,8 @@ class FileOperationsManager:
         # Initialize metadata cache
         cache_dir = cache_dir or os.path.join(os.path.expanduser("~"), ".hidock", "cache")
         self.metadata_cache = FileMetadataCache(cache_dir)
+        # Access history from every feature goes to this cache directory
+        set_storage_cache_dir(cache_dir)
 
         # Operation tracking
         self.active_operations: Dict[str, FileOperation] = {}
@@ -475,19 +478,7 @@ class FileOperationsManager:
             )
             raise IOError(f"Download failed for {filename}") from e
 
-        # Validate downloaded file
-        if self._validate_downloaded_file(filename, local_path):
-            # Update metadata cache
-            metadata = self.metadata_cache.get_metadata(filename)
-            if metadata:
-                metadata.local_path = str(local_path)
-                metadata.download_count += 1
-                metadata.last_accessed = datetime.now()
-                self.metadata_cache.set_metadata(metadata)
-
-            self.operation_stats["total_downloads"] += 1
-            self.operation_stats["total_bytes_downloaded"] += local_path.stat().st_size
-
+        if self.record_completed_download(filename, local_path):
             logger.info(
                 "FileOpsManager",
                 "_execute_download",
@@ -496,6 +487,32 @@ class FileOperationsManager:
         else:
             raise ValueError(f"File validation failed for {filename}")
 
+    def record_completed_download(self, filename: str, local_path: Path) -> bool:
+        """
+        Validate a downloaded file and record it in the metadata cache, statistics and access history.
+
+        Also called for downloads made outside the operation queue, such as
+        progressive downloads for playback.
+
+        Returns:
+            False if the file failed validation
+        """
+        if not self._validate_downloaded_file(filename, local_path):
+            return False
+
+        # Update metadata cache
+        metadata = self.metadata_cache.get_metadata(filename)
+        if metadata:
+            metadata.local_path = str(local_path)
+            metadata.download_count += 1
+            metadata.last_accessed = datetime.now()
+            self.metadata_cache.set_metadata(metadata)
+
+        self.operation_stats["total_downloads"] += 1
+        self.operation_stats["total_bytes_downloaded"] += local_path.stat().st_size
+        record_file_access(str(local_path), "download")
+        return True
+
     def _execute_delete(self, operation: FileOperation):
         """Execute a file deletion operation."""
         filename = operation.filename
@@ -4,6 +4,7 @@ import subprocess
 import sys
 import threading
 import traceback
+from pathlib import Path
 from textwrap import dedent
 
 from audio_player_enhanced import EnhancedAudioPlayer
@@ -15,6 +16,7 @@ from device_actions_mixin import DeviceActionsMixin
 from device_interface import DeviceManager
 from file_actions_mixin import FileActionsMixin
 from file_operations_manager import FileOperationsManager
+from progressive_download import ProgressiveDownload
 from storage_management import StorageMonitor, StorageOptimizer
 from transcription_module import process_audio_file_for_insights
 from tree_view_mixin import TreeViewMixin
@@ -66,6 +68,7 @@ class HiDockCLI(DeviceActionsMixin, FileActionsMixin, TreeViewMixin):
             device_lock=self.device_lock,
         )
         self.audio_player = EnhancedAudioPlayer(self)
+        self._playback_download = None  # ProgressiveDownload of the recording being played, until it completes
 
         self.available_usb_devices = []
         self.displayed_files_details = []
@@ -945,9 +948,9 @@ class HiDockCLI(DeviceActionsMixin, FileActionsMixin, TreeViewMixin):
 
         logger.error("MainWindow", "_show_ffmpeg_error", message)
 
-    def _play_local_file(self, local_filepath):
+    def _play_local_file(self, local_filepath, download=None):
         """Loads and plays a local file, and updates the visualizer."""
-        self.audio_player.load_track(local_filepath)
+        self.audio_player.load_track(local_filepath, download)
 
         self.audio_player.play()
 
@@ -957,6 +960,73 @@ class HiDockCLI(DeviceActionsMixin, FileActionsMixin, TreeViewMixin):
         self._update_menu_states()
 
     def _download_for_playback_and_play(self, filename, local_filepath):
+        """
+        Downloads a single file and starts playback as soon as its beginning has arrived.
+
+        The rest of the file keeps downloading while it plays; seeking ahead of
+        the download fetches the sought position first. A playback download
+        still running for another recording is cancelled, as it holds the
+        device until it finishes.
+        """
+        self.update_status_bar(progress_text=f"Downloading '{filename}' for playback...")
+        self._cancel_playback_download()
+
+        metadata = self.file_operations_manager.metadata_cache.get_metadata(filename)
+        jensen_device = getattr(self.device_manager.device_interface, "jensen_device", None)
+        if not metadata or not metadata.size or jensen_device is None:
+            # Without the size the part file cannot be laid out; download it whole
+            self._download_then_play(filename, local_filepath)
+            return
+
+        download = ProgressiveDownload(
+            jensen_device, filename, metadata.size, local_filepath, device_lock=self.device_lock
+        )
+
+        last_percent = -1
+
+        def on_download_progress(downloaded, total):
+            nonlocal last_percent
+            percent = downloaded * 100 // total if total else 0
+            if percent != last_percent:
+                last_percent = percent
+                self.after(0, lambda: self.update_status_bar(progress_text=f"Download {filename}: {percent}%"))
+
+        def on_download_complete(completed):
+            if self._playback_download is completed:
+                self._playback_download = None
+            if completed.error:
+                logger.error("MainWindow", "Playback Error", f"Could not download file for playback: {completed.error}")
+                self.after(0, lambda: self.update_status_bar(progress_text=f"Download {filename} failed."))
+                return
+            # Called once the part file has been renamed, so the output path exists
+            if not self.file_operations_manager.record_completed_download(filename, Path(completed.output_path)):
+                logger.error("MainWindow", "Playback Error", f"Downloaded file failed validation: {filename}")
+                return
+            self.after(0, lambda: self.update_status_bar(progress_text=f"Download {filename} complete."))
+
+        def start_when_playable():
+            if download.wait_until_playable():
+                if not download.cancelled:
+                    self.after(0, self._play_local_file, download.part_path, download)
+            elif not download.cancelled:
+                logger.error("MainWindow", "Playback Error", f"Could not start playback: {download.error}")
+
+        download.on_progress = on_download_progress
+        download.on_complete = on_download_complete
+        self._playback_download = download
+        download.start()
+        threading.Thread(target=start_when_playable, daemon=True).start()
+
+    def _cancel_playback_download(self):
+        """Cancel the progressive download started for playback, if it is still running."""
+        download = self._playback_download
+        self._playback_download = None
+        if download is None:
+            return False
+        download.cancel()
+        return True
+
+    def _download_then_play(self, filename, local_filepath):
         """
         Downloads a single file and triggers playback upon successful completion.
         """
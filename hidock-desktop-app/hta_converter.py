@@ -12,17 +12,27 @@ IMPORTANT: Audio format varies by device model:
 
 This converter attempts multiple detection strategies to handle different formats.
 
+Converted files are kept in the result cache keyed by the content of the
+recording, so each recording is decoded once however many features (playback,
+transcription, preloading) ask for it, and same-named recordings from
+different devices never share a conversion.
+
 Requirements: 4.3
 """
 
 import os
 
 # import struct  # Future: for binary data parsing if needed
+import shutil
 import tempfile
+import threading
 import wave
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 
 from config_and_logger import logger
+from result_cache import ResultCache, get_result_cache
+
+CONVERSION_VERSION = 1  # Bump when the conversion output changes
 
 
 class HTAConverter:
@@ -30,10 +40,39 @@ class HTAConverter:
     Converts HiDock audio files (.hda/.hta) to WAV format.
 
     Handles MPEG Audio Layer 1/2 format files from HiDock devices.
+
+    Args:
+        cache: Result cache to use instead of the shared one under ~/.hidock/cache
+        use_cache: Whether converted files are cached
     """
 
-    def __init__(self):
+    def __init__(self, cache: Optional[ResultCache] = None, use_cache: bool = True):
         self.temp_dir = tempfile.gettempdir()
+        self.use_cache = use_cache
+        self._cache = cache
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._key_locks_lock = threading.Lock()
+
+    @property
+    def cache(self) -> ResultCache:
+        if self._cache is None:
+            self._cache = get_result_cache()
+        return self._cache
+
+    def conversion_key(self, hta_file_path: str) -> str:
+        """Cache key of a recording's conversion, derived from its content."""
+        return ResultCache.make_key("hta", CONVERSION_VERSION, self.cache.file_hash(hta_file_path))
+
+    def get_cached_conversion(self, hta_file_path: str) -> Optional[str]:
+        """Path of the cached WAV conversion of a recording, or None if it has not been converted."""
+        if not self.use_cache:
+            return None
+        try:
+            cached = self.cache.get_file(self.conversion_key(hta_file_path))
+            return cached[0] if cached else None
+        except Exception as e:
+            logger.warning("HTAConverter", "get_cached_conversion", f"Conversion cache unavailable: {e}")
+            return None
 
     def convert_hta_to_wav(self, hta_file_path: str, output_path: Optional[str] = None) -> Optional[str]:
         """
@@ -65,10 +104,21 @@ class HTAConverter:
                 )
                 return None
 
+            if self.use_cache:
+                cached = self._convert_cached(hta_file_path)
+                if cached:
+                    if output_path is None:
+                        return cached
+                    shutil.copyfile(cached, output_path)
+                    return output_path
+
             # Generate output path if not provided
             if output_path is None:
                 base_name = os.path.splitext(os.path.basename(hta_file_path))[0]
-                output_path = os.path.join(self.temp_dir, f"{base_name}_converted.wav")
+                handle, output_path = tempfile.mkstemp(
+                    suffix="_converted.wav", prefix=f"{base_name}_", dir=self.temp_dir
+                )
+                os.close(handle)
 
             logger.info(
                 "HTAConverter",
@@ -96,6 +146,54 @@ class HTAConverter:
             logger.error("HTAConverter", "convert_hta_to_wav", f"Error converting HTA file: {e}")
             return None
 
+    def _convert_cached(self, hta_file_path: str) -> Optional[str]:
+        """
+        Convert a recording into the cache, or return the conversion already there.
+
+        Concurrent requests for one recording wait for a single conversion.
+        The result cache moves the file into place atomically, so other
+        processes never see a partial conversion.
+
+        Returns:
+            Path of the cached WAV file, or None if the cache is unavailable
+        """
+        try:
+            key = self.conversion_key(hta_file_path)
+        except Exception as e:
+            logger.warning("HTAConverter", "_convert_cached", f"Conversion cache unavailable: {e}")
+            return None
+
+        with self._key_locks_lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            cached = self.cache.get_file(key)
+            if cached:
+                logger.debug("HTAConverter", "_convert_cached", f"Using cached conversion of {hta_file_path}")
+                return cached[0]
+
+            handle, temp_path = tempfile.mkstemp(suffix=".wav", prefix="hidock_hta_", dir=self.temp_dir)
+            os.close(handle)
+            try:
+                logger.info("HTAConverter", "convert_hta_to_wav", f"Converting {hta_file_path} into the cache")
+                audio_data, sample_rate, channels = self._parse_hta_file(hta_file_path)
+                if audio_data is None:
+                    return None
+                self._create_wav_file(temp_path, audio_data, sample_rate, channels)
+                try:
+                    path = self.cache.put_file(key, temp_path, {"source": os.path.basename(hta_file_path)})
+                except OSError as e:
+                    logger.warning("HTAConverter", "_convert_cached", f"Failed to cache conversion: {e}")
+                    path = None
+                if path is None:
+                    # Not cached (larger than the whole cache budget); hand out the converted file itself
+                    converted = self.get_converted_file_path(hta_file_path)
+                    os.replace(temp_path, converted)
+                    return converted
+                return path
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+
     def _parse_hta_file(self, hta_file_path: str) -> Tuple[Optional[bytes], int, int]:
         """
         Parse HTA file and extract audio data.
@@ -325,13 +423,26 @@ class HTAConverter:
             raise
 
     def get_converted_file_path(self, hta_file_path: str) -> str:
-        """Get the expected path for a converted file."""
+        """
+        Get the expected path for a converted file.
+
+        This is the cached conversion once there is one; otherwise a path in
+        the temp directory named after the recording's full path and version,
+        so same-named recordings from different devices do not collide.
+        """
+        cached = self.get_cached_conversion(hta_file_path)
+        if cached:
+            return cached
         base_name = os.path.splitext(os.path.basename(hta_file_path))[0]
-        return os.path.join(self.temp_dir, f"{base_name}_converted.wav")
+        stat = os.stat(hta_file_path)
+        content_id = ResultCache.make_key(os.path.abspath(hta_file_path), stat.st_mtime_ns, stat.st_size)[:12]
+        return os.path.join(self.temp_dir, f"{base_name}_{content_id}_converted.wav")
 
     def cleanup_converted_file(self, wav_file_path: str):
-        """Clean up a converted WAV file."""
+        """Clean up a converted WAV file; cached conversions are left for the cache to evict."""
         try:
+            if self.use_cache and self.cache.owns_file(wav_file_path):
+                return
             if os.path.exists(wav_file_path):
                 os.remove(wav_file_path)
                 logger.info(
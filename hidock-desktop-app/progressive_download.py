@@ -0,0 +1,356 @@
+"""
+Progressive Downloads for Playback in the HiDock Desktop Application.
+
+Downloads a recording into a part file that can be read while it grows, so
+playback can start as soon as the header and the first second have landed:
+- The file is streamed from the device in order, the fastest transfer mode
+- Reads wait for the bytes they need; a read far past what the stream has
+  delivered (a seek) stops the stream and fetches ranges with
+  get_file_block, starting at the read position, then fills in the rest
+- The part file is renamed to the output path once every byte is present,
+  and deleted if the download fails or is cancelled
+"""
+
+import bisect
+import io
+import os
+import threading
+import time
+from contextlib import nullcontext
+from typing import Callable, List, Optional
+
+from audio_probe import probe_audio
+from config_and_logger import logger
+
+PART_SUFFIX = ".part"
+RANGE_BLOCK_SIZE = 64 * 1024  # Bytes per get_file_block request once the stream has stopped
+RANGE_RETRIES = 3
+TAIL_BYTES = 8192  # Fetched first, as decoders look for trailing tags and chunks when opening
+HEADER_BYTES = 16384  # Enough to probe WAV and MPEG headers
+INITIAL_BUFFER_SECONDS = 1.0  # Audio that must have arrived before playback starts
+STREAM_CATCH_UP_BYTES = 1024 * 1024  # Reads this close ahead of the stream wait for it
+READ_TIMEOUT_S = 30.0
+
+
+class DownloadSink:
+    """Part file receiving data at any offset, with the byte ranges that have arrived"""
+
+    def __init__(self, path: str, file_length: int):
+        self.path = path
+        self.file_length = file_length
+        self.error: Optional[str] = None
+        self._file = open(path, "w+b", buffering=0)
+        self._file.truncate(file_length)
+        self._starts: List[int] = []  # Sorted, merged [start, end) ranges
+        self._ends: List[int] = []
+        self._condition = threading.Condition()
+
+    def write_at(self, offset: int, data: bytes):
+        with self._condition:
+            self._file.seek(offset)
+            self._file.write(data)
+            self._add_range(offset, min(offset + len(data), self.file_length))
+            self._condition.notify_all()
+
+    def _add_range(self, start: int, end: int):
+        index = bisect.bisect_left(self._ends, start)
+        while index < len(self._starts) and self._starts[index] <= end:
+            start = min(start, self._starts[index])
+            end = max(end, self._ends[index])
+            del self._starts[index], self._ends[index]
+        self._starts.insert(index, start)
+        self._ends.insert(index, end)
+
+    def available_end(self, offset: int) -> int:
+        """End of the downloaded run containing offset, or offset if it has not arrived."""
+        with self._condition:
+            index = bisect.bisect_right(self._starts, offset) - 1
+            if index >= 0 and self._ends[index] > offset:
+                return self._ends[index]
+            return offset
+
+    def next_missing(self, offset: int) -> Optional[int]:
+        """First offset at or after offset that has not arrived, wrapping to the start."""
+        with self._condition:
+            for position in (offset, 0):
+                index = bisect.bisect_right(self._starts, position) - 1
+                if index >= 0 and self._ends[index] > position:
+                    position = self._ends[index]
+                if position < self.file_length:
+                    return position
+            return None
+
+    @property
+    def complete(self) -> bool:
+        return self.available_end(0) >= self.file_length
+
+    @property
+    def downloaded_bytes(self) -> int:
+        with self._condition:
+            return sum(end - start for start, end in zip(self._starts, self._ends))
+
+    def wait_for(self, offset: int, length: int, timeout: float) -> bool:
+        """Wait until [offset, offset + length) has arrived; False on timeout or failure."""
+        end = min(offset + length, self.file_length)
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self.available_end(offset) < end:
+                remaining = deadline - time.monotonic()
+                if self.error is not None or remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return True
+
+    def fail(self, error: str):
+        with self._condition:
+            self.error = error
+            self._condition.notify_all()
+
+    def close(self):
+        self._file.close()
+
+
+class ProgressiveReader(io.RawIOBase):
+    """Seekable read-only view of a progressive download; reads wait for their bytes"""
+
+    def __init__(self, download: "ProgressiveDownload"):
+        super().__init__()
+        self._download = download
+        self._file = open(download.path, "rb")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._download.file_length
+        self._position = max(offset, 0)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        length = min(len(buffer), self._download.file_length - self._position)
+        if length <= 0:
+            return 0
+        if not self._download.wait_for(self._position, length):
+            raise OSError(f"Download of {self._download.filename} stalled at byte {self._position}")
+        self._file.seek(self._position)
+        count = self._file.readinto(memoryview(buffer)[:length])
+        self._position += count
+        return count
+
+    def close(self):
+        if not self.closed:
+            self._file.close()
+            self._download._reader_closed()
+        super().close()
+
+
+class ProgressiveDownload:
+    """
+    A device file downloaded to output_path that can be played while it arrives
+
+    Args:
+        device: HiDockJensen (stream_file and get_file_block)
+        filename: Name of the recording on the device
+        file_length: Size of the recording in bytes
+        output_path: Where the completed file is stored
+        device_lock: Lock held for the device while downloading
+    """
+
+    def __init__(self, device, filename: str, file_length: int, output_path: str, device_lock=None):
+        self.device = device
+        self.filename = filename
+        self.file_length = file_length
+        self.output_path = output_path
+        self.part_path = output_path + PART_SUFFIX
+        self.device_lock = device_lock
+        self.sink = DownloadSink(self.part_path, file_length)
+        self.on_complete: Optional[Callable[["ProgressiveDownload"], None]] = None
+        self.on_progress: Optional[Callable[[int, int], None]] = None
+
+        self._lock = threading.Lock()
+        self._cursor: Optional[int] = None  # Where ranged fetching continues; None while streaming
+        self._stream_stop = threading.Event()
+        self._cancelled = threading.Event()
+        self._readers = 0
+        self._finalized = False
+        self._finalize_pending = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def path(self) -> str:
+        """The completed file once it has been renamed, otherwise the part file."""
+        return self.output_path if self._finalized else self.part_path
+
+    @property
+    def namehint(self) -> str:
+        return os.path.splitext(self.output_path)[1].lstrip(".")
+
+    @property
+    def is_complete(self) -> bool:
+        return self.sink.complete
+
+    @property
+    def error(self) -> Optional[str]:
+        return self.sink.error
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=f"download-{self.filename}", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        self._cancelled.set()
+        self._stream_stop.set()
+
+    def open(self) -> ProgressiveReader:
+        with self._lock:
+            self._readers += 1
+        return ProgressiveReader(self)
+
+    def prioritize(self, offset: int):
+        """Fetch from offset next, unless the stream is about to deliver it anyway."""
+        with self._lock:
+            if self._cursor is None:
+                streamed = self.sink.available_end(0)
+                if offset <= streamed + STREAM_CATCH_UP_BYTES:
+                    return
+                logger.info(
+                    "ProgressiveDownload",
+                    "prioritize",
+                    f"Read at byte {offset} is past the stream ({streamed}); switching to ranged fetches",
+                )
+                self._stream_stop.set()
+            self._cursor = offset
+
+    def wait_for(self, offset: int, length: int, timeout: float = READ_TIMEOUT_S) -> bool:
+        """Wait for a byte range, fetching it next if the stream will not reach it soon."""
+        if self.sink.available_end(offset) >= min(offset + length, self.file_length):
+            return True
+        self.prioritize(offset)
+        return self.sink.wait_for(offset, length, timeout)
+
+    def wait_for_time(self, start_time: float, seconds: float, duration: float) -> bool:
+        """Wait for the bytes of a time range, assuming the constant bitrate HiDock records with."""
+        if duration <= 0:
+            return self.wait_for(0, self.file_length)
+        offset = int(self.file_length * min(start_time / duration, 1.0))
+        return self.wait_for(offset, int(self.file_length * seconds / duration) + HEADER_BYTES)
+
+    def wait_until_playable(self, timeout: float = READ_TIMEOUT_S) -> bool:
+        """Wait for the header and the first INITIAL_BUFFER_SECONDS of audio."""
+        if not self.wait_for(0, HEADER_BYTES, timeout):
+            return False
+        info = probe_audio(self.part_path)
+        byte_rate = info.bitrate / 8 if info and info.bitrate else 0
+        return self.wait_for(0, HEADER_BYTES + int(INITIAL_BUFFER_SECONDS * byte_rate), timeout)
+
+    def _run(self):
+        start = time.monotonic()
+        try:
+            with self.device_lock or nullcontext():
+                if self._cancelled.is_set():
+                    raise IOError("Download cancelled")
+                try:
+                    self._fetch_range(max(self.file_length - TAIL_BYTES, 0))
+                except IOError as e:
+                    logger.warning("ProgressiveDownload", "_run", f"Could not fetch the tail first: {e}")
+                if not self._stream_stop.is_set():
+                    status = self.device.stream_file(
+                        self.filename,
+                        self.file_length,
+                        self._receive_stream_chunk,
+                        progress_callback=self.on_progress,
+                        cancel_event=self._stream_stop,
+                    )
+                    if status not in ("OK", "cancelled"):
+                        raise IOError(f"Stream failed: {status}")
+                while not self.sink.complete:
+                    if self._cancelled.is_set():
+                        raise IOError("Download cancelled")
+                    with self._lock:
+                        offset = self.sink.next_missing(
+                            self.sink.available_end(0) if self._cursor is None else self._cursor
+                        )
+                        self._cursor = offset
+                    if offset is None:
+                        break
+                    self._fetch_range(offset)
+
+            logger.info(
+                "ProgressiveDownload",
+                "_run",
+                f"Downloaded {self.filename} ({self.file_length} bytes) in {time.monotonic() - start:.1f}s",
+            )
+        except Exception as e:
+            logger.error("ProgressiveDownload", "_run", f"Download of {self.filename} failed: {e}")
+            self.sink.fail(str(e))
+        self.sink.close()
+        self._finalize()
+
+    def _receive_stream_chunk(self, chunk: bytes):
+        # Chunks continue the run from byte 0; once it meets the prefetched tail the rest is present
+        offset = self.sink.available_end(0)
+        self.sink.write_at(offset, chunk[: max(self.file_length - offset, 0)])
+
+    def _fetch_range(self, offset: int):
+        """Fetch one block at offset, leaving any bytes already present in place."""
+        if self.sink.next_missing(offset) != offset:
+            return
+        length = min(RANGE_BLOCK_SIZE, self.file_length - offset)
+        for _ in range(RANGE_RETRIES):
+            data = self.device.get_file_block(self.filename, offset, length)
+            if data:
+                self.sink.write_at(offset, data[:length])
+                with self._lock:
+                    if self._cursor is not None and self._cursor == offset:
+                        self._cursor = offset + len(data[:length])
+                if self.on_progress:
+                    self.on_progress(self.sink.downloaded_bytes, self.file_length)
+                return
+        raise IOError(f"No data for {self.filename} at byte {offset}")
+
+    def _finalize(self):
+        """
+        Move the part file to the output path, or delete it if the download failed, then call on_complete
+
+        Retried when the last reader closes if the part file is still open,
+        so on_complete only sees the file at its final path.
+        """
+        with self._lock:
+            try:
+                if self.sink.error is None:
+                    os.replace(self.part_path, self.output_path)
+                    self._finalized = True
+                else:
+                    os.remove(self.part_path)
+                self._finalize_pending = False
+            except OSError as e:
+                # Windows does not rename or delete files that are open; done when the last reader closes
+                self._finalize_pending = self._readers > 0
+                if self._finalize_pending:
+                    return
+                logger.warning("ProgressiveDownload", "_finalize", f"Could not finalize {self.part_path}: {e}")
+                if self.sink.error is None:
+                    self.sink.fail(f"Could not rename {self.part_path}: {e}")
+        if self.on_complete:
+            self.on_complete(self)
+
+    def _reader_closed(self):
+        with self._lock:
+            self._readers -= 1
+            retry = self._finalize_pending and self._readers == 0
+        if retry:
+            self._finalize()
@@ -0,0 +1,292 @@
+"""
+Content-Addressed Result Cache for the HiDock Desktop Application.
+
+Stores the results of expensive, deterministic work on recordings (enhanced
+audio files, analysis dictionaries) under ~/.hidock/cache, keyed by a hash of
+the input content plus a canonical description of how it was processed:
+- Cache keys are built from content hashes, so renamed or re-downloaded copies
+  of a recording share entries
+- Content hashes are remembered per (path, inode, mtime, size)
+- Files enter the cache atomically (written aside, then renamed into place)
+- Least recently used entries are evicted once the cache exceeds its byte budget
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from config_and_logger import logger
+
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+
+def canonical_json(value: Any) -> str:
+    """
+    Serialize a settings object or value to a stable JSON string
+
+    Dataclasses become dicts, Enums their values, and keys are sorted, so
+    equal settings always produce the same string.
+    """
+
+    def convert(item):
+        if dataclasses.is_dataclass(item) and not isinstance(item, type):
+            return {field.name: convert(getattr(item, field.name)) for field in dataclasses.fields(item)}
+        if isinstance(item, Enum):
+            return convert(item.value)
+        if isinstance(item, dict):
+            return {str(key): convert(val) for key, val in item.items()}
+        if isinstance(item, (list, tuple)):
+            return [convert(val) for val in item]
+        return item
+
+    return json.dumps(convert(value), sort_keys=True, separators=(",", ":"))
+
+
+class ResultCache:
+    """Byte-bounded LRU cache of files and JSON values addressed by content-derived keys."""
+
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        base_dir = Path(cache_dir) if cache_dir else Path.home() / ".hidock" / "cache"
+        self.cache_dir = base_dir / "results"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / "results.db"
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._init_database()
+
+    def _init_database(self):
+        """Create the entry index and the content hash table."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    key TEXT PRIMARY KEY,
+                    file_name TEXT,
+                    value TEXT,
+                    size INTEGER,
+                    created REAL,
+                    last_access REAL
+                )
+            """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_entries_access ON cache_entries(last_access)")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS file_hashes (
+                    path TEXT PRIMARY KEY,
+                    inode INTEGER,
+                    mtime_ns INTEGER,
+                    file_size INTEGER,
+                    sha256 TEXT
+                )
+            """
+            )
+            conn.commit()
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Combine content hashes, settings and version tags into one cache key."""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update((part if isinstance(part, str) else canonical_json(part)).encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def file_hash(self, file_path: str) -> str:
+        """SHA-256 of a file's content, reusing the stored hash while the file is unchanged."""
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT sha256 FROM file_hashes WHERE path = ? AND inode = ? AND mtime_ns = ? AND file_size = ?",
+                (path, stat.st_ino, stat.st_mtime_ns, stat.st_size),
+            ).fetchone()
+        if row:
+            return row[0]
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.CHUNK_SIZE), b""):
+                digest.update(chunk)
+        content_hash = digest.hexdigest()
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO file_hashes (path, inode, mtime_ns, file_size, sha256) VALUES (?, ?, ?, ?, ?)",
+                (path, stat.st_ino, stat.st_mtime_ns, stat.st_size, content_hash),
+            )
+            conn.commit()
+        return content_hash
+
+    def get_file(self, key: str) -> Optional[Tuple[str, Dict]]:
+        """
+        Look up a cached file.
+
+        Returns:
+            Tuple of (path of the cached file, metadata stored with it), or
+            None if the key is not cached.
+        """
+        entry = self._get_entry(key)
+        if entry is None or entry[0] is None:
+            return None
+        file_name, value = entry
+        path = self.cache_dir / file_name
+        if not path.exists():
+            self.remove(key)
+            return None
+        return str(path), json.loads(value) if value else {}
+
+    def put_file(self, key: str, source_path: str, metadata: Optional[Dict] = None) -> Optional[str]:
+        """
+        Copy a file into the cache.
+
+        Returns:
+            Path of the cached copy, or None if the file is larger than the
+            whole cache budget.
+        """
+        size = os.path.getsize(source_path)
+        if size > self.max_bytes:
+            return None
+
+        suffix = Path(source_path).suffix
+        file_name = f"{key[:2]}/{key}{suffix}"
+        target = self.cache_dir / file_name
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+        # Copy next to the target and rename, so readers never see a partial file
+        handle, temp_path = tempfile.mkstemp(dir=target.parent, prefix=".partial_")
+        try:
+            with os.fdopen(handle, "wb") as temp_file, open(source_path, "rb") as source:
+                shutil.copyfileobj(source, temp_file, self.CHUNK_SIZE)
+            os.replace(temp_path, target)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        self._put_entry(key, file_name, json.dumps(metadata) if metadata is not None else None, size)
+        return str(target)
+
+    def get_value(self, key: str) -> Optional[Any]:
+        """Look up a cached JSON value."""
+        entry = self._get_entry(key)
+        if entry is None or entry[1] is None or entry[0] is not None:
+            return None
+        return json.loads(entry[1])
+
+    def put_value(self, key: str, value: Any):
+        """Store a JSON-serializable value."""
+        encoded = json.dumps(value)
+        self._put_entry(key, None, encoded, len(encoded.encode("utf-8")))
+
+    def remove(self, key: str):
+        """Drop an entry and its file."""
+        with self._lock, sqlite3.connect(self.db_path) as conn:
+            row = conn.execute("SELECT file_name FROM cache_entries WHERE key = ?", (key,)).fetchone()
+            conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            conn.commit()
+        if row and row[0]:
+            self._delete_file(row[0])
+
+    def owns_file(self, path: str) -> bool:
+        """Whether path is a file inside the cache, which only eviction may delete."""
+        return self.cache_dir.resolve() in Path(path).resolve().parents
+
+    def total_bytes(self) -> int:
+        """Bytes used by all entries."""
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock, sqlite3.connect(self.db_path) as conn:
+            file_names = [row[0] for row in conn.execute("SELECT file_name FROM cache_entries") if row[0]]
+            conn.execute("DELETE FROM cache_entries")
+            conn.commit()
+        for file_name in file_names:
+            self._delete_file(file_name)
+
+    def _get_entry(self, key: str) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute("SELECT file_name, value FROM cache_entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE cache_entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            conn.commit()
+        return row
+
+    def _put_entry(self, key: str, file_name: Optional[str], value: Optional[str], size: int):
+        now = time.time()
+        with self._lock, sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                INSERT INTO cache_entries (key, file_name, value, size, created, last_access)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    file_name = excluded.file_name,
+                    value = excluded.value,
+                    size = excluded.size,
+                    last_access = excluded.last_access
+            """,
+                (key, file_name, value, size, now, now),
+            )
+            evicted = self._evict(conn, keep_key=key)
+            conn.commit()
+        for evicted_file in evicted:
+            self._delete_file(evicted_file)
+
+    def _evict(self, conn: sqlite3.Connection, keep_key: str) -> list:
+        """Delete least recently used entries until the cache fits its budget; returns their file names."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return []
+
+        evicted_keys = []
+        evicted_files = []
+        for key, file_name, size in conn.execute(
+            "SELECT key, file_name, size FROM cache_entries WHERE key != ? ORDER BY last_access", (keep_key,)
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            evicted_keys.append((key,))
+            if file_name:
+                evicted_files.append(file_name)
+            total -= size
+
+        conn.executemany("DELETE FROM cache_entries WHERE key = ?", evicted_keys)
+        logger.info(
+            "ResultCache", "_evict", f"Evicted {len(evicted_keys)} entries to stay under {self.max_bytes} bytes"
+        )
+        return evicted_files
+
+    def _delete_file(self, file_name: str):
+        try:
+            (self.cache_dir / file_name).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning("ResultCache", "_delete_file", f"Failed to remove {file_name}: {e}")
+
+
+_default_cache: Optional[ResultCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """Shared cache under ~/.hidock/cache, created on first use."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResultCache()
+        return _default_cache
@@ -0,0 +1,235 @@
+"""
+Playback Speed Renditions for the HiDock Desktop Application.
+
+pygame plays files at their own rate, so other speeds are played from
+renditions resampled so that rate * speed becomes the 44.1 kHz mixer rate
+(speed and pitch change together, like a tape):
+- Complete renditions are kept in the result cache keyed by (file, speed),
+  so returning to a speed used before is instant; one is rendered in the
+  background at a time, and choosing another speed abandons it
+- Until a rendition is cached, SpeedSegmentStream renders short consecutive
+  segments from the playback position with one continuous resampler, so
+  playback at a new speed starts after rendering a few seconds of audio
+  and the segments join without clicks
+"""
+
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional, Tuple
+
+import numpy as np
+
+try:
+    import soundfile as sf
+except ImportError:
+    sf = None
+
+from audio_loader import PCM16BlockWriter, load_audio, open_audio_stream
+from audio_resampler import PolyphaseResampler
+from config_and_logger import logger
+from result_cache import ResultCache, get_result_cache
+
+RENDITION_VERSION = 1
+PLAYBACK_RATE = 44100  # Rate the pygame mixer is initialized with
+SEGMENT_SECONDS = 8.0  # Source seconds per streamed segment
+READ_BLOCK_SIZE = 65536
+
+# Raised for files without a block reader, which are decoded whole instead
+_NO_BLOCK_READER_ERRORS = (ValueError,) if sf is None else (ValueError, sf.SoundFileError)
+
+
+def _open_blocks(
+    file_path: str, block_size: int, start_time: float
+) -> Tuple[int, int, Callable[[], Iterator[np.ndarray]]]:
+    """Block reader for any decodable file; formats without one are decoded whole."""
+    try:
+        sample_rate, _, channels, read_blocks = open_audio_stream(file_path, block_size, False, start_time)
+        return sample_rate, channels, read_blocks
+    except _NO_BLOCK_READER_ERRORS:
+        data, sample_rate = load_audio(file_path, mono=False)
+        data = data[int(start_time * sample_rate) :]
+
+        def read_blocks():
+            for start in range(0, len(data), block_size):
+                yield data[start : start + block_size]
+
+        return sample_rate, 1 if data.ndim == 1 else data.shape[1], read_blocks
+
+
+class SpeedRenditionCache:
+    """Complete speed renditions in the result cache, rendered one at a time on a background thread"""
+
+    def __init__(self, cache: Optional[ResultCache] = None):
+        self._cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speed-rendition")
+        self._lock = threading.Lock()
+        self._target: Optional[Tuple[str, float]] = None
+        self._future: Optional[Future] = None
+        self._cancelled: Optional[threading.Event] = None
+
+    @property
+    def cache(self) -> ResultCache:
+        if self._cache is None:
+            self._cache = get_result_cache()
+        return self._cache
+
+    @staticmethod
+    def make_key(file_path: str, speed: float) -> str:
+        stat = os.stat(file_path)
+        return ResultCache.make_key(
+            "speed", RENDITION_VERSION, os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size, round(speed, 3)
+        )
+
+    def get(self, file_path: str, speed: float) -> Optional[str]:
+        """Path of the cached rendition, or None if it has not been rendered."""
+        cached = self.cache.get_file(self.make_key(file_path, speed))
+        return cached[0] if cached else None
+
+    def render(self, file_path: str, speed: float, cancelled: Optional[threading.Event] = None) -> Optional[str]:
+        """Render a complete rendition into the cache and return its path, or None if cancelled is set."""
+        cached = self.get(file_path, speed)
+        if cached:
+            return cached
+
+        handle, temp_path = tempfile.mkstemp(suffix=".wav", prefix="hidock_speed_")
+        os.close(handle)
+        try:
+            sample_rate, channels, read_blocks = _open_blocks(file_path, READ_BLOCK_SIZE, 0.0)
+            resampler = PolyphaseResampler(sample_rate * speed, PLAYBACK_RATE)
+            with PCM16BlockWriter(temp_path, PLAYBACK_RATE, channels) as writer:
+                for block in read_blocks():
+                    if cancelled is not None and cancelled.is_set():
+                        logger.info(
+                            "SpeedRenditionCache", "render", f"Abandoned {os.path.basename(file_path)} at {speed}x"
+                        )
+                        return None
+                    writer.write(resampler.process(block))
+                tail = resampler.flush()
+                if len(tail):
+                    writer.write(tail)
+
+            path = self.cache.put_file(self.make_key(file_path, speed), temp_path, {"speed": speed})
+            logger.info("SpeedRenditionCache", "render", f"Rendered {os.path.basename(file_path)} at {speed}x")
+            return path
+        finally:
+            os.remove(temp_path)
+
+    def render_async(self, file_path: str, speed: float) -> Future:
+        """
+        Render in the background, replacing any other pending render
+
+        Requests for the rendition already being rendered share its future.
+        A replaced render is dropped if it has not started, or stops at its
+        next block and resolves to None.
+        """
+        target = (os.path.abspath(file_path), round(speed, 3))
+        with self._lock:
+            if self._target == target and self._future is not None and not self._future.done():
+                return self._future
+            self._cancel_pending()
+            self._target = target
+            self._cancelled = threading.Event()
+            self._future = self._executor.submit(self.render, file_path, speed, self._cancelled)
+            return self._future
+
+    def cancel(self):
+        """Abandon the pending background render, if any."""
+        with self._lock:
+            self._cancel_pending()
+
+    def _cancel_pending(self):
+        if self._future is not None:
+            self._future.cancel()
+            self._cancelled.set()
+        self._target = None
+        self._future = None
+        self._cancelled = None
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+@dataclass
+class RenditionSegment:
+    """One rendered segment and the source time range it covers"""
+
+    path: str
+    source_start: float
+    source_end: float
+
+
+class SpeedSegmentStream:
+    """
+    Consecutive segment files of a speed rendition starting at a source position
+
+    One resampler runs across all segments, so consecutive segments played
+    back to back are sample-exact continuations of each other.
+    """
+
+    SLOTS = 3  # Segment files in rotation: playing, queued, being rendered
+
+    def __init__(self, file_path: str, speed: float, start_time: float = 0.0, segment_seconds: float = SEGMENT_SECONDS):
+        self.speed = speed
+        self.start_time = start_time
+        sample_rate, self.channels, read_blocks = _open_blocks(file_path, READ_BLOCK_SIZE, start_time)
+        self._blocks = read_blocks()
+        self._segment_frames = int(segment_seconds * sample_rate)
+        self._resampler = PolyphaseResampler(sample_rate * speed, PLAYBACK_RATE)
+        self._output_frames = 0
+        self._index = 0
+        self._finished = False
+        self._pending = np.zeros((0,) + (() if self.channels == 1 else (self.channels,)), dtype=np.float32)
+        self._temp_dir = tempfile.mkdtemp(prefix="hidock_segments_")
+
+    def next_segment(self) -> Optional[RenditionSegment]:
+        """Render the next segment, or return None once the source is exhausted."""
+        if self._finished:
+            return None
+
+        # Gather one segment of source samples
+        pieces = [self._pending]
+        gathered = len(self._pending)
+        for block in self._blocks:
+            pieces.append(block)
+            gathered += len(block)
+            if gathered >= self._segment_frames:
+                break
+        source = np.concatenate(pieces)
+        self._pending = source[self._segment_frames :]
+        source = source[: self._segment_frames]
+
+        output = self._resampler.process(source)
+        if len(source) < self._segment_frames:
+            output = np.concatenate([output, self._resampler.flush()])
+            self._finished = True
+        if not len(output):
+            return None
+
+        path = os.path.join(self._temp_dir, f"segment{self._index % self.SLOTS}.wav")
+        with PCM16BlockWriter(path, PLAYBACK_RATE, self.channels) as writer:
+            writer.write(output)
+        self._index += 1
+
+        source_start = self.start_time + self._output_frames * self.speed / PLAYBACK_RATE
+        self._output_frames += len(output)
+        source_end = self.start_time + self._output_frames * self.speed / PLAYBACK_RATE
+        return RenditionSegment(path, source_start, source_end)
+
+    def close(self):
+        """Remove the segment files."""
+        self._finished = True
+        for index in range(self.SLOTS):
+            path = os.path.join(self._temp_dir, f"segment{index}.wav")
+            if os.path.exists(path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass  # Still open in the mixer; removed with the directory later
+        try:
+            os.rmdir(self._temp_dir)
+        except OSError:
+            pass
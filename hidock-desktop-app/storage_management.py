@@ -10,20 +10,39 @@ This module provides comprehensive storage management capabilities including:
 Requirements addressed: 2.1, 2.4, 9.4, 9.5
 """
 
-# import json  # Future: for storage statistics export
-# import os  # Future: for advanced path operations
+import ctypes
+import ctypes.util
+import hashlib
+import json
+import os
+import select
 import shutil
 import sqlite3
+import struct
+import sys
 import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from config_and_logger import logger
 
+# Linux inotify through libc, used for event-driven storage monitoring
+try:
+    if not sys.platform.startswith("linux"):
+        raise OSError("inotify is only available on Linux")
+    _libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    _libc.inotify_init1.argtypes = [ctypes.c_int]
+    _libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    INOTIFY_AVAILABLE = True
+except (OSError, AttributeError):
+    _libc = None
+    INOTIFY_AVAILABLE = False
+
 
 class StorageWarningLevel(Enum):
     """Storage warning levels based on usage percentage."""
@@ -97,16 +116,560 @@ class StorageAnalytics:
     duplicate_files: List[Tuple[str, List[str]]]
 
 
-class StorageMonitor:
-    """Real-time storage monitoring with visual indicators."""
+class StorageUsageHistory:
+    """
+    Storage usage time series and per-file access tracking.
+
+    Usage samples are kept raw for a short time and folded on insert into
+    hourly, daily and weekly rollups, so growth queries read a handful of
+    rows no matter how long the history is. File accesses (playback,
+    transcription, download) are logged as events and summarised in the
+    file_tracking table.
+    """
+
+    ROLLUP_RESOLUTIONS = {"hourly": 3600, "daily": 86400, "weekly": 7 * 86400}
+    RAW_RETENTION_SECONDS = 2 * 86400
+    ROLLUP_RETENTION_SECONDS = {"hourly": 31 * 86400, "daily": 730 * 86400, "weekly": None}
+    ACCESS_EVENT_RETENTION_SECONDS = 365 * 86400
+    PRUNE_INTERVAL_SECONDS = 3600
+
+    FREQUENT_ACCESS_COUNT = 5
+    RECENT_ACCESS_DAYS = 30
+    COLD_FILE_DAYS = 90
+    ACCESS_PATTERN_LIMIT = 100
+
+    def __init__(self, db_path: Path, min_sample_interval: float = 60.0):
+        self.db_path = Path(db_path)
+        self.min_sample_interval = min_sample_interval
+        self._last_sample_times: Dict[Tuple[str, str], float] = {}
+        self._last_prune = 0.0
+        self._lock = threading.Lock()
+        self._init_tables()
+
+    def _init_tables(self):
+        """Create the usage history and access tracking tables."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS file_tracking (
+                    file_path TEXT PRIMARY KEY,
+                    file_size INTEGER,
+                    file_hash TEXT,
+                    last_accessed TEXT,
+                    last_modified TEXT,
+                    access_count INTEGER DEFAULT 0,
+                    created_date TEXT
+                )
+            """
+            )
+
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS file_access_events (
+                    file_path TEXT,
+                    access_type TEXT,
+                    timestamp REAL
+                )
+            """
+            )
+
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS usage_samples (
+                    metric TEXT,
+                    path TEXT,
+                    timestamp REAL,
+                    used_space INTEGER,
+                    total_space INTEGER
+                )
+            """
+            )
+
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS usage_rollups (
+                    metric TEXT,
+                    path TEXT,
+                    resolution TEXT,
+                    bucket_start INTEGER,
+                    sample_count INTEGER,
+                    sum_timestamp REAL,
+                    sum_used REAL,
+                    min_used INTEGER,
+                    max_used INTEGER,
+                    last_used INTEGER,
+                    last_total INTEGER,
+                    PRIMARY KEY (metric, path, resolution, bucket_start)
+                )
+            """
+            )
+
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_usage_samples ON usage_samples (metric, path, timestamp)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_access_events_time ON file_access_events (timestamp)")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_access_events_path ON file_access_events (file_path, timestamp)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_file_tracking_accessed ON file_tracking (last_accessed)")
+            conn.commit()
+
+    def record_sample(
+        self,
+        metric: str,
+        path: str,
+        used_space: int,
+        total_space: Optional[int] = None,
+        timestamp: Optional[float] = None,
+    ) -> bool:
+        """
+        Record a usage sample and fold it into the rollups.
+
+        Samples for the same (metric, path) closer together than
+        min_sample_interval are dropped.
+
+        Args:
+            metric: Series name, e.g. "disk_used" or "tree_size".
+            path: Path the sample describes.
+            used_space: Bytes used.
+            total_space: Capacity in bytes, if known.
+            timestamp: Sample time (defaults to now).
+
+        Returns:
+            True if the sample was stored.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        key = (metric, path)
+        with self._lock:
+            last = self._last_sample_times.get(key)
+            if last is not None and 0 <= timestamp - last < self.min_sample_interval:
+                return False
+            self._last_sample_times[key] = timestamp
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "INSERT INTO usage_samples (metric, path, timestamp, used_space, total_space) VALUES (?, ?, ?, ?, ?)",
+                (metric, path, timestamp, used_space, total_space),
+            )
+            conn.executemany(
+                """
+                INSERT INTO usage_rollups
+                (metric, path, resolution, bucket_start, sample_count, sum_timestamp, sum_used,
+                 min_used, max_used, last_used, last_total)
+                VALUES (?, ?, ?, ?, 1, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (metric, path, resolution, bucket_start) DO UPDATE SET
+                    sample_count = sample_count + 1,
+                    sum_timestamp = sum_timestamp + excluded.sum_timestamp,
+                    sum_used = sum_used + excluded.sum_used,
+                    min_used = MIN(min_used, excluded.min_used),
+                    max_used = MAX(max_used, excluded.max_used),
+                    last_used = excluded.last_used,
+                    last_total = excluded.last_total
+            """,
+                [
+                    (
+                        metric,
+                        path,
+                        resolution,
+                        int(timestamp // seconds) * seconds,
+                        timestamp,
+                        used_space,
+                        used_space,
+                        used_space,
+                        used_space,
+                        total_space,
+                    )
+                    for resolution, seconds in self.ROLLUP_RESOLUTIONS.items()
+                ],
+            )
+
+            if timestamp - self._last_prune > self.PRUNE_INTERVAL_SECONDS:
+                self._prune(conn, timestamp)
+                self._last_prune = timestamp
+            conn.commit()
+
+        return True
+
+    def _prune(self, conn: sqlite3.Connection, now: float):
+        """Drop raw samples, rollups and access events past their retention."""
+        conn.execute("DELETE FROM usage_samples WHERE timestamp < ?", (now - self.RAW_RETENTION_SECONDS,))
+        for resolution, retention in self.ROLLUP_RETENTION_SECONDS.items():
+            if retention is not None:
+                conn.execute(
+                    "DELETE FROM usage_rollups WHERE resolution = ? AND bucket_start < ?",
+                    (resolution, now - retention),
+                )
+        conn.execute("DELETE FROM file_access_events WHERE timestamp < ?", (now - self.ACCESS_EVENT_RETENTION_SECONDS,))
+
+    def get_series(self, metric: str, path: str, window_seconds: float) -> List[Tuple[float, float]]:
+        """
+        Return (timestamp, used bytes) points covering the last window_seconds.
+
+        Uses the coarsest rollup that still gives a useful number of points,
+        falling back to raw samples for short or freshly started histories.
+        """
+        since = time.time() - window_seconds
+        if window_seconds <= 2 * 86400:
+            resolution = "hourly"
+        elif window_seconds <= 90 * 86400:
+            resolution = "daily"
+        else:
+            resolution = "weekly"
+
+        bucket_seconds = self.ROLLUP_RESOLUTIONS[resolution]
+        first_bucket = int(since // bucket_seconds) * bucket_seconds
+
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(
+                """
+                SELECT sum_timestamp / sample_count, sum_used / sample_count FROM usage_rollups
+                WHERE metric = ? AND path = ? AND resolution = ? AND bucket_start >= ?
+                ORDER BY bucket_start
+            """,
+                (metric, path, resolution, first_bucket),
+            )
+            points = cursor.fetchall()
+
+            if len(points) < 3:
+                cursor = conn.execute(
+                    """
+                    SELECT timestamp, used_space FROM usage_samples
+                    WHERE metric = ? AND path = ? AND timestamp >= ?
+                    ORDER BY timestamp
+                """,
+                    (metric, path, since),
+                )
+                raw_points = cursor.fetchall()
+                if len(raw_points) > len(points):
+                    points = raw_points
+
+        return points
+
+    def get_growth_rate(self, metric: str, path: str, window_seconds: float) -> Optional[float]:
+        """Least-squares growth rate in bytes per second over the window, or None without enough data."""
+        points = self.get_series(metric, path, window_seconds)
+        if len(points) < 2:
+            return None
+
+        count = len(points)
+        mean_t = sum(t for t, _ in points) / count
+        mean_v = sum(v for _, v in points) / count
+        variance = sum((t - mean_t) ** 2 for t, _ in points)
+        if variance <= 0:
+            return None
+        return sum((t - mean_t) * (v - mean_v) for t, v in points) / variance
+
+    def get_growth_trend(self, metric: str, paths: List[str]) -> Dict[str, float]:
+        """Projected growth in bytes per day, week and month, summed over paths."""
+        windows = {"daily": 86400, "weekly": 7 * 86400, "monthly": 30 * 86400}
+        trend = {}
+        for name, seconds in windows.items():
+            rates = [self.get_growth_rate(metric, path, seconds) for path in paths]
+            trend[name] = sum(rate for rate in rates if rate is not None) * seconds
+        return trend
+
+    def project_time_to_full(self, path: str, metric: str = "disk_used") -> Optional[float]:
+        """
+        Estimate days until the volume holding path is full at the current growth rate.
+
+        Returns None if usage is flat or shrinking, or if there is not enough history.
+        """
+        rate = self.get_growth_rate(metric, path, 30 * 86400)
+        if rate is None or rate <= 0:
+            return None
+
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                """
+                SELECT used_space, total_space FROM usage_samples
+                WHERE metric = ? AND path = ? AND total_space IS NOT NULL
+                ORDER BY timestamp DESC LIMIT 1
+            """,
+                (metric, path),
+            ).fetchone()
+        if not row:
+            return None
+
+        used_space, total_space = row
+        return max(0, total_space - used_space) / rate / 86400
+
+    def record_access(self, file_path: str, access_type: str, timestamp: Optional[float] = None):
+        """Record that a file was played, transcribed, downloaded, etc."""
+        timestamp = time.time() if timestamp is None else timestamp
+        file_path = os.path.abspath(file_path)
+        accessed = datetime.fromtimestamp(timestamp).isoformat()
+        try:
+            file_size = os.path.getsize(file_path)
+        except OSError:
+            file_size = None
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "INSERT INTO file_access_events (file_path, access_type, timestamp) VALUES (?, ?, ?)",
+                (file_path, access_type, timestamp),
+            )
+            conn.execute(
+                """
+                INSERT INTO file_tracking (file_path, file_size, last_accessed, access_count, created_date)
+                VALUES (?, ?, ?, 1, ?)
+                ON CONFLICT (file_path) DO UPDATE SET
+                    file_size = COALESCE(excluded.file_size, file_size),
+                    last_accessed = excluded.last_accessed,
+                    access_count = access_count + 1
+            """,
+                (file_path, file_size, accessed, accessed),
+            )
+            conn.commit()
+
+    def get_access_patterns(self, base_paths: List[str]) -> Dict[str, Any]:
+        """
+        Classify indexed files under base_paths by how they are accessed.
+
+        Each list is capped at ACCESS_PATTERN_LIMIT entries. Cold files are
+        neither accessed nor modified in COLD_FILE_DAYS, coldest first.
+        """
+        patterns = {
+            "frequently_accessed": [],
+            "rarely_accessed": [],
+            "never_accessed": [],
+            "cold_files": [],
+            "cold_files_size": 0,
+        }
+        if not base_paths:
+            return patterns
+
+        placeholders = ",".join("?" for _ in base_paths)
+        recent = (datetime.now() - timedelta(days=self.RECENT_ACCESS_DAYS)).isoformat()
+        limit = self.ACCESS_PATTERN_LIMIT
 
-    def __init__(self, paths_to_monitor: List[str], update_interval: float = 30.0):
+        with sqlite3.connect(self.db_path) as conn:
+            patterns["frequently_accessed"] = [
+                row[0]
+                for row in conn.execute(
+                    f"""
+                    SELECT s.file_path FROM scan_index s JOIN file_tracking t ON t.file_path = s.file_path
+                    WHERE s.base_path IN ({placeholders}) AND t.access_count >= ? AND t.last_accessed >= ?
+                    ORDER BY t.access_count DESC LIMIT ?
+                """,
+                    base_paths + [self.FREQUENT_ACCESS_COUNT, recent, limit],
+                )
+            ]
+            patterns["rarely_accessed"] = [
+                row[0]
+                for row in conn.execute(
+                    f"""
+                    SELECT s.file_path FROM scan_index s JOIN file_tracking t ON t.file_path = s.file_path
+                    WHERE s.base_path IN ({placeholders}) AND t.access_count > 0
+                    AND NOT (t.access_count >= ? AND t.last_accessed >= ?)
+                    ORDER BY t.last_accessed LIMIT ?
+                """,
+                    base_paths + [self.FREQUENT_ACCESS_COUNT, recent, limit],
+                )
+            ]
+            patterns["never_accessed"] = [
+                row[0]
+                for row in conn.execute(
+                    f"""
+                    SELECT s.file_path FROM scan_index s LEFT JOIN file_tracking t ON t.file_path = s.file_path
+                    WHERE s.base_path IN ({placeholders}) AND (t.file_path IS NULL OR t.access_count = 0)
+                    ORDER BY s.mtime LIMIT ?
+                """,
+                    base_paths + [limit],
+                )
+            ]
+
+        cold_files = self.get_cold_files(base_paths, min_idle_days=self.COLD_FILE_DAYS, limit=limit)
+        patterns["cold_files"] = [path for path, _, _ in cold_files]
+        patterns["cold_files_size"] = sum(size for _, size, _ in cold_files)
+        return patterns
+
+    def get_cold_files(
+        self, base_paths: List[str], min_idle_days: float = 0, limit: Optional[int] = None
+    ) -> List[Tuple[str, int, float]]:
+        """
+        Return indexed files ordered from least to most recently used.
+
+        A file's last use is its last recorded access, or its mtime if it was
+        never accessed.
+
+        Returns:
+            List of (path, size, last use timestamp) tuples idle for at least min_idle_days.
+        """
+        if not base_paths:
+            return []
+
+        placeholders = ",".join("?" for _ in base_paths)
+        cutoff = time.time() - min_idle_days * 86400
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                f"""
+                SELECT s.file_path, s.file_size, MAX(s.mtime, COALESCE(e.last_access, 0)) AS last_use
+                FROM scan_index s
+                LEFT JOIN (
+                    SELECT file_path, MAX(timestamp) AS last_access FROM file_access_events GROUP BY file_path
+                ) e ON e.file_path = s.file_path
+                WHERE s.base_path IN ({placeholders}) AND last_use < ?
+                ORDER BY last_use
+                {'LIMIT ?' if limit else ''}
+            """,
+                base_paths + [cutoff] + ([limit] if limit else []),
+            ).fetchall()
+
+        return rows
+
+
+_usage_histories: Dict[str, StorageUsageHistory] = {}
+_usage_histories_lock = threading.Lock()
+_storage_cache_dir: Optional[Path] = None
+
+
+def set_storage_cache_dir(cache_dir: Optional[str]):
+    """
+    Set the directory holding storage_optimization.db for callers that do not pass one.
+
+    The application sets this once from its configured cache directory, so
+    access history from playback, transcription and downloads all lands in
+    the database the StorageOptimizer reads.
+    """
+    global _storage_cache_dir
+    _storage_cache_dir = Path(cache_dir) if cache_dir else None
+
+
+def get_storage_cache_dir() -> Path:
+    """The configured storage cache directory, ~/.hidock/cache by default."""
+    return _storage_cache_dir or Path.home() / ".hidock" / "cache"
+
+
+def record_file_access(file_path: str, access_type: str, cache_dir: Optional[str] = None):
+    """
+    Record a file access (e.g. "playback", "transcription", "download") in the storage usage history.
+
+    Failures are logged and swallowed so callers never break because of tracking.
+    """
+    try:
+        cache_path = Path(cache_dir) if cache_dir else get_storage_cache_dir()
+        db_path = cache_path / "storage_optimization.db"
+        with _usage_histories_lock:
+            history = _usage_histories.get(str(db_path))
+            if history is None:
+                cache_path.mkdir(parents=True, exist_ok=True)
+                history = StorageUsageHistory(db_path)
+                _usage_histories[str(db_path)] = history
+        history.record_access(file_path, access_type)
+    except Exception as e:
+        logger.warning("StorageManagement", "record_file_access", f"Failed to record access to {file_path}: {e}")
+
+
+class InotifyWatcher:
+    """Minimal non-recursive inotify wrapper over libc."""
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_NONBLOCK = os.O_NONBLOCK
+    IN_CLOEXEC = 0o2000000
+
+    # Changes to directory contents, plus completed writes so finished downloads are noticed
+    STORAGE_EVENTS = (
+        IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_CLOSE_WRITE | IN_DELETE_SELF | IN_MOVE_SELF
+    )
+
+    # SQLite side files; databases kept next to recordings would otherwise wake the monitor on every write
+    IGNORED_SUFFIXES = ("-journal", "-wal", "-shm")
+
+    _EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self):
+        if not INOTIFY_AVAILABLE:
+            raise OSError("inotify is not available on this platform")
+
+        self.fd = _libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches: Dict[int, str] = {}
+
+    def add_watch(self, path: str, mask: int = STORAGE_EVENTS) -> int:
+        """Watch a directory, returning the watch descriptor."""
+        wd = _libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_add_watch failed: {os.strerror(errno)}", path)
+        self.watches[wd] = path
+        return wd
+
+    def read_events(self) -> List[Tuple[str, int, str]]:
+        """Drain pending events as (watched path, mask, name) tuples."""
+        events = []
+        while True:
+            try:
+                buffer = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not buffer:
+                break
+
+            offset = 0
+            while offset + self._EVENT_HEADER.size <= len(buffer):
+                wd, mask, _cookie, name_length = self._EVENT_HEADER.unpack_from(buffer, offset)
+                offset += self._EVENT_HEADER.size
+                name = buffer[offset : offset + name_length].rstrip(b"\0").decode(errors="replace")
+                offset += name_length
+
+                if mask & self.IN_IGNORED:
+                    self.watches.pop(wd, None)
+                elif name.endswith(self.IGNORED_SUFFIXES):
+                    continue
+                events.append((self.watches.get(wd, ""), mask, name))
+
+        return events
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def close(self):
+        """Close the inotify descriptor, dropping all watches."""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+        self.watches.clear()
+
+
+class StorageMonitor:
+    """
+    Real-time storage monitoring with visual indicators.
+
+    On Linux the monitored directories are watched with inotify and usage is
+    only recomputed after files are created, deleted, moved or finish being
+    written, debounced so a burst of events causes a single refresh. Elsewhere,
+    or if no directory can be watched, the monitor polls every update_interval.
+    """
+
+    def __init__(
+        self,
+        paths_to_monitor: List[str],
+        update_interval: float = 30.0,
+        use_inotify: bool = True,
+        debounce_interval: float = 0.5,
+        max_debounce_delay: float = 2.0,
+        usage_history: Optional[StorageUsageHistory] = None,
+    ):
         self.paths_to_monitor = [Path(p) for p in paths_to_monitor]
+        self.usage_history = usage_history
         self.update_interval = update_interval
+        self.use_inotify = use_inotify
+        self.debounce_interval = debounce_interval
+        self.max_debounce_delay = max_debounce_delay
+        self.event_driven = False
         self.storage_info: Dict[str, StorageInfo] = {}
         self.callbacks: List[callable] = []
         self.monitoring_thread: Optional[threading.Thread] = None
         self.stop_event = threading.Event()
+        self._wake_pipe: Optional[Tuple[int, int]] = None
 
         # Initialize monitoring
         self._update_storage_info()
@@ -127,45 +690,129 @@ class StorageMonitor:
             return
 
         self.stop_event.clear()
-        self.monitoring_thread = threading.Thread(target=self._monitoring_loop, daemon=True)
+
+        watcher = self._create_watcher() if self.use_inotify else None
+        self.event_driven = watcher is not None
+        if watcher:
+            self._wake_pipe = os.pipe()
+            self.monitoring_thread = threading.Thread(target=self._event_loop, args=(watcher,), daemon=True)
+        else:
+            self.monitoring_thread = threading.Thread(target=self._monitoring_loop, daemon=True)
         self.monitoring_thread.start()
-        logger.info("StorageMonitor", "start_monitoring", "Storage monitoring started")
+        logger.info(
+            "StorageMonitor",
+            "start_monitoring",
+            f"Storage monitoring started ({'inotify' if self.event_driven else 'polling'})",
+        )
 
     def stop_monitoring(self):
         """Stop the monitoring thread."""
         self.stop_event.set()
+        if self._wake_pipe:
+            os.write(self._wake_pipe[1], b"\0")
         if self.monitoring_thread:
             self.monitoring_thread.join(timeout=5.0)
+        if self._wake_pipe:
+            for fd in self._wake_pipe:
+                os.close(fd)
+            self._wake_pipe = None
         logger.info("StorageMonitor", "stop_monitoring", "Storage monitoring stopped")
 
+    def _create_watcher(self) -> Optional[InotifyWatcher]:
+        """Set up inotify watches on the monitored directories, or return None to fall back to polling."""
+        if not INOTIFY_AVAILABLE:
+            return None
+
+        try:
+            watcher = InotifyWatcher()
+        except OSError as e:
+            logger.warning("StorageMonitor", "_create_watcher", f"inotify unavailable, polling instead: {e}")
+            return None
+
+        for path in self.paths_to_monitor:
+            if not path.is_dir():
+                continue
+            try:
+                watcher.add_watch(str(path))
+            except OSError as e:
+                logger.warning("StorageMonitor", "_create_watcher", f"Cannot watch {path}: {e}")
+
+        if not watcher.watches:
+            watcher.close()
+            return None
+        return watcher
+
     def _monitoring_loop(self):
-        """Main monitoring loop."""
+        """Polling monitoring loop."""
         while not self.stop_event.wait(self.update_interval):
-            try:
-                old_info = self.storage_info.copy()
-                self._update_storage_info()
-
-                # Check for significant changes
-                for path_str, new_info in self.storage_info.items():
-                    old_info_for_path = old_info.get(path_str)
-                    if (
-                        not old_info_for_path
-                        or abs(new_info.usage_percentage - old_info_for_path.usage_percentage) > 1.0
-                        or new_info.warning_level != old_info_for_path.warning_level
-                    ):
-                        # Notify callbacks
-                        for callback in self.callbacks:
-                            try:
-                                callback(path_str, new_info)
-                            except Exception as e:
-                                logger.error(
-                                    "StorageMonitor",
-                                    "_monitoring_loop",
-                                    f"Callback error: {e}",
-                                )
+            self._refresh_and_notify()
 
-            except Exception as e:
-                logger.error("StorageMonitor", "_monitoring_loop", f"Monitoring error: {e}")
+    def _event_loop(self, watcher: InotifyWatcher):
+        """Event-driven monitoring loop: sleeps until inotify reports a change."""
+        wake_fd = self._wake_pipe[0]
+        try:
+            while not self.stop_event.is_set():
+                readable, _, _ = select.select([watcher.fileno(), wake_fd], [], [])
+                if wake_fd in readable:
+                    break
+                if not watcher.read_events():
+                    continue
+
+                # Debounce: wait for a quiet period, but refresh at least every max_debounce_delay
+                # so usage keeps updating during a long batch download.
+                deadline = time.monotonic() + self.max_debounce_delay
+                while True:
+                    timeout = min(self.debounce_interval, deadline - time.monotonic())
+                    if timeout <= 0:
+                        break
+                    readable, _, _ = select.select([watcher.fileno(), wake_fd], [], [], timeout)
+                    if not readable:
+                        break
+                    if wake_fd in readable:
+                        return
+                    watcher.read_events()
+
+                self._refresh_and_notify()
+
+                if not watcher.watches:
+                    logger.warning(
+                        "StorageMonitor", "_event_loop", "All watched directories are gone, falling back to polling"
+                    )
+                    self.event_driven = False
+                    self._monitoring_loop()
+                    return
+        except Exception as e:
+            logger.error("StorageMonitor", "_event_loop", f"Monitoring error: {e}")
+        finally:
+            watcher.close()
+
+    def _refresh_and_notify(self):
+        """Recompute storage usage and notify callbacks of significant changes."""
+        try:
+            old_info = self.storage_info.copy()
+            self._update_storage_info()
+
+            # Check for significant changes
+            for path_str, new_info in self.storage_info.items():
+                old_info_for_path = old_info.get(path_str)
+                if (
+                    not old_info_for_path
+                    or abs(new_info.usage_percentage - old_info_for_path.usage_percentage) > 1.0
+                    or new_info.warning_level != old_info_for_path.warning_level
+                ):
+                    # Notify callbacks
+                    for callback in self.callbacks:
+                        try:
+                            callback(path_str, new_info)
+                        except Exception as e:
+                            logger.error(
+                                "StorageMonitor",
+                                "_refresh_and_notify",
+                                f"Callback error: {e}",
+                            )
+
+        except Exception as e:
+            logger.error("StorageMonitor", "_refresh_and_notify", f"Monitoring error: {e}")
 
     def _update_storage_info(self):
         """Update storage information for all monitored paths."""
@@ -197,6 +844,9 @@ class StorageMonitor:
                     last_updated=datetime.now(),
                 )
 
+                if self.usage_history:
+                    self.usage_history.record_sample("disk_used", str(path), used, total)
+
             except Exception as e:
                 logger.error(
                     "StorageMonitor",
@@ -216,35 +866,632 @@ class StorageMonitor:
         return info.warning_level if info else StorageWarningLevel.NORMAL
 
 
+@dataclass
+class IndexedFile:
+    """A single file entry as stored in the persistent scan index."""
+
+    path: str
+    dir_path: str
+    name: str
+    extension: str
+    size: int
+    mtime: float
+    inode: int
+
+
+def _size_bucket(file_size: int) -> str:
+    """Map a file size to the size distribution bucket used by the analytics."""
+    if file_size < 1024 * 1024:  # < 1MB
+        return "small"
+    if file_size < 10 * 1024 * 1024:  # < 10MB
+        return "medium"
+    if file_size < 100 * 1024 * 1024:  # < 100MB
+        return "large"
+    return "huge"
+
+
+class StorageScanIndex:
+    """
+    Persistent scan index for incremental storage analysis.
+
+    Every scanned directory is stored with its mtime and list of subdirectories,
+    and every file with its size, mtime and inode. A directory's mtime only
+    changes when entries are added, removed or renamed inside it, so on later
+    scans unchanged directories are skipped without listing or stat-ing their
+    files. Per-(extension, size bucket, day) aggregates are maintained with
+    deltas, so building analytics does not touch the file rows at all.
+
+    Files rewritten in place (same name, directory untouched) are only picked
+    up when their directory changes or on a full rescan.
+    """
+
+    # Directories modified this close to the scan start may still change within
+    # the same mtime tick, so they are not trusted on the next scan.
+    RACY_WINDOW_SECONDS = 2.0
+
+    def __init__(self, db_path: Path, max_workers: int = 8):
+        self.db_path = Path(db_path)
+        self.max_workers = max_workers
+        self._init_tables()
+
+    def _init_tables(self):
+        """Create the scan index tables in the optimizer database."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS scan_directories (
+                    dir_path TEXT PRIMARY KEY,
+                    base_path TEXT,
+                    dir_mtime REAL,
+                    subdirs TEXT,
+                    last_scanned TEXT
+                )
+            """
+            )
+
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS scan_index (
+                    file_path TEXT PRIMARY KEY,
+                    dir_path TEXT,
+                    base_path TEXT,
+                    file_name TEXT,
+                    extension TEXT,
+                    file_size INTEGER,
+                    mtime REAL,
+                    inode INTEGER
+                )
+            """
+            )
+
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS scan_aggregates (
+                    base_path TEXT,
+                    extension TEXT,
+                    size_bucket TEXT,
+                    mtime_day INTEGER,
+                    file_count INTEGER,
+                    total_size INTEGER,
+                    PRIMARY KEY (base_path, extension, size_bucket, mtime_day)
+                )
+            """
+            )
+
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_scan_index_dir ON scan_index (dir_path)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_scan_index_size ON scan_index (base_path, file_size)")
+            conn.commit()
+
+    def refresh(
+        self,
+        base_path: Path,
+        full_rescan: bool = False,
+        cancel_event: Optional[threading.Event] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Bring the index for base_path up to date with the filesystem.
+
+        Only directories whose mtime differs from the stored value are listed
+        again; unchanged directories reuse their stored subdirectory list.
+        Directories are visited on a bounded thread pool so that slow stat and
+        scandir calls (external drives, network shares) overlap, while the
+        results are folded into the index on the calling thread as they arrive.
+
+        Args:
+            base_path: Root directory to scan.
+            full_rescan: Ignore stored directory mtimes and re-list everything.
+            cancel_event: When set, stop submitting directories. Work already
+                done is kept, but vanished directories are not pruned.
+            progress_callback: Called with a copy of the running stats after
+                each directory is processed.
+
+        Returns:
+            Dictionary with counts of scanned/skipped directories,
+            added/removed file entries and whether the scan was cancelled.
+        """
+        base_key = str(base_path)
+        stats = {
+            "directories_scanned": 0,
+            "directories_skipped": 0,
+            "files_added": 0,
+            "files_removed": 0,
+            "cancelled": False,
+        }
+        aggregate_deltas: Dict[Tuple[str, str, int], List[int]] = {}
+        scan_started = time.time()
+
+        with sqlite3.connect(self.db_path) as conn:
+            known_dirs = {
+                row[0]: (row[1], json.loads(row[2]) if row[2] else [])
+                for row in conn.execute(
+                    "SELECT dir_path, dir_mtime, subdirs FROM scan_directories WHERE base_path = ?",
+                    (base_key,),
+                )
+            }
+
+            visited = set()
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="StorageScan") as executor:
+
+                def submit(dir_path: str):
+                    return executor.submit(self._visit_directory, dir_path, known_dirs.get(dir_path), full_rescan)
+
+                in_flight = {submit(base_key)}
+                while in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        dir_path, status, dir_mtime, files, subdirs = future.result()
+                        if status == "missing":
+                            continue
+
+                        visited.add(dir_path)
+                        if status == "scanned":
+                            self._replace_directory(conn, base_key, dir_path, files, stats, aggregate_deltas)
+                            recorded_mtime = dir_mtime if dir_mtime < scan_started - self.RACY_WINDOW_SECONDS else None
+                            conn.execute(
+                                """
+                                INSERT OR REPLACE INTO scan_directories
+                                (dir_path, base_path, dir_mtime, subdirs, last_scanned)
+                                VALUES (?, ?, ?, ?, ?)
+                            """,
+                                (dir_path, base_key, recorded_mtime, json.dumps(subdirs), datetime.now().isoformat()),
+                            )
+                            stats["directories_scanned"] += 1
+                        else:
+                            stats["directories_skipped"] += 1
+
+                        if progress_callback:
+                            try:
+                                progress_callback(dict(stats, current_directory=dir_path))
+                            except Exception as e:
+                                logger.error("StorageScanIndex", "refresh", f"Progress callback error: {e}")
+
+                        if cancel_event is not None and cancel_event.is_set():
+                            stats["cancelled"] = True
+                        if not stats["cancelled"]:
+                            in_flight.update(submit(subdir) for subdir in subdirs)
+
+                    if stats["cancelled"]:
+                        for future in in_flight:
+                            future.cancel()
+                        in_flight = {future for future in in_flight if not future.cancelled()}
+
+            # Directories that vanished since the last scan take their files with them. A cancelled
+            # scan has not seen the whole tree, so it cannot tell vanished from unvisited.
+            if not stats["cancelled"]:
+                for stale_dir in set(known_dirs) - visited:
+                    self._replace_directory(conn, base_key, stale_dir, [], stats, aggregate_deltas)
+                    conn.execute("DELETE FROM scan_directories WHERE dir_path = ?", (stale_dir,))
+
+            self._apply_aggregate_deltas(conn, base_key, aggregate_deltas)
+            conn.commit()
+
+        logger.debug(
+            "StorageScanIndex",
+            "refresh",
+            f"{base_key}: {stats['directories_scanned']} dirs scanned, "
+            f"{stats['directories_skipped']} unchanged, +{stats['files_added']}/-{stats['files_removed']} files"
+            f"{' (cancelled)' if stats['cancelled'] else ''}",
+        )
+        return stats
+
+    def _visit_directory(
+        self, dir_path: str, known: Optional[Tuple[Optional[float], List[str]]], full_rescan: bool
+    ) -> Tuple[str, str, Optional[float], Optional[List[IndexedFile]], List[str]]:
+        """
+        Stat one directory and list it if it changed. Runs on a worker thread.
+
+        Returns:
+            (dir_path, status, dir_mtime, files, subdirs) where status is one of
+            "missing", "unchanged", "unreadable" or "scanned". Files are only
+            present for "scanned".
+        """
+        try:
+            dir_mtime = os.stat(dir_path).st_mtime
+        except OSError as e:
+            logger.warning("StorageScanIndex", "_visit_directory", f"Cannot stat directory {dir_path}: {e}")
+            return dir_path, "missing", None, None, []
+
+        known_subdirs = known[1] if known else []
+        if not full_rescan and known and known[0] == dir_mtime:
+            return dir_path, "unchanged", dir_mtime, None, known_subdirs
+
+        listing = self._scan_directory(dir_path)
+        if listing is None:
+            # Keep whatever the index already holds rather than dropping it
+            return dir_path, "unreadable", dir_mtime, None, known_subdirs
+
+        files, subdirs = listing
+        return dir_path, "scanned", dir_mtime, files, subdirs
+
+    def _scan_directory(self, dir_path: str) -> Optional[Tuple[List[IndexedFile], List[str]]]:
+        """List one directory, returning its files and subdirectories (None if it cannot be listed)."""
+        files = []
+        subdirs = []
+
+        try:
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.is_file():
+                            # DirEntry caches this; on Windows it comes free with the listing
+                            stat = entry.stat()
+                            files.append(
+                                IndexedFile(
+                                    path=entry.path,
+                                    dir_path=dir_path,
+                                    name=entry.name,
+                                    extension=os.path.splitext(entry.name)[1].lower(),
+                                    size=stat.st_size,
+                                    mtime=stat.st_mtime,
+                                    inode=stat.st_ino,
+                                )
+                            )
+                    except OSError as e:
+                        logger.warning("StorageScanIndex", "_scan_directory", f"Error analyzing {entry.path}: {e}")
+        except OSError as e:
+            logger.warning("StorageScanIndex", "_scan_directory", f"Cannot list directory {dir_path}: {e}")
+            return None
+
+        return files, subdirs
+
+    def _replace_directory(
+        self,
+        conn: sqlite3.Connection,
+        base_key: str,
+        dir_path: str,
+        files: List[IndexedFile],
+        stats: Dict[str, int],
+        aggregate_deltas: Dict[Tuple[str, str, int], List[int]],
+    ):
+        """Diff a directory's stored files against a fresh listing and apply the changes."""
+        old_files = {
+            row[0]: row[1:]
+            for row in conn.execute(
+                "SELECT file_path, extension, file_size, mtime, inode FROM scan_index WHERE dir_path = ?",
+                (dir_path,),
+            )
+        }
+        new_files = {f.path: f for f in files}
+
+        removed = []
+        for path, (extension, size, mtime, inode) in old_files.items():
+            new = new_files.get(path)
+            if new is None or (new.size, new.mtime, new.inode) != (size, mtime, inode):
+                removed.append(path)
+                self._add_delta(aggregate_deltas, extension, size, mtime, -1)
+
+        added = []
+        for path, new in new_files.items():
+            old = old_files.get(path)
+            if old is None or (new.size, new.mtime, new.inode) != tuple(old[1:]):
+                added.append(new)
+                self._add_delta(aggregate_deltas, new.extension, new.size, new.mtime, 1)
+
+        if removed:
+            conn.executemany("DELETE FROM scan_index WHERE file_path = ?", [(path,) for path in removed])
+        if added:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO scan_index
+                (file_path, dir_path, base_path, file_name, extension, file_size, mtime, inode)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+                [(f.path, f.dir_path, base_key, f.name, f.extension, f.size, f.mtime, f.inode) for f in added],
+            )
+
+        stats["files_removed"] += len(removed)
+        stats["files_added"] += len(added)
+
+    @staticmethod
+    def _add_delta(
+        aggregate_deltas: Dict[Tuple[str, str, int], List[int]], extension: str, size: int, mtime: float, sign: int
+    ):
+        """Accumulate a +1/-1 file change into the pending aggregate deltas."""
+        key = (extension, _size_bucket(size), int(mtime // 86400))
+        delta = aggregate_deltas.setdefault(key, [0, 0])
+        delta[0] += sign
+        delta[1] += sign * size
+
+    @staticmethod
+    def _apply_aggregate_deltas(
+        conn: sqlite3.Connection, base_key: str, aggregate_deltas: Dict[Tuple[str, str, int], List[int]]
+    ):
+        """Fold accumulated deltas into the persisted aggregates."""
+        rows = [
+            (base_key, ext, bucket, day, d[0], d[1]) for (ext, bucket, day), d in aggregate_deltas.items() if any(d)
+        ]
+        if not rows:
+            return
+
+        conn.executemany(
+            """
+            INSERT INTO scan_aggregates (base_path, extension, size_bucket, mtime_day, file_count, total_size)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (base_path, extension, size_bucket, mtime_day) DO UPDATE SET
+                file_count = file_count + excluded.file_count,
+                total_size = total_size + excluded.total_size
+        """,
+            rows,
+        )
+        conn.execute("DELETE FROM scan_aggregates WHERE base_path = ? AND file_count <= 0", (base_key,))
+
+    def get_aggregates(self, base_paths: List[str]) -> List[Tuple[str, str, int, int, int]]:
+        """Return (extension, size_bucket, mtime_day, file_count, total_size) rows for the given roots."""
+        if not base_paths:
+            return []
+
+        placeholders = ",".join("?" for _ in base_paths)
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(
+                f"""
+                SELECT extension, size_bucket, mtime_day, SUM(file_count), SUM(total_size)
+                FROM scan_aggregates
+                WHERE base_path IN ({placeholders})
+                GROUP BY extension, size_bucket, mtime_day
+            """,
+                base_paths,
+            )
+            return cursor.fetchall()
+
+    def get_totals(self, base_path: str) -> Tuple[int, int]:
+        """Return (file count, total size) for one indexed root."""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT COALESCE(SUM(file_count), 0), COALESCE(SUM(total_size), 0) FROM scan_aggregates "
+                "WHERE base_path = ?",
+                (base_path,),
+            ).fetchone()
+        return row[0], row[1]
+
+    def get_size_collisions(self, base_paths: List[str]) -> Dict[int, List[Tuple[str, int, float]]]:
+        """
+        Group indexed non-empty files by size, keeping only sizes shared by several files.
+
+        Returns:
+            Mapping of file size to (path, inode, mtime) tuples.
+        """
+        if not base_paths:
+            return {}
+
+        placeholders = ",".join("?" for _ in base_paths)
+        groups: Dict[int, List[Tuple[str, int, float]]] = {}
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(
+                f"""
+                SELECT file_size, file_path, inode, mtime FROM scan_index
+                WHERE base_path IN ({placeholders})
+                AND file_size IN (
+                    SELECT file_size FROM scan_index
+                    WHERE base_path IN ({placeholders}) AND file_size > 0
+                    GROUP BY file_size HAVING COUNT(*) > 1
+                )
+                ORDER BY file_path
+            """,
+                base_paths + base_paths,
+            )
+            for file_size, file_path, inode, mtime in cursor.fetchall():
+                groups.setdefault(file_size, []).append((file_path, inode, mtime))
+
+        return groups
+
+
+class DuplicateFinder:
+    """
+    Staged content-hash duplicate detection.
+
+    Candidates are first grouped by size, then by a hash of their first and
+    last 64 KB, and only files that still collide get a full streaming hash.
+    Hashes run on a thread pool and are cached by (inode, mtime, size), so a
+    file is never read twice while it stays unchanged.
+    """
+
+    EDGE_BYTES = 64 * 1024
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, db_path: Path, max_workers: int = 4):
+        self.db_path = Path(db_path)
+        self.max_workers = max_workers
+        self.bytes_read = 0
+        self._bytes_lock = threading.Lock()
+        self._init_tables()
+
+    def _init_tables(self):
+        """Create the content hash cache table."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS content_hashes (
+                    inode INTEGER,
+                    mtime REAL,
+                    file_size INTEGER,
+                    edge_hash TEXT,
+                    full_hash TEXT,
+                    PRIMARY KEY (inode, mtime, file_size)
+                )
+            """
+            )
+            conn.commit()
+
+    def find_duplicates(self, size_groups: Dict[int, List[Tuple[str, int, float]]]) -> List[Tuple[str, List[str]]]:
+        """
+        Find sets of files with identical content.
+
+        Args:
+            size_groups: Mapping of file size to (path, inode, mtime) candidates.
+
+        Returns:
+            List of (content hash, paths) tuples. Paths are ordered oldest
+            first, so the first entry is the copy to keep.
+        """
+        candidates = []
+        for size, entries in size_groups.items():
+            # Hard links share an inode: removing one frees nothing, so keep one path per inode
+            seen_inodes = set()
+            unique_entries = []
+            for path, inode, mtime in sorted(entries, key=lambda e: (e[2], e[0])):
+                if inode:
+                    if inode in seen_inodes:
+                        continue
+                    seen_inodes.add(inode)
+                unique_entries.append((path, inode, mtime, size))
+            if len(unique_entries) > 1:
+                candidates.append(unique_entries)
+
+        if not candidates:
+            return []
+
+        # Stage 2: hash the first and last 64 KB of every size-colliding file
+        edge_groups: Dict[Tuple[int, str], List[Tuple[str, int, float, int]]] = {}
+        edge_hashes = self._hash_files([entry for group in candidates for entry in group], "edge_hash")
+        for group in candidates:
+            for entry in group:
+                digest = edge_hashes.get(entry[0])
+                if digest:
+                    edge_groups.setdefault((entry[3], digest), []).append(entry)
+
+        # Stage 3: full hash only where the edges still collide
+        remaining = [group for group in edge_groups.values() if len(group) > 1]
+        full_hashes = self._hash_files([entry for group in remaining for entry in group], "full_hash")
+
+        duplicates = []
+        for group in remaining:
+            by_content: Dict[str, List[str]] = {}
+            for path, _, _, _ in group:
+                digest = full_hashes.get(path)
+                if digest:
+                    by_content.setdefault(digest, []).append(path)
+            duplicates.extend((digest, paths) for digest, paths in by_content.items() if len(paths) > 1)
+
+        return duplicates
+
+    def get_full_hash(self, file_path: str) -> Optional[str]:
+        """Return the full content hash of a single file, using the cache when it is unchanged."""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        entry = (str(file_path), stat.st_ino, stat.st_mtime, stat.st_size)
+        return self._hash_files([entry], "full_hash").get(str(file_path))
+
+    def _hash_files(self, entries: List[Tuple[str, int, float, int]], column: str) -> Dict[str, str]:
+        """Hash files on the thread pool, serving and populating the (inode, mtime, size) cache."""
+        results: Dict[str, str] = {}
+        to_hash = []
+
+        with sqlite3.connect(self.db_path) as conn:
+            for entry in entries:
+                path, inode, mtime, size = entry
+                row = None
+                if inode:
+                    row = conn.execute(
+                        f"SELECT {column} FROM content_hashes WHERE inode = ? AND mtime = ? AND file_size = ?",
+                        (inode, mtime, size),
+                    ).fetchone()
+                if row and row[0]:
+                    results[path] = row[0]
+                # Files that fit in the two edge blocks were read in full by the edge hash
+                elif column == "full_hash" and size <= 2 * self.EDGE_BYTES and inode:
+                    row = conn.execute(
+                        "SELECT edge_hash FROM content_hashes WHERE inode = ? AND mtime = ? AND file_size = ?",
+                        (inode, mtime, size),
+                    ).fetchone()
+                    if row and row[0]:
+                        results[path] = row[0]
+                    else:
+                        to_hash.append(entry)
+                else:
+                    to_hash.append(entry)
+
+        if not to_hash:
+            return results
+
+        hash_func = self._edge_hash if column == "edge_hash" else self._full_hash
+        computed = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(hash_func, entry[0], entry[3]): entry for entry in to_hash}
+            for future in as_completed(futures):
+                entry = futures[future]
+                try:
+                    digest = future.result()
+                except OSError as e:
+                    logger.warning("DuplicateFinder", "_hash_files", f"Failed to hash {entry[0]}: {e}")
+                    continue
+                results[entry[0]] = digest
+                if entry[1]:
+                    computed.append((entry[1], entry[2], entry[3], digest))
+
+        if computed:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany(
+                    f"""
+                    INSERT INTO content_hashes (inode, mtime, file_size, {column}) VALUES (?, ?, ?, ?)
+                    ON CONFLICT (inode, mtime, file_size) DO UPDATE SET {column} = excluded.{column}
+                """,
+                    computed,
+                )
+                conn.commit()
+
+        return results
+
+    def _edge_hash(self, file_path: str, file_size: int) -> str:
+        """Hash the first and last EDGE_BYTES of a file (the whole file if it is small)."""
+        hasher = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            head = f.read(self.EDGE_BYTES)
+            hasher.update(head)
+            read = len(head)
+            if file_size > self.EDGE_BYTES:
+                f.seek(max(self.EDGE_BYTES, file_size - self.EDGE_BYTES))
+                tail = f.read(self.EDGE_BYTES)
+                hasher.update(tail)
+                read += len(tail)
+        self._count_bytes(read)
+        return hasher.hexdigest()
+
+    def _full_hash(self, file_path: str, file_size: int) -> str:
+        """Calculate the SHA-256 of a whole file with streaming reads."""
+        hasher = hashlib.sha256()
+        read = 0
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.CHUNK_SIZE), b""):
+                hasher.update(chunk)
+                read += len(chunk)
+        self._count_bytes(read)
+        return hasher.hexdigest()
+
+    def _count_bytes(self, count: int):
+        """Track how many bytes hashing has read, for diagnostics."""
+        with self._bytes_lock:
+            self.bytes_read += count
+
+
 class StorageOptimizer:
     """Storage optimization suggestions and cleanup utilities."""
 
     def __init__(self, base_paths: List[str], cache_dir: str = None):
-        self.base_paths = [Path(p) for p in base_paths]
-        self.cache_dir = Path(cache_dir) if cache_dir else Path.home() / ".hidock" / "cache"
+        self.base_paths = [Path(os.path.abspath(p)) for p in base_paths]
+        self.cache_dir = Path(cache_dir) if cache_dir else get_storage_cache_dir()
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
         # Database for tracking file information
         self.db_path = self.cache_dir / "storage_optimization.db"
         self._init_database()
+        self.usage_history = StorageUsageHistory(self.db_path)
+        self.scan_index = StorageScanIndex(self.db_path)
+        self.duplicate_finder = DuplicateFinder(self.db_path)
+
+        # Duplicate path -> (kept original, content hash) from the last analysis
+        self._duplicate_originals: Dict[str, Tuple[str, str]] = {}
+
+        # Set by cancel_analysis() to stop a running analyze_storage()
+        self.cancel_event = threading.Event()
 
     def _init_database(self):
         """Initialize the optimization database."""
         with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS file_tracking (
-                    file_path TEXT PRIMARY KEY,
-                    file_size INTEGER,
-                    file_hash TEXT,
-                    last_accessed TEXT,
-                    last_modified TEXT,
-                    access_count INTEGER DEFAULT 0,
-                    created_date TEXT
-                )
-            """
-            )
-
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS optimization_history (
@@ -259,99 +1506,112 @@ class StorageOptimizer:
             )
             conn.commit()
 
-    def analyze_storage(self) -> StorageAnalytics:
-        """Perform comprehensive storage analysis."""
+    def analyze_storage(
+        self, full_rescan: bool = False, progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> StorageAnalytics:
+        """
+        Perform comprehensive storage analysis.
+
+        The scan index is refreshed first, so only directories that changed
+        since the previous analysis are read from disk. Distributions are then
+        built from the index's persisted aggregates.
+
+        If cancel_analysis() is called while scanning, the walk stops early and
+        the analytics reflect the index as far as it got; duplicate detection
+        is skipped.
+
+        Args:
+            full_rescan: Re-list every directory instead of trusting stored mtimes.
+            progress_callback: Called with running scan stats (plus "base_path")
+                after each directory is processed.
+        """
         logger.info("StorageOptimizer", "analyze_storage", "Starting storage analysis")
+        self.cancel_event.clear()
 
         total_files = 0
         total_size = 0
         file_type_distribution = {}
         size_distribution = {"small": 0, "medium": 0, "large": 0, "huge": 0}
         age_distribution = {"recent": 0, "week": 0, "month": 0, "old": 0}
-        duplicate_files = []
-        file_hashes = {}
-
-        now = datetime.now()
 
+        indexed_paths = []
         for base_path in self.base_paths:
             if not base_path.exists():
                 continue
 
-            for file_path in base_path.rglob("*"):
-                if not file_path.is_file():
-                    continue
-
-                try:
-                    stat = file_path.stat()
-                    file_size = stat.st_size
-                    modified_time = datetime.fromtimestamp(stat.st_mtime)
-
-                    total_files += 1
-                    total_size += file_size
-
-                    # File type distribution
-                    extension = file_path.suffix.lower()
-                    if extension not in file_type_distribution:
-                        file_type_distribution[extension] = {
-                            "count": 0,
-                            "total_size": 0,
-                            "avg_size": 0,
-                        }
-
-                    file_type_distribution[extension]["count"] += 1
-                    file_type_distribution[extension]["total_size"] += file_size
-                    file_type_distribution[extension]["avg_size"] = (
-                        file_type_distribution[extension]["total_size"] / file_type_distribution[extension]["count"]
-                    )
+            if self.cancel_event.is_set():
+                break
 
-                    # Size distribution
-                    if file_size < 1024 * 1024:  # < 1MB
-                        size_distribution["small"] += 1
-                    elif file_size < 10 * 1024 * 1024:  # < 10MB
-                        size_distribution["medium"] += 1
-                    elif file_size < 100 * 1024 * 1024:  # < 100MB
-                        size_distribution["large"] += 1
-                    else:
-                        size_distribution["huge"] += 1
-
-                    # Age distribution
-                    age_days = (now - modified_time).days
-                    if age_days <= 1:
-                        age_distribution["recent"] += 1
-                    elif age_days <= 7:
-                        age_distribution["week"] += 1
-                    elif age_days <= 30:
-                        age_distribution["month"] += 1
-                    else:
-                        age_distribution["old"] += 1
+            def report_progress(stats: Dict[str, Any], base_path: Path = base_path):
+                progress_callback(dict(stats, base_path=str(base_path)))
 
-                    # Duplicate detection (simplified - using size as hash for performance)
-                    file_key = f"{file_size}_{file_path.name}"
-                    if file_key in file_hashes:
-                        file_hashes[file_key].append(str(file_path))
-                    else:
-                        file_hashes[file_key] = [str(file_path)]
+            try:
+                self.scan_index.refresh(
+                    base_path,
+                    full_rescan=full_rescan,
+                    cancel_event=self.cancel_event,
+                    progress_callback=report_progress if progress_callback else None,
+                )
+                indexed_paths.append(str(base_path))
+            except Exception as e:
+                logger.warning(
+                    "StorageOptimizer",
+                    "analyze_storage",
+                    f"Error analyzing {base_path}: {e}",
+                )
 
-                except Exception as e:
-                    logger.warning(
-                        "StorageOptimizer",
-                        "analyze_storage",
-                        f"Error analyzing {file_path}: {e}",
-                    )
+        today = int(time.time() // 86400)
+        for extension, size_bucket, mtime_day, file_count, bucket_size in self.scan_index.get_aggregates(indexed_paths):
+            total_files += file_count
+            total_size += bucket_size
+
+            # File type distribution
+            if extension not in file_type_distribution:
+                file_type_distribution[extension] = {
+                    "count": 0,
+                    "total_size": 0,
+                    "avg_size": 0,
+                }
 
-        # Find duplicates
-        duplicate_files = [(key, paths) for key, paths in file_hashes.items() if len(paths) > 1]
+            file_type_distribution[extension]["count"] += file_count
+            file_type_distribution[extension]["total_size"] += bucket_size
 
-        # Calculate growth trend (simplified)
-        growth_trend = {"daily": 0.0, "weekly": 0.0, "monthly": 0.0}
+            # Size distribution
+            size_distribution[size_bucket] += file_count
 
-        # Access patterns (simplified)
-        access_patterns = {
-            "frequently_accessed": [],
-            "rarely_accessed": [],
-            "never_accessed": [],
+            # Age distribution
+            age_days = today - mtime_day
+            if age_days <= 1:
+                age_distribution["recent"] += file_count
+            elif age_days <= 7:
+                age_distribution["week"] += file_count
+            elif age_days <= 30:
+                age_distribution["month"] += file_count
+            else:
+                age_distribution["old"] += file_count
+
+        for stats in file_type_distribution.values():
+            stats["avg_size"] = stats["total_size"] / stats["count"]
+
+        # Duplicate detection by content hash
+        if self.cancel_event.is_set():
+            duplicate_files = []
+        else:
+            duplicate_files = self.duplicate_finder.find_duplicates(self.scan_index.get_size_collisions(indexed_paths))
+        self._duplicate_originals = {
+            path: (paths[0], digest) for digest, paths in duplicate_files for path in paths[1:]
         }
 
+        # Growth trend from the recorded size history of each tree
+        if not self.cancel_event.is_set():
+            for base_key in indexed_paths:
+                _, base_size = self.scan_index.get_totals(base_key)
+                self.usage_history.record_sample("tree_size", base_key, base_size)
+        growth_trend = self.usage_history.get_growth_trend("tree_size", indexed_paths)
+
+        # Access patterns from recorded playback/transcription/download events
+        access_patterns = self.usage_history.get_access_patterns(indexed_paths)
+
         analytics = StorageAnalytics(
             total_files=total_files,
             total_size=total_size,
@@ -371,15 +1631,23 @@ class StorageOptimizer:
 
         return analytics
 
+    def cancel_analysis(self):
+        """Request that a running analyze_storage() stop as soon as possible."""
+        self.cancel_event.set()
+
     def generate_optimization_suggestions(self, analytics: StorageAnalytics) -> List[OptimizationSuggestion]:
         """Generate storage optimization suggestions based on analysis."""
         suggestions = []
 
         # Duplicate file removal
         if analytics.duplicate_files:
-            duplicate_savings = (
-                sum(len(paths) - 1 for _, paths in analytics.duplicate_files) * 1024 * 1024
-            )  # Rough estimate
+            duplicate_savings = 0
+            for _, paths in analytics.duplicate_files:
+                for path in paths[1:]:
+                    try:
+                        duplicate_savings += os.path.getsize(path)
+                    except OSError:
+                        pass  # Removed since the analysis, so it frees nothing
 
             suggestions.append(
                 OptimizationSuggestion(
@@ -425,6 +1693,23 @@ class StorageOptimizer:
                 )
             )
 
+        # Archive files nobody has played, transcribed or downloaded in a long time
+        cold_files = analytics.access_patterns.get("cold_files", [])
+        if cold_files:
+            growing = analytics.growth_trend.get("weekly", 0.0) > 0
+            suggestions.append(
+                OptimizationSuggestion(
+                    type=OptimizationType.ARCHIVE_OLD_FILES,
+                    description=f"Archive {len(cold_files)} files not used in "
+                    f"{StorageUsageHistory.COLD_FILE_DAYS} days",
+                    potential_savings=analytics.access_patterns.get("cold_files_size", 0),
+                    priority=3 if growing else 1,
+                    action_required=False,
+                    estimated_time="5-10 minutes",
+                    files_affected=cold_files,
+                )
+            )
+
         # Large file compression
         large_files_count = analytics.size_distribution.get("large", 0) + analytics.size_distribution.get("huge", 0)
         if large_files_count > 10:
@@ -532,7 +1817,12 @@ class StorageOptimizer:
         return result
 
     def _remove_duplicates(self, duplicate_files: List[str], dry_run: bool) -> Dict[str, Any]:
-        """Remove duplicate files."""
+        """
+        Remove duplicate files.
+
+        A file is only removed if the last analysis found it to be a duplicate
+        and it still hashes identically to the copy being kept.
+        """
         result = {"success": True, "files_processed": 0, "space_saved": 0, "errors": []}
 
         for file_path_str in duplicate_files:
@@ -540,6 +1830,19 @@ class StorageOptimizer:
             if not file_path.exists():
                 continue
 
+            original = self._duplicate_originals.get(file_path_str)
+            if not original:
+                result["errors"].append(f"Skipped {file_path}: not identified as a duplicate by the last analysis")
+                continue
+
+            original_path, digest = original
+            if (
+                self.duplicate_finder.get_full_hash(original_path) != digest
+                or self.duplicate_finder.get_full_hash(file_path_str) != digest
+            ):
+                result["errors"].append(f"Skipped {file_path}: content no longer matches {original_path}")
+                continue
+
             try:
                 file_size = file_path.stat().st_size
 
@@ -666,9 +1969,15 @@ class StorageOptimizer:
 class StorageQuotaManager:
     """Storage quota management and warning systems."""
 
-    def __init__(self, quota_config: StorageQuota, storage_monitor: StorageMonitor):
+    def __init__(
+        self,
+        quota_config: StorageQuota,
+        storage_monitor: StorageMonitor,
+        storage_optimizer: Optional[StorageOptimizer] = None,
+    ):
         self.quota_config = quota_config
         self.storage_monitor = storage_monitor
+        self.storage_optimizer = storage_optimizer
         self.warning_callbacks: List[callable] = []
 
         # Register for storage updates
@@ -748,12 +2057,13 @@ class StorageQuotaManager:
 
     def get_quota_status(self) -> Dict[str, Any]:
         """Get current quota status."""
-        storage_info = list(self.storage_monitor.get_storage_info().values())
+        storage_info = self.storage_monitor.get_storage_info()
         if not storage_info:
             return {"error": "No storage information available"}
 
         # Use first storage info (could be enhanced to handle multiple paths)
-        info = storage_info[0]
+        path, info = next(iter(storage_info.items()))
+        days_until_full = self._project_days_until_full(path)
 
         return {
             "quota_config": asdict(self.quota_config),
@@ -764,10 +2074,47 @@ class StorageQuotaManager:
                 "usage_percentage": info.usage_percentage,
                 "warning_level": info.warning_level.value,
             },
+            "days_until_full": days_until_full,
             "quota_violations": self._get_current_violations(info),
-            "recommendations": self._get_quota_recommendations(info),
+            "recommendations": self._get_quota_recommendations(info, days_until_full),
         }
 
+    def _project_days_until_full(self, path: str) -> Optional[float]:
+        """Project days until the volume is full from the monitor's usage history."""
+        history = self.storage_monitor.usage_history
+        if history is None:
+            return None
+        try:
+            return history.project_time_to_full(path)
+        except Exception as e:
+            logger.warning("StorageQuotaManager", "_project_days_until_full", f"Projection failed: {e}")
+            return None
+
+    def get_eviction_candidates(self, bytes_needed: Optional[int] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Pick the least recently used files to free space.
+
+        Args:
+            bytes_needed: Stop once the candidates add up to this many bytes.
+            limit: Maximum number of candidates.
+
+        Returns:
+            List of dicts with path, size and last_used, coldest first. Empty
+            if no optimizer (and thus no file index) is attached.
+        """
+        if self.storage_optimizer is None:
+            return []
+
+        base_paths = [str(p) for p in self.storage_optimizer.base_paths]
+        candidates = []
+        freed = 0
+        for path, size, last_used in self.storage_optimizer.usage_history.get_cold_files(base_paths, limit=limit):
+            candidates.append({"path": path, "size": size, "last_used": datetime.fromtimestamp(last_used)})
+            freed += size
+            if bytes_needed is not None and freed >= bytes_needed:
+                break
+        return candidates
+
     def _get_current_violations(self, storage_info: StorageInfo) -> List[Dict[str, str]]:
         """Get current quota violations."""
         violations = []
@@ -789,10 +2136,15 @@ class StorageQuotaManager:
 
         return violations
 
-    def _get_quota_recommendations(self, storage_info: StorageInfo) -> List[str]:
+    def _get_quota_recommendations(
+        self, storage_info: StorageInfo, days_until_full: Optional[float] = None
+    ) -> List[str]:
         """Get quota management recommendations."""
         recommendations = []
 
+        if days_until_full is not None and days_until_full < 30:
+            recommendations.append(f"At the current growth rate storage will be full in {days_until_full:.0f} days")
+
         if storage_info.usage_percentage > 80:
             recommendations.append("Consider enabling automatic cleanup")
             recommendations.append("Review and delete old or unnecessary files")
@@ -844,9 +2196,10 @@ def create_storage_management_system(
         )
 
     # Create components
-    storage_monitor = StorageMonitor([download_dir] + base_paths)
     storage_optimizer = StorageOptimizer(base_paths)
-    quota_manager = StorageQuotaManager(quota_config, storage_monitor)
+    # The cache directory is not monitored: it holds the databases written on every access
+    storage_monitor = StorageMonitor([download_dir] + base_paths, usage_history=storage_optimizer.usage_history)
+    quota_manager = StorageQuotaManager(quota_config, storage_monitor, storage_optimizer)
 
     logger.info("StorageManagement", "create_system", "Storage management system created")
 
@@ -0,0 +1,68 @@
+"""
+Tests for the tiered audio file loader.
+"""
+
+import numpy as np
+import pytest
+from scipy.io import wavfile
+
+import audio_loader
+from audio_loader import FORMAT_MP3, FORMAT_MP4, FORMAT_WAV, load_audio, open_audio_stream, probe_format
+
+
+class TestAudioLoader:
+    """Test cases for load_audio and probe_format."""
+
+    @pytest.mark.unit
+    def test_probe_reads_header_not_extension(self, temp_dir):
+        """Test that the container is identified from the file content."""
+        wav_path = temp_dir / "recording.hda"
+        wavfile.write(str(wav_path), 16000, np.zeros(100, dtype=np.int16))
+        mp3_path = temp_dir / "recording.bin"
+        mp3_path.write_bytes(b"ID3\x04\x00" + bytes(64))
+
+        assert probe_format(str(wav_path)) == FORMAT_WAV
+        assert probe_format(str(mp3_path)) == FORMAT_MP3
+        assert probe_format(__file__) is None
+
+    @pytest.mark.unit
+    def test_stream_rejects_unknown_formats_with_value_error(self, temp_dir):
+        """Test that a file libsndfile cannot open raises the ValueError callers fall back on."""
+        path = temp_dir / "recording.m4a"
+        path.write_bytes(b"\0\0\0\x18ftypM4A \0\0\0\0M4A mp42" + bytes(4096))
+        assert probe_format(str(path)) == FORMAT_MP4
+
+        with pytest.raises(ValueError, match="Unsupported audio format"):
+            open_audio_stream(str(path), 1024)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("dtype", [np.int16, np.int32, np.uint8])
+    def test_wav_mixdown_matches_channel_mean(self, temp_dir, dtype):
+        """Test that memory-mapped WAV loading scales PCM and mixes stereo down to the channel mean."""
+        info = np.iinfo(dtype)
+        rng = np.random.default_rng(0)
+        samples = rng.integers(info.min, info.max, size=(4000, 2), endpoint=True).astype(dtype)
+        path = temp_dir / "stereo.wav"
+        wavfile.write(str(path), 8000, samples)
+
+        audio, sample_rate = load_audio(str(path))
+        offset = 128.0 if dtype == np.uint8 else 0.0
+        expected = (samples.astype(np.float64) - offset).mean(axis=1) / (-float(info.min) if offset == 0 else 128.0)
+
+        assert sample_rate == 8000
+        assert audio.dtype == np.float32 and audio.shape == (4000,)
+        np.testing.assert_allclose(audio, expected, atol=1e-6)
+
+        channels, _ = load_audio(str(path), np.float64, mono=False)
+        assert channels.shape == (4000, 2) and channels.dtype == np.float64
+
+    @pytest.mark.unit
+    def test_wav_does_not_import_librosa(self, temp_dir):
+        """Test that plain WAV files are read without the librosa fallback."""
+        path = temp_dir / "mono.wav"
+        wavfile.write(str(path), 16000, np.arange(-100, 100, dtype=np.int16))
+
+        audio, _ = load_audio(str(path))
+
+        assert audio[0] == pytest.approx(-100 / 32768)
+        assert audio_loader._librosa is None
@@ -0,0 +1,108 @@
+"""
+Tests for header-only audio probing.
+"""
+
+import struct
+import time
+
+import numpy as np
+import pytest
+from scipy.io import wavfile
+
+from audio_player_enhanced import AudioPlaylist
+from audio_probe import parse_mpeg_header, probe_audio
+
+
+def _mpeg_frame(bitrate_index=8, padding=0):
+    """MPEG-2 Layer II mono frame at 16 kHz, the HiDock H1E recording format (index 8 is 64 kb/s)."""
+    header = bytes([0xFF, 0xF5, (bitrate_index << 4) | (2 << 2) | (padding << 1), 0xC0])
+    length = 144 * [0, 8, 16, 24, 32, 40, 48, 56, 64][bitrate_index] * 1000 // 16000 + padding
+    return header + bytes(length - 4)
+
+
+def _id3_tag(payload_size):
+    size = bytes((payload_size >> shift) & 0x7F for shift in (21, 14, 7, 0))
+    return b"ID3\x03\x00\x00" + size + bytes(payload_size)
+
+
+class TestAudioProbe:
+    """Test cases for probe_audio."""
+
+    @pytest.mark.unit
+    def test_hidock_mpeg_constant_bitrate(self, temp_dir):
+        """Test that a constant bitrate file is timed from its size after an ID3 tag."""
+        path = temp_dir / "2025Jan01-120000-Rec01.hda"
+        path.write_bytes(_id3_tag(100000) + _mpeg_frame() * 1000)
+
+        frame = parse_mpeg_header(_mpeg_frame())
+        assert (frame.version, frame.layer, frame.bitrate, frame.frame_length) == (2, 2, 64000, 576)
+
+        info = probe_audio(str(path))
+        assert info.sample_rate == 16000 and info.channels == 1 and info.bitrate == 64000
+        assert info.duration == pytest.approx(1000 * 1152 / 16000)
+
+    @pytest.mark.unit
+    def test_mpeg_variable_bitrate_counts_frames(self, temp_dir):
+        """Test that mixed bitrates without a Xing header are timed by walking the frames."""
+        path = temp_dir / "vbr.mp3"
+        path.write_bytes((_mpeg_frame(8) + _mpeg_frame(4)) * 500)
+
+        info = probe_audio(str(path))
+        assert info.duration == pytest.approx(1000 * 1152 / 16000)
+        assert info.bitrate == 48000
+
+    @pytest.mark.unit
+    def test_wav_chunks(self, temp_dir):
+        """Test that chunks before the data chunk are skipped."""
+        path = temp_dir / "stereo.wav"
+        wavfile.write(str(path), 44100, np.zeros((44100 * 3, 2), dtype=np.int16))
+        content = path.read_bytes()
+        extra = b"LIST" + struct.pack("<I", 5) + b"abcde\x00"
+        path.write_bytes(content[:36] + extra + content[36:])
+
+        info = probe_audio(str(path))
+        assert (info.sample_rate, info.channels, info.bitrate) == (44100, 2, 44100 * 32)
+        assert info.duration == pytest.approx(3.0)
+        assert probe_audio(__file__) is None
+
+    @pytest.mark.unit
+    def test_playlist_loads_without_decoding(self, temp_dir):
+        """Test that adding hundreds of tracks only reads their headers."""
+        content = _mpeg_frame() * 5000
+        paths = []
+        for index in range(300):
+            path = temp_dir / f"rec{index}.hda"
+            path.write_bytes(content)
+            paths.append(str(path))
+
+        playlist = AudioPlaylist()
+        started = time.perf_counter()
+        assert all(playlist.add_track(path) for path in paths)
+        elapsed = time.perf_counter() - started
+
+        assert playlist.tracks[-1].duration == pytest.approx(5000 * 1152 / 16000)
+        assert elapsed < 1.0
+
+    @pytest.mark.unit
+    def test_stray_sync_words_are_not_mpeg(self, temp_dir):
+        """Test that containers holding bytes that look like a frame header are not probed as MPEG."""
+        rng = np.random.default_rng(0)
+        stray_frame = _mpeg_frame()[:4]
+        for index in range(50):
+            payload = bytearray(rng.integers(0, 256, 100000, dtype=np.uint8).tobytes())
+            # A sync word whose next frame would lie past the first read
+            payload[65000:65004] = stray_frame
+            path = temp_dir / f"clip{index}.m4a"
+            path.write_bytes(b"\0\0\0\x18ftypM4A \0\0\0\0M4A mp42" + bytes(payload))
+            assert probe_audio(str(path)) is None
+
+        ogg_path = temp_dir / "note.ogg"
+        ogg_path.write_bytes(b"OggS" + bytes(60000) + stray_frame + bytes(10000))
+        assert probe_audio(str(ogg_path)) is None
+
+        # HiDock recordings are scanned past leading junk, but one frame alone is not enough
+        hda_path = temp_dir / "damaged.hda"
+        hda_path.write_bytes(bytes(1000) + stray_frame + bytes(100))
+        assert probe_audio(str(hda_path)) is None
+        hda_path.write_bytes(bytes(1000) + _mpeg_frame() * 10)
+        assert probe_audio(str(hda_path)).duration == pytest.approx(10 * 1152 / 16000)
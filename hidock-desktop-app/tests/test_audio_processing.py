@@ -0,0 +1,512 @@
+"""
+Tests for advanced audio processing.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+import pytest
+from scipy import signal
+from scipy.io import wavfile
+
+from audio_processing_advanced import (
+    AudioAnalyzer,
+    AudioEnhancer,
+    AudioProcessingSettings,
+    CompressorMode,
+    EnvelopeCompressor,
+    NoiseProfileStore,
+    ProcessingQuality,
+    SamplePrecision,
+    SOSFilterChain,
+    SpectralFrames,
+    StreamingSpectralSubtractor,
+    design_enhancement_sos,
+    get_audio_analysis,
+)
+
+
+@pytest.fixture
+def speech_like_audio():
+    """Ten seconds of amplitude-modulated noise at 16 kHz."""
+    rng = np.random.default_rng(0)
+    sample_rate = 16000
+    t = np.arange(10 * sample_rate) / sample_rate
+    envelope = 0.5 * (1 + np.sin(2 * np.pi * 0.5 * t))
+    return (rng.standard_normal(len(t)) * 0.3 * envelope).astype(np.float32), sample_rate
+
+
+class TestCompression:
+    """Test cases for the dynamics compressor."""
+
+    @pytest.mark.unit
+    def test_static_curve_matches_reference(self, speech_like_audio):
+        """Test that the vectorized curve equals the per-sample reference."""
+        audio, _ = speech_like_audio
+        threshold_linear = 10 ** (-20.0 / 20)
+        expected = audio.copy()
+        for i in range(len(expected)):
+            sample_abs = abs(expected[i])
+            if sample_abs > threshold_linear:
+                expected[i] = (threshold_linear + (sample_abs - threshold_linear) / 2.0) * np.sign(expected[i])
+
+        compressed = AudioEnhancer()._apply_compression(audio, ratio=2.0, threshold=-20.0)
+        np.testing.assert_allclose(compressed, expected, rtol=1e-6)
+        assert compressed.dtype == audio.dtype
+
+    @pytest.mark.unit
+    def test_envelope_mode_reduces_loud_passages(self, speech_like_audio):
+        """Test that envelope mode attenuates loud sections and leaves quiet ones alone."""
+        audio, sample_rate = speech_like_audio
+        settings = AudioProcessingSettings(compressor_attack_ms=5.0, compressor_release_ms=50.0)
+        compressed = AudioEnhancer(settings)._apply_compression(
+            audio, ratio=4.0, threshold=-20.0, sample_rate=sample_rate, mode=CompressorMode.ENVELOPE
+        )
+
+        assert compressed.shape == audio.shape
+        loud = slice(int(0.4 * sample_rate), int(0.6 * sample_rate))
+        quiet = slice(int(1.45 * sample_rate), int(1.55 * sample_rate))
+        assert np.abs(compressed[loud]).max() < np.abs(audio[loud]).max()
+        np.testing.assert_allclose(compressed[quiet], audio[quiet], rtol=1e-3, atol=1e-6)
+
+    @pytest.mark.slow
+    @pytest.mark.parametrize("mode", [CompressorMode.STATIC, CompressorMode.ENVELOPE])
+    def test_compression_benchmark(self, mode):
+        """Benchmark: compressing a minute of 48 kHz audio must run far faster than real time."""
+        sample_rate = 48000
+        audio = np.random.default_rng(1).standard_normal(60 * sample_rate).astype(np.float32) * 0.2
+        enhancer = AudioEnhancer()
+
+        start = time.perf_counter()
+        enhancer._apply_compression(audio, sample_rate=sample_rate, mode=mode)
+        elapsed = time.perf_counter() - start
+
+        assert 60.0 / elapsed > 100
+
+
+class TestFilterChain:
+    """Test cases for the cascaded enhancement filter."""
+
+    @pytest.mark.unit
+    def test_deemphasis_matches_reference(self, speech_like_audio):
+        """Test that the chain's de-emphasis section equals the one-pole recursion."""
+        audio, sample_rate = speech_like_audio
+        audio = audio[:4000].astype(np.float64)
+        alpha = np.exp(-1 / (sample_rate * 75e-6))
+        expected = np.zeros_like(audio)
+        previous = 0.0
+        for i in range(len(audio)):
+            expected[i] = previous = alpha * previous + (1 - alpha) * audio[i]
+
+        deemphasis = design_enhancement_sos(sample_rate, True)[-1:]
+        np.testing.assert_allclose(SOSFilterChain(deemphasis).process(audio), expected, atol=1e-12)
+
+    @pytest.mark.unit
+    def test_block_processing_matches_single_pass(self, speech_like_audio):
+        """Test that carrying filter state across blocks gives the same output as one pass."""
+        audio, _ = speech_like_audio
+        sample_rate = 48000
+        enhancer = AudioEnhancer(AudioProcessingSettings(quality=ProcessingQuality.HIGH_QUALITY))
+
+        whole = enhancer.create_filter_chain(sample_rate).process(audio)
+        chain = enhancer.create_filter_chain(sample_rate)
+        blocks = np.concatenate([chain.process(block) for block in np.array_split(audio, 7)])
+
+        np.testing.assert_allclose(blocks, whole, rtol=1e-10, atol=1e-12)
+        assert chain.sos.shape[0] == 4  # high-pass, two low-pass sections, de-emphasis
+
+    @pytest.mark.unit
+    def test_coefficients_are_cached(self):
+        """Test that filter designs are reused per sample rate."""
+        assert design_enhancement_sos(44100, True) is design_enhancement_sos(44100, True)
+        assert design_enhancement_sos(44100, False).shape[0] == 3
+
+
+def _reference_speech_segments(audio_data, sample_rate, threshold_db, min_duration):
+    """The original per-frame loop, kept as an oracle."""
+    threshold_linear = 10 ** (threshold_db / 20)
+    frame_size = int(0.025 * sample_rate)
+    hop_size = int(0.010 * sample_rate)
+    frames = []
+    for i in range(0, len(audio_data) - frame_size, hop_size):
+        frames.append((i, np.sqrt(np.mean(audio_data[i : i + frame_size] ** 2)) > threshold_linear))
+
+    segments = []
+    current_start = None
+    for frame_start, is_speech in frames:
+        if is_speech and current_start is None:
+            current_start = frame_start
+        elif not is_speech and current_start is not None:
+            if (frame_start - current_start) / sample_rate >= min_duration:
+                segments.append((current_start, frame_start))
+            current_start = None
+    if current_start is not None and (len(audio_data) - current_start) / sample_rate >= min_duration:
+        segments.append((current_start, len(audio_data)))
+    return segments
+
+
+class TestSilenceRemoval:
+    """Test cases for frame-energy silence detection."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("min_duration", [0.0, 0.5])
+    def test_segments_match_reference(self, speech_like_audio, min_duration):
+        """Test that vectorized detection finds the same segments as the frame loop."""
+        audio, sample_rate = speech_like_audio
+        audio = audio * (np.arange(len(audio)) % sample_rate < 0.7 * sample_rate)
+
+        segments = AudioEnhancer().detect_speech_segments(audio, sample_rate, -30.0, min_duration)
+        assert [tuple(s) for s in segments] == _reference_speech_segments(audio, sample_rate, -30.0, min_duration)
+
+    @pytest.mark.unit
+    def test_remove_silence_returns_segments(self, speech_like_audio):
+        """Test that trimmed audio is the concatenation of the returned segments."""
+        audio, sample_rate = speech_like_audio
+        audio = audio * (np.arange(len(audio)) % sample_rate < 0.7 * sample_rate)
+
+        trimmed, removed, segments = AudioEnhancer()._remove_silence(audio, sample_rate, -30.0, 0.5)
+        assert len(segments) > 0
+        np.testing.assert_array_equal(trimmed, np.concatenate([audio[s:e] for s, e in segments]))
+        assert removed == pytest.approx((len(audio) - len(trimmed)) / sample_rate)
+
+    @pytest.mark.unit
+    def test_chunked_energy_matches_direct(self):
+        """Test that chunk boundaries do not change frame energies."""
+        audio = np.random.default_rng(2).standard_normal(50000)
+        rms = AudioEnhancer._frame_rms(audio, 400, 160, chunk_frames=7)
+        direct = [np.sqrt(np.mean(audio[i : i + 400] ** 2)) for i in range(0, len(audio) - 400, 160)]
+        np.testing.assert_allclose(rms, direct, rtol=1e-9)
+
+
+def _write_gated_wav(path, seconds, sample_rate=16000, seed=0):
+    """Write noise bursts (0.7 s on, 0.3 s off) as 16-bit PCM."""
+    num_samples = seconds * sample_rate
+    rng = np.random.default_rng(seed)
+    audio = rng.standard_normal(num_samples) * 0.3 * (np.arange(num_samples) % sample_rate < 0.7 * sample_rate)
+    wavfile.write(path, sample_rate, (audio * 32767).astype(np.int16))
+    return path
+
+
+class TestStreamingPipeline:
+    """Test cases for block-streaming enhancement."""
+
+    @pytest.mark.unit
+    def test_spectral_subtraction_matches_whole_signal(self, speech_like_audio):
+        """Test that streaming overlap-add reproduces the whole-signal STFT result."""
+        audio, sample_rate = speech_like_audio
+        expected, expected_db = AudioEnhancer()._spectral_subtraction(audio, sample_rate, 0.5)
+
+        subtractor = StreamingSpectralSubtractor(sample_rate, 0.5)
+        blocks = [subtractor.process(block) for block in np.array_split(audio, 37)]
+        streamed = np.concatenate(blocks + [subtractor.flush()])
+
+        assert len(streamed) == len(audio)
+        np.testing.assert_allclose(streamed, expected, atol=1e-6)
+        assert subtractor.noise_reduction_db == pytest.approx(expected_db, rel=1e-5)
+
+    @pytest.mark.unit
+    def test_envelope_compressor_is_block_size_independent(self, speech_like_audio):
+        """Test that feeding the compressor in odd-sized blocks gives the one-pass output."""
+        audio, sample_rate = speech_like_audio
+        whole = AudioEnhancer()._apply_envelope_compression(audio, sample_rate, 4.0, -20.0, 5.0, 50.0)
+
+        compressor = EnvelopeCompressor(sample_rate, 4.0, -20.0, 5.0, 50.0)
+        blocks = [compressor.process(block) for block in np.array_split(audio, 1001)]
+        np.testing.assert_array_equal(np.concatenate(blocks + [compressor.flush()]), whole)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("mode", [CompressorMode.STATIC, CompressorMode.ENVELOPE])
+    def test_streaming_matches_in_memory(self, tmp_path, mode):
+        """Test that streaming mode writes the same audio as whole-file processing."""
+        input_path = _write_gated_wav(str(tmp_path / "meeting.wav"), 12)
+        settings = dict(compressor_mode=mode, quality=ProcessingQuality.HIGH_QUALITY)
+
+        in_memory = AudioEnhancer(AudioProcessingSettings(streaming_min_duration=None, **settings))
+        streaming = AudioEnhancer(AudioProcessingSettings(streaming=True, stream_block_size=4999, **settings))
+        expected = in_memory.process_audio_file(input_path, str(tmp_path / "whole.wav"))
+        result = streaming.process_audio_file(input_path, str(tmp_path / "streamed.wav"))
+
+        assert result.success, result.error_message
+        np.testing.assert_array_equal(result.speech_segments, expected.speech_segments)
+        assert result.processed_duration == pytest.approx(expected.processed_duration)
+        assert result.rms_level_db == pytest.approx(expected.rms_level_db, abs=1e-3)
+        assert result.dynamic_range_db == pytest.approx(expected.dynamic_range_db, abs=0.05)
+
+        _, whole = wavfile.read(str(tmp_path / "whole.wav"))
+        _, streamed = wavfile.read(str(tmp_path / "streamed.wav"))
+        assert len(streamed) == len(whole)
+        assert np.abs(streamed.astype(np.int32) - whole).max() <= 1
+        assert streaming.temp_files == []
+
+    @pytest.mark.unit
+    def test_streaming_is_opt_in_and_opens_once(self, tmp_path, monkeypatch):
+        """Test that long recordings are not streamed by default and a streamed file is opened once."""
+        input_path = _write_gated_wav(str(tmp_path / "meeting.wav"), 3)
+        assert AudioEnhancer()._open_stream_if_streaming(input_path) is None
+
+        enhancer = AudioEnhancer(AudioProcessingSettings(streaming_min_duration=1.0))
+        opens = []
+        open_stream = enhancer._open_audio_stream
+        monkeypatch.setattr(enhancer, "_open_audio_stream", lambda *args: opens.append(args) or open_stream(*args))
+        assert enhancer.process_audio_file(input_path, str(tmp_path / "out.wav")).success
+        assert len(opens) == 1
+        assert enhancer.temp_files == []
+
+    @pytest.mark.slow
+    def test_streaming_memory_is_bounded(self, tmp_path):
+        """Test that peak memory does not grow with recording length."""
+        peaks = []
+        for seconds in (120, 480):
+            input_path = _write_gated_wav(str(tmp_path / f"{seconds}.wav"), seconds)
+            enhancer = AudioEnhancer(AudioProcessingSettings(streaming=True, stream_block_size=32768))
+
+            tracemalloc.start()
+            result = enhancer.process_audio_file(input_path, str(tmp_path / "out.wav"))
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            os.remove(input_path)
+            assert result.success
+
+        assert peaks[1] < 1.5 * peaks[0]
+
+
+class TestBatchProcessing:
+    """Test cases for parallel batch enhancement."""
+
+    @pytest.fixture
+    def batch_files(self, tmp_path):
+        return [_write_gated_wav(str(tmp_path / f"rec{i}.wav"), 3, seed=i) for i in range(3)]
+
+    @pytest.mark.unit
+    def test_parallel_results_keep_input_order(self, tmp_path, batch_files):
+        """Test that a process pool gives the serial results, in input order, with failures isolated."""
+        inputs = batch_files[:1] + [str(tmp_path / "missing.wav")] + batch_files[1:]
+        progress = []
+
+        parallel = AudioEnhancer().batch_process(
+            inputs, str(tmp_path), lambda percent, message: progress.append(percent), max_workers=2
+        )
+        serial = AudioEnhancer().batch_process(batch_files, str(tmp_path / ".."), max_workers=1)
+
+        assert [r.success for r in parallel] == [True, False, True, True]
+        assert [r.output_path for r in parallel if r.success] == [r.output_path.replace("/../", "/") for r in serial]
+        assert [r.processed_duration for r in parallel if r.success] == [r.processed_duration for r in serial]
+        assert progress[-1] == 100
+        assert len(progress) > len(inputs)
+
+    @pytest.mark.unit
+    @pytest.mark.skipif(
+        multiprocessing.get_start_method() != "fork", reason="workers must inherit the patched enhancer"
+    )
+    def test_dead_worker_fails_only_its_file(self, tmp_path, batch_files, monkeypatch):
+        """Test that a worker process dying fails its own file and the batch continues in a new pool."""
+        process_audio_file = AudioEnhancer.process_audio_file
+
+        def crash_on_marked_file(enhancer, input_path, *args):
+            if "crash" in input_path:
+                os._exit(1)
+            return process_audio_file(enhancer, input_path, *args)
+
+        monkeypatch.setattr(AudioEnhancer, "process_audio_file", crash_on_marked_file)
+        crashing = _write_gated_wav(str(tmp_path / "crash.wav"), 3)
+        inputs = batch_files[:1] + [crashing] + batch_files[1:]
+
+        results = AudioEnhancer().batch_process(inputs, str(tmp_path), max_workers=2)
+
+        assert [r.success for r in results] == [True, False, True, True]
+        assert "died" in results[1].error_message
+
+    @pytest.mark.unit
+    def test_cancelled_batch_skips_files(self, tmp_path, batch_files):
+        """Test that files not yet started are reported as cancelled."""
+        cancel_event = threading.Event()
+        cancel_event.set()
+
+        results = AudioEnhancer().batch_process(batch_files, str(tmp_path), max_workers=2, cancel_event=cancel_event)
+
+        assert [r.error_message for r in results] == ["Cancelled"] * len(batch_files)
+        assert not list(tmp_path.glob("*_enhanced.wav"))
+
+
+class TestAnalysis:
+    """Test cases for single-pass audio analysis."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("length", [700, 16000 * 10])
+    def test_matches_sort_and_welch(self, speech_like_audio, length):
+        """Test that the block analysis reproduces the sort/welch reference."""
+        audio, sample_rate = speech_like_audio
+        audio = audio[:length]
+        magnitude = np.sort(np.abs(audio))
+        freqs, psd = signal.welch(audio, sample_rate, nperseg=min(1024, length))
+
+        analysis = AudioEnhancer()._analyze_audio(audio, sample_rate, block_size=3001)
+
+        assert analysis["peak_level_db"] == pytest.approx(20 * np.log10(magnitude[-1]), abs=1e-5)
+        assert analysis["rms_level_db"] == pytest.approx(20 * np.log10(np.sqrt(np.mean(audio**2))), abs=1e-4)
+        expected_range = 20 * np.log10(magnitude[int(0.95 * length)] / magnitude[int(0.10 * length)])
+        assert analysis["dynamic_range_db"] == pytest.approx(expected_range, abs=0.011)
+        assert analysis["spectral_centroid"] == pytest.approx(np.sum(freqs * psd) / np.sum(psd), rel=1e-5)
+        assert analysis["duration"] == length / sample_rate
+
+    @pytest.mark.unit
+    def test_file_analysis_is_cached_per_version(self, tmp_path):
+        """Test that repeated analysis of an unchanged file reuses the result."""
+        path = _write_gated_wav(str(tmp_path / "rec.wav"), 2)
+        first = get_audio_analysis(path, use_cache=False)
+        first["duration"] = -1
+        assert get_audio_analysis(path, use_cache=False)["duration"] == 2.0
+
+        _write_gated_wav(path, 3)
+        os.utime(path, ns=(0, 10**9))
+        assert get_audio_analysis(path, use_cache=False)["duration"] == 3.0
+
+    @pytest.mark.slow
+    def test_analysis_benchmark(self):
+        """Benchmark: ten minutes of 16 kHz audio in well under a second."""
+        audio = np.random.default_rng(3).standard_normal(600 * 16000).astype(np.float32) * 0.1
+        analyzer = AudioAnalyzer(16000)
+
+        start = time.perf_counter()
+        for block in np.array_split(audio, 40):
+            analyzer.update(block)
+        analyzer.result()
+        assert time.perf_counter() - start < 1.0
+
+
+class TestSpectralFrames:
+    """Test cases for the shared STFT frame layer."""
+
+    @pytest.mark.unit
+    def test_frames_match_scipy_stft(self, speech_like_audio):
+        """Test that frames use the scipy.signal.stft layout and invert exactly."""
+        audio, sample_rate = speech_like_audio
+        audio = audio[:20001]
+        _, _, reference = signal.stft(audio, sample_rate, nperseg=1024, noverlap=768)
+
+        frames = SpectralFrames.from_signal(audio, sample_rate)
+
+        assert frames.spectra.dtype == np.complex64
+        # scipy scales spectra by the window sum (512 for a 1024-point Hann window)
+        np.testing.assert_allclose(frames.spectra.T / 512, reference, atol=1e-6)
+        np.testing.assert_allclose(frames.to_signal(), audio, atol=1e-6)
+
+    @pytest.mark.unit
+    def test_spectral_subtraction_matches_stft_reference(self, speech_like_audio):
+        """Test that the gain-mask subtraction equals the original magnitude/phase version."""
+        audio, sample_rate = speech_like_audio
+        _, _, stft_data = signal.stft(audio, sample_rate, nperseg=1024, noverlap=768)
+        noise_frames = int(0.5 * sample_rate / 256)
+        noise_spectrum = np.mean(np.abs(stft_data[:, :noise_frames]), axis=1, keepdims=True)
+        magnitude = np.abs(stft_data)
+        enhanced = np.maximum(magnitude - 1.0 * noise_spectrum, 0.1 * magnitude)
+        _, expected = signal.istft(enhanced * np.exp(1j * np.angle(stft_data)), sample_rate, nperseg=1024, noverlap=768)
+
+        reduced, _ = AudioEnhancer()._spectral_subtraction(audio, sample_rate, 0.5)
+        np.testing.assert_allclose(reduced, expected[: len(audio)], atol=1e-6)
+
+
+class TestPrecisionPolicy:
+    """Test cases for the float32/float64 precision policy."""
+
+    @pytest.mark.unit
+    def test_float32_stages_stay_float32(self, speech_like_audio):
+        """Test that no stage promotes float32 samples."""
+        audio, sample_rate = speech_like_audio
+        enhancer = AudioEnhancer(AudioProcessingSettings(quality=ProcessingQuality.HIGH_QUALITY))
+
+        reduced, _ = enhancer._reduce_noise(audio, sample_rate, 0.5)
+        trimmed, _, _ = enhancer._remove_silence(reduced, sample_rate)
+        enhanced = enhancer._enhance_audio_quality(trimmed, sample_rate)
+        normalized = enhancer._normalize_audio(enhanced)
+
+        assert [a.dtype for a in (reduced, trimmed, enhanced, normalized)] == [np.float32] * 4
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("mode", [CompressorMode.STATIC, CompressorMode.ENVELOPE])
+    def test_float32_output_matches_float64(self, tmp_path, mode):
+        """Test that float32 processing stays within a couple of LSB of float64 processing."""
+        input_path = _write_gated_wav(str(tmp_path / "in.wav"), 6, sample_rate=48000)
+        outputs = []
+        for precision in SamplePrecision:
+            enhancer = AudioEnhancer(
+                AudioProcessingSettings(
+                    precision=precision,
+                    compressor_mode=mode,
+                    quality=ProcessingQuality.HIGH_QUALITY,
+                    streaming_min_duration=None,
+                )
+            )
+            result = enhancer.process_audio_file(input_path, str(tmp_path / f"{precision.value}.wav"))
+            assert result.success
+            assert enhancer.precision_fixups == []
+            outputs.append(wavfile.read(result.output_path)[1].astype(np.int32))
+
+        assert len(outputs[0]) == len(outputs[1])
+        assert np.abs(outputs[0] - outputs[1]).max() <= 3
+
+
+def _noise(seconds, sample_rate=16000, seed=0):
+    """Lowpass-coloured background noise, like a room heard through the device."""
+    rng = np.random.default_rng(seed)
+    sos = signal.butter(2, 2000, fs=sample_rate, output="sos")
+    return (signal.sosfilt(sos, rng.standard_normal(int(seconds * sample_rate))) * 0.05).astype(np.float32)
+
+
+class TestNoiseProfiles:
+    """Test cases for stored per-device noise profiles."""
+
+    @pytest.mark.unit
+    def test_learn_merges_into_stored_profile(self, tmp_path):
+        """Test that learning twice merges both recordings and updates the fingerprint."""
+        store = NoiseProfileStore(str(tmp_path))
+        first = store.learn("HD1-001", "office", _noise(2, seed=1), 16000)
+        fingerprint = store.fingerprint("HD1-001", "office")
+        second = store.learn("HD1-001", "office", _noise(2, seed=2), 16000)
+
+        stored = store.get("HD1-001", "office", 16000)
+        assert stored.frame_count == 2 * first.frame_count == second.frame_count
+        assert stored.spectrum.dtype == np.float32 and stored.spectrum.shape == (513,)
+        np.testing.assert_allclose(stored.spectrum, second.spectrum, rtol=1e-6)
+        assert store.fingerprint("HD1-001", "office") != fingerprint
+        assert store.get("HD1-001", "car", 16000) is None
+
+    @pytest.mark.unit
+    def test_profile_handles_recordings_that_start_with_speech(self, tmp_path):
+        """Test that a stored profile keeps speech the first-half-second estimate would subtract."""
+        sample_rate = 16000
+        store = NoiseProfileStore(str(tmp_path))
+        store.learn("HD1-001", "default", _noise(5, seed=1), sample_rate)
+
+        t = np.arange(6 * sample_rate) / sample_rate
+        speech = 0.1 * np.sin(2 * np.pi * 220 * t) * (1 + np.sin(2 * np.pi * 3 * t)) * ((t < 2) | (t > 4))
+        speech = speech.astype(np.float32)
+        audio = _noise(6, seed=2) + speech
+
+        errors = []
+        for device in (None, "HD1-001"):
+            enhancer = AudioEnhancer(AudioProcessingSettings(noise_profile_device=device), store)
+            reduced, _ = enhancer._reduce_noise(audio, sample_rate, 0.8)
+            errors.append(np.sqrt(np.mean((reduced - speech) ** 2)))
+
+        assert errors[1] < 0.25 * errors[0]
+
+    @pytest.mark.unit
+    def test_streaming_subtractor_uses_profile(self, tmp_path, speech_like_audio):
+        """Test that the streaming subtractor matches in-memory processing with a given profile."""
+        audio, sample_rate = speech_like_audio
+        profile = NoiseProfileStore(str(tmp_path)).learn("HD1-001", "default", _noise(2), sample_rate)
+        expected, expected_db = AudioEnhancer()._spectral_subtraction(
+            audio, sample_rate, 0.5, noise_spectrum=profile.spectrum
+        )
+
+        subtractor = StreamingSpectralSubtractor(sample_rate, 0.5, noise_spectrum=profile.spectrum)
+        blocks = [subtractor.process(block) for block in np.array_split(audio, 37)]
+        streamed = np.concatenate(blocks + [subtractor.flush()])
+
+        np.testing.assert_allclose(streamed, expected, atol=1e-6)
+        assert subtractor.noise_reduction_db == pytest.approx(expected_db, rel=1e-5)
@@ -0,0 +1,56 @@
+"""
+Tests for the streaming polyphase resampler.
+"""
+
+import numpy as np
+import pytest
+from scipy import signal
+from scipy.io import wavfile
+
+from audio_processing_advanced import AudioEnhancer
+from audio_resampler import PolyphaseResampler, rational_ratio, resample
+
+
+class TestPolyphaseResampler:
+    """Test cases for PolyphaseResampler and file conversion."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("rates", [(16000, 48000), (44100, 48000), (48000, 44100), (48000, 16000), (24000, 44100)])
+    def test_blocks_match_resample_poly(self, rates):
+        """Test that feeding odd-sized blocks reproduces resample_poly on the whole signal."""
+        from_rate, to_rate = rates
+        rng = np.random.default_rng(0)
+        audio = rng.standard_normal(30000).astype(np.float32)
+
+        resampler = PolyphaseResampler(from_rate, to_rate)
+        blocks = [resampler.process(block) for block in np.array_split(audio, rng.integers(1, 2000, 40).cumsum())]
+        streamed = np.concatenate(blocks + [resampler.flush()])
+
+        expected = signal.resample_poly(audio, to_rate, from_rate)
+        assert streamed.shape == expected.shape
+        np.testing.assert_allclose(streamed, expected, atol=2e-6)
+
+    @pytest.mark.unit
+    def test_multichannel_and_ratios(self):
+        """Test channel-wise resampling and ratio reduction."""
+        audio = np.random.default_rng(1).standard_normal((5000, 2)).astype(np.float32)
+        stereo = resample(audio, 44100, 48000, block_size=777)
+        np.testing.assert_allclose(stereo, signal.resample_poly(audio, 160, 147, axis=0), atol=2e-6)
+
+        assert rational_ratio(44100, 48000) == (160, 147)
+        assert rational_ratio(48000 * 1.25, 44100) == (147, 200)
+        assert max(rational_ratio(44100 * 1.37, 48000)) <= 640
+
+    @pytest.mark.unit
+    def test_convert_format_streams_wav(self, temp_dir):
+        """Test that WAV conversion resamples stereo input and keeps both channels."""
+        t = np.arange(48000) / 48000
+        tone = np.stack([np.sin(2 * np.pi * 440 * t), np.sin(2 * np.pi * 880 * t)], axis=1) * 0.5
+        wavfile.write(str(temp_dir / "in.wav"), 48000, (tone * 32767).astype(np.int16))
+
+        assert AudioEnhancer().convert_format(str(temp_dir / "in.wav"), str(temp_dir / "out.wav"), "wav", 16000)
+
+        sample_rate, converted = wavfile.read(str(temp_dir / "out.wav"))
+        assert sample_rate == 16000 and converted.shape == (16000, 2)
+        spectrum = np.abs(np.fft.rfft(converted[:, 1].astype(np.float64)))
+        assert np.argmax(spectrum) == 880
@@ -0,0 +1,77 @@
+"""
+Tests for random-access device files.
+"""
+
+import io
+import os
+import random
+
+import pytest
+
+from audio_probe import probe_audio_file
+from device_file import DeviceFile, open_device_file
+
+
+class FakeDevice:
+    """Serves get_file_block from a byte string and records the requests"""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.requests = []
+
+    def get_file_block(self, filename, offset, length, timeout_s=5):
+        self.requests.append((offset, length))
+        return self.data[offset : offset + length]
+
+
+def _mpeg_frame(bitrate_index):
+    """MPEG-2 Layer II mono 16 kHz frame, as recorded by the H1E"""
+    header = bytes([0xFF, 0xF5, (bitrate_index << 4) | (2 << 2), 0xC0])
+    return header + bytes(144 * [0, 8, 16, 24, 32, 40, 48, 56, 64][bitrate_index] * 1000 // 16000 - 4)
+
+
+class TestDeviceFile:
+    @pytest.mark.unit
+    def test_random_reads_match_data(self):
+        data = os.urandom(300000)
+        device_file = DeviceFile(FakeDevice(data), "REC.hda", len(data), block_size=4096, cache_blocks=8)
+        rng = random.Random(3)
+        for _ in range(200):
+            offset = rng.randrange(len(data) + 100)
+            length = rng.randrange(20000)
+            device_file.seek(offset)
+            assert device_file.read(length) == data[offset : offset + length]
+        assert len(device_file._blocks) <= 8
+
+    @pytest.mark.unit
+    def test_sequential_reads_grow_read_ahead(self):
+        data = os.urandom(64 * 4096)
+        device = FakeDevice(data)
+        device_file = DeviceFile(device, "REC.hda", len(data), block_size=4096)
+        assert device_file.read() == data
+        # The window doubles to 8 blocks: 1 + 2 + 4 + 8 * 7 blocks
+        assert device_file.stats.requests == 10
+        assert device_file.stats.bytes_fetched == len(data)
+
+    @pytest.mark.unit
+    def test_cached_blocks_are_not_fetched_again(self):
+        data = os.urandom(10 * 4096)
+        device = FakeDevice(data)
+        device_file = DeviceFile(device, "REC.hda", len(data), block_size=4096)
+        device_file.seek(20000)
+        device_file.read(100)
+        device_file.seek(20050)
+        device_file.read(100)
+        assert device.requests == [(16384, 4096)]
+        assert device_file.stats.hits == 1
+
+    @pytest.mark.unit
+    def test_probe_reads_only_headers(self):
+        data = (_mpeg_frame(8) + _mpeg_frame(4)) * 5000
+        device = FakeDevice(data)
+        with open_device_file(device, "REC.hda", len(data)) as recording_file:
+            assert isinstance(recording_file, io.BufferedReader)
+            info = probe_audio_file(recording_file, len(data))
+        assert info.duration == pytest.approx(10000 * 1152 / 16000)
+        # Variable bitrate walks every frame header, which read-ahead keeps to few requests
+        assert len(device.requests) < len(data) // 4096
@@ -0,0 +1,65 @@
+"""
+Tests for cached HTA conversion.
+"""
+
+import os
+import threading
+
+import numpy as np
+import pytest
+from scipy.io import wavfile
+
+from hta_converter import HTAConverter
+from result_cache import ResultCache
+
+
+@pytest.fixture
+def converter(temp_dir):
+    return HTAConverter(ResultCache(str(temp_dir / "cache")))
+
+
+def _recording(path, seed):
+    """A WAV recording stored under an .hta name, which the converter accepts as is"""
+    samples = np.random.default_rng(seed).standard_normal(8000) * 3000
+    wavfile.write(str(path), 8000, samples.astype(np.int16))
+    return str(path)
+
+
+class TestHTAConverterCache:
+    @pytest.mark.unit
+    def test_recording_is_converted_once(self, converter, temp_dir, monkeypatch):
+        hta_path = _recording(temp_dir / "REC001.hta", 0)
+        parses = []
+        parse = converter._parse_hta_file
+        monkeypatch.setattr(converter, "_parse_hta_file", lambda path: parses.append(path) or parse(path))
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(converter.convert_hta_to_wav(hta_path))) for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(parses) == 1
+        assert len(set(results)) == 1
+        assert converter.cache.owns_file(results[0])
+        assert converter.get_converted_file_path(hta_path) == results[0]
+
+        # Cleaning up after one feature leaves the conversion for the next
+        converter.cleanup_converted_file(results[0])
+        assert os.path.exists(results[0])
+
+        output_path = str(temp_dir / "copy.wav")
+        assert converter.convert_hta_to_wav(hta_path, output_path) == output_path
+        assert len(parses) == 1
+
+    @pytest.mark.unit
+    def test_same_name_from_different_devices(self, converter, temp_dir):
+        first = _recording(temp_dir / "REC001.hta", 0)
+        os.makedirs(temp_dir / "other")
+        second = _recording(temp_dir / "other" / "REC001.hta", 1)
+
+        assert converter.convert_hta_to_wav(first) != converter.convert_hta_to_wav(second)
+        assert wavfile.read(converter.convert_hta_to_wav(second))[1][0] == wavfile.read(second)[1][0]
@@ -0,0 +1,206 @@
+"""
+Tests for the playback clock, coalesced position notifications and the
+timeline that moves playback between segments and tracks.
+"""
+
+import os
+import time
+
+import numpy as np
+import pygame
+import pytest
+from scipy.io import wavfile
+
+import audio_player_enhanced
+from audio_player_enhanced import EnhancedAudioPlayer, PlaybackClock, PlaybackState, RepeatMode
+from result_cache import ResultCache
+from speed_renditions import SpeedRenditionCache
+
+
+class FakeMusic:
+    """Stands in for pygame.mixer.music; the test decides when it is busy"""
+
+    def __init__(self):
+        self.loaded = None
+        self.queued = []
+        self.plays = []
+        self.busy = False
+
+    def load(self, source, namehint=""):
+        self.loaded = source
+
+    def queue(self, source, namehint=""):
+        self.queued.append(source)
+
+    def play(self, start=0.0):
+        self.plays.append((self.loaded, start))
+        self.busy = True
+
+    def stop(self):
+        self.busy = False
+
+    def get_busy(self):
+        return self.busy
+
+    def pause(self):
+        pass
+
+    def unpause(self):
+        pass
+
+    def set_volume(self, volume):
+        pass
+
+
+@pytest.fixture
+def timeline(monkeypatch, temp_dir):
+    """A player on a fake mixer and clock, with the position worker left to the test"""
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    music = FakeMusic()
+    monkeypatch.setattr(pygame.mixer, "music", music)
+    monkeypatch.setattr(pygame.mixer, "get_init", lambda: True)
+    accesses = []
+    monkeypatch.setattr(audio_player_enhanced, "record_file_access", lambda path, kind: accesses.append(path))
+
+    player = EnhancedAudioPlayer()
+    monkeypatch.setattr(player, "_start_position_thread", lambda: None)
+    player.speed_renditions = SpeedRenditionCache(ResultCache(str(temp_dir / "cache")))
+    tracks = []
+    for name, seconds in (("first.wav", 10), ("second.wav", 5)):
+        path = temp_dir / name
+        wavfile.write(str(path), 8000, np.zeros(8000 * seconds, dtype=np.int16))
+        tracks.append(str(path))
+    yield player, music, now, tracks, accesses
+    player.preloader.shutdown()
+    player.speed_renditions.shutdown()
+
+
+class TestPlaybackClock:
+    @pytest.mark.unit
+    def test_position_follows_speed(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(time, "monotonic", lambda: now[0])
+        clock = PlaybackClock()
+        clock.set_position(10.0)
+        clock.start()
+        now[0] += 2.0
+        assert clock.position == pytest.approx(12.0)
+
+        clock.set_speed(1.5)
+        now[0] += 2.0
+        assert clock.position == pytest.approx(15.0)
+        assert clock.time_until(18.0) == pytest.approx(2.0)
+
+        clock.stop()
+        now[0] += 5.0
+        assert clock.position == pytest.approx(15.0)
+        assert clock.time_until(18.0) == float("inf")
+
+
+class TestPositionListeners:
+    @pytest.mark.unit
+    def test_listeners_are_called_at_their_interval(self, monkeypatch):
+        now = [0.0]
+        monkeypatch.setattr(time, "monotonic", lambda: now[0])
+        player = EnhancedAudioPlayer()
+        fast, slow = [], []
+        player.add_position_listener(fast.append, interval=0.125)
+        player.add_position_listener(slow.append, interval=1.0)
+
+        for _ in range(16):
+            wait = player._notify_due_position_listeners()
+            assert 0 < wait <= 0.125
+            now[0] += 0.125
+        assert len(fast) == 16
+        assert len(slow) == 2
+
+        player.remove_position_listener(fast.append)
+        player.remove_position_listener(slow.append)
+        assert player._notify_due_position_listeners() == float("inf")
+
+
+class TestTimeline:
+    @pytest.mark.unit
+    def test_queued_track_keeps_time_already_played(self, timeline):
+        player, music, now, tracks, accesses = timeline
+        changed = []
+        player.on_track_changed = changed.append
+        player.load_playlist(tracks)
+        assert player.play()
+        player.preloader.preload(tracks[1]).result()
+
+        # The next track is queued QUEUE_AHEAD_SECONDS before the end
+        now[0] += 7.5
+        player._advance_timeline()
+        assert len(music.queued) == 1
+        assert player._queued_track.filepath == tracks[1]
+
+        # The mixer moved on by itself; the timeline follows with the overshoot
+        now[0] += 3.0
+        assert player._advance_timeline() == 0.0
+        assert player.playlist.get_current_track().filepath == tracks[1]
+        assert player.current_position == pytest.approx(0.5)
+        assert changed[-1].filepath == tracks[1]
+        assert accesses == tracks
+        assert len(music.plays) == 1
+
+    @pytest.mark.unit
+    def test_repeat_one_requeues_the_track(self, timeline):
+        player, music, now, tracks, accesses = timeline
+        changed = []
+        player.load_playlist(tracks[:1])
+        player.set_repeat_mode(RepeatMode.ONE)
+        player.on_track_changed = changed.append
+        assert player.play()
+        player.preloader.preload(tracks[0]).result()
+
+        now[0] += 8.0
+        player._advance_timeline()
+        now[0] += 2.25
+        player._advance_timeline()
+
+        assert len(music.queued) == 1
+        assert player.playlist.get_current_track().filepath == tracks[0]
+        assert player.current_position == pytest.approx(0.25)
+        assert changed == []
+        assert accesses == [tracks[0], tracks[0]]
+        assert player.state == PlaybackState.PLAYING
+
+    @pytest.mark.unit
+    def test_end_of_playlist_stops(self, timeline):
+        player, music, now, tracks, _ = timeline
+        player.load_playlist(tracks[1:])
+        assert player.play()
+
+        now[0] += 4.0
+        assert player._advance_timeline() == pytest.approx(0.25)  # Nothing to queue
+        assert music.queued == []
+
+        # The mixer may finish its last buffers slightly after the timeline
+        now[0] += 1.2
+        assert player._advance_timeline() == pytest.approx(0.05)
+        music.busy = False
+        assert player._advance_timeline() is None
+        assert player.state == PlaybackState.STOPPED
+        assert player.current_position == 0.0
+
+    @pytest.mark.unit
+    def test_mixer_idle_mid_segment_restarts_from_position(self, timeline):
+        player, music, now, tracks, _ = timeline
+        player.load_playlist(tracks[:1])
+        player.set_playback_speed(1.5)
+        assert player.play()
+        first_stream = player._segment_stream
+        assert first_stream is not None and player._queued_segment is not None
+
+        # The mixer ran dry before the queued segment started
+        now[0] += 2.0
+        music.busy = False
+        assert player._advance_timeline() == 0.0
+
+        assert player._segment_stream is not first_stream
+        assert player._segment_stream.start_time == pytest.approx(3.0)
+        assert music.plays[-1] == (os.path.join(player._segment_stream._temp_dir, "segment0.wav"), 0.0)
+        assert music.busy and player.state == PlaybackState.PLAYING
+        player.stop()
@@ -0,0 +1,133 @@
+"""
+Tests for progressive downloads read while they arrive.
+"""
+
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+from scipy.io import wavfile
+
+from audio_player_enhanced import EnhancedAudioPlayer
+from progressive_download import RANGE_BLOCK_SIZE, ProgressiveDownload
+
+
+class FakeDevice:
+    """Streams a byte string slowly and serves get_file_block ranges"""
+
+    def __init__(self, data: bytes, chunk_size: int = 4096, chunk_delay: float = 0.002):
+        self.data = data
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.block_requests = []
+
+    def stream_file(self, filename, file_length, data_callback, progress_callback=None, cancel_event=None):
+        for offset in range(0, file_length, self.chunk_size):
+            if cancel_event and cancel_event.is_set():
+                return "cancelled"
+            time.sleep(self.chunk_delay)
+            data_callback(self.data[offset : offset + self.chunk_size])
+        return "OK"
+
+    def get_file_block(self, filename, offset, length, timeout_s=5):
+        self.block_requests.append(offset)
+        return self.data[offset : offset + length]
+
+
+@pytest.fixture
+def payload():
+    return os.urandom(RANGE_BLOCK_SIZE * 40 + 123)
+
+
+def _download(device, payload, temp_dir):
+    download = ProgressiveDownload(device, "REC001.wav", len(payload), str(temp_dir / "REC001.wav"))
+    done = threading.Event()
+    download.on_complete = lambda _: done.set()
+    download.start()
+    return download, done
+
+
+class TestProgressiveDownload:
+    def test_reads_while_streaming(self, payload, temp_dir):
+        device = FakeDevice(payload)
+        download, done = _download(device, payload, temp_dir)
+
+        reader = download.open()
+        assert reader.read(5000) == payload[:5000]
+        assert not download.is_complete
+        assert reader.read() == payload[5000:]
+        reader.close()
+
+        assert done.wait(10)
+        assert download.error is None
+        assert download.path == str(temp_dir / "REC001.wav")
+        with open(download.path, "rb") as f:
+            assert f.read() == payload
+        assert not os.path.exists(download.part_path)
+
+    def test_seek_past_stream_fetches_ranges(self, payload, temp_dir):
+        device = FakeDevice(payload, chunk_delay=0.01)
+        download, done = _download(device, payload, temp_dir)
+
+        reader = download.open()
+        target = len(payload) // 2
+        reader.seek(target)
+        start = time.monotonic()
+        assert reader.read(1000) == payload[target : target + 1000]
+        assert time.monotonic() - start < 1.0
+        assert target in device.block_requests
+
+        assert done.wait(10)
+        reader.seek(0)
+        assert reader.read() == payload
+        reader.close()
+        with open(download.path, "rb") as f:
+            assert f.read() == payload
+
+    def test_cancel_removes_part_file(self, payload, temp_dir):
+        device = FakeDevice(payload, chunk_delay=0.01)
+        download, done = _download(device, payload, temp_dir)
+        download.cancel()
+
+        assert done.wait(10)
+        assert download.error
+        assert not os.path.exists(download.part_path)
+        assert not os.path.exists(download.output_path)
+
+    def test_completion_waits_for_deferred_rename(self, payload, temp_dir, monkeypatch):
+        rename = os.replace
+
+        def replace_unless_open(source, destination):
+            # Windows refuses to rename a file that is open
+            if download._readers:
+                raise PermissionError("File is in use")
+            rename(source, destination)
+
+        monkeypatch.setattr(os, "replace", replace_unless_open)
+        download, done = _download(FakeDevice(payload), payload, temp_dir)
+        reader = download.open()
+        assert reader.read() == payload
+        download._thread.join(10)
+
+        assert not done.is_set()
+        assert download.path == download.part_path
+        reader.close()
+        assert done.is_set()
+        with open(download.output_path, "rb") as f:
+            assert f.read() == payload
+
+    def test_new_track_cancels_previous_download(self, payload, temp_dir):
+        download, done = _download(FakeDevice(payload, chunk_delay=0.01), payload, temp_dir)
+        local_path = temp_dir / "local.wav"
+        wavfile.write(str(local_path), 8000, np.zeros(8000, dtype=np.int16))
+
+        player = EnhancedAudioPlayer()
+        player.load_track(download.part_path, download)
+        assert not download.cancelled
+        player.load_track(str(local_path))
+
+        assert download.cancelled
+        assert done.wait(10)
+        assert not os.path.exists(download.part_path)
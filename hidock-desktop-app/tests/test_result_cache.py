@@ -0,0 +1,125 @@
+"""
+Tests for the content-addressed result cache.
+"""
+
+import os
+
+import numpy as np
+import pytest
+from scipy.io import wavfile
+
+import audio_processing_advanced
+from audio_processing_advanced import (
+    AudioEnhancer,
+    AudioProcessingSettings,
+    ProcessingQuality,
+    _settings_cache_key,
+    enhance_audio_file,
+)
+from result_cache import ResultCache, canonical_json
+
+
+@pytest.fixture
+def cache(temp_dir):
+    return ResultCache(str(temp_dir / "cache"), max_bytes=10_000)
+
+
+@pytest.fixture
+def recording(temp_dir):
+    """Two seconds of noise bursts as 16-bit PCM."""
+    rng = np.random.default_rng(0)
+    audio = rng.standard_normal(32000) * 0.3 * (np.arange(32000) % 16000 < 11000)
+    path = temp_dir / "rec.wav"
+    wavfile.write(str(path), 16000, (audio * 32767).astype(np.int16))
+    return str(path)
+
+
+class TestResultCache:
+    """Test cases for ResultCache."""
+
+    @pytest.mark.unit
+    def test_files_are_evicted_least_recently_used_first(self, cache, temp_dir):
+        """Test that the byte budget evicts the entry that was read longest ago."""
+        for name in ("a", "b", "c"):
+            (temp_dir / name).write_bytes(b"x" * 4000)
+            cache.put_file(name, str(temp_dir / name), {"name": name})
+            if name == "b":
+                assert cache.get_file("a")[1] == {"name": "a"}
+
+        assert cache.get_file("b") is None
+        assert cache.get_file("a") is not None
+        assert cache.get_file("c") is not None
+        assert cache.total_bytes() == 8000
+        assert len(list((cache.cache_dir).glob("*/*"))) == 2
+
+    @pytest.mark.unit
+    def test_values_round_trip(self, cache):
+        """Test that JSON values, including infinities, come back unchanged."""
+        cache.put_value("k", {"peak_level_db": -np.inf, "duration": 2.0})
+        assert cache.get_value("k") == {"peak_level_db": -np.inf, "duration": 2.0}
+        assert cache.get_file("k") is None
+
+    @pytest.mark.unit
+    def test_keys_follow_content_and_settings(self, cache, recording, temp_dir):
+        """Test that copies share a key and settings are serialized canonically."""
+        copy = temp_dir / "copy.wav"
+        copy.write_bytes(open(recording, "rb").read())
+        assert cache.file_hash(str(copy)) == cache.file_hash(recording)
+
+        settings = AudioProcessingSettings(quality=ProcessingQuality.FAST)
+        assert canonical_json(settings) == canonical_json(AudioProcessingSettings(quality=ProcessingQuality.FAST))
+        assert '"quality":"fast"' in canonical_json(settings)
+
+
+class TestEnhancementCache:
+    """Test cases for cached enhancement results."""
+
+    @pytest.mark.unit
+    def test_repeat_enhancement_uses_cache(self, recording, temp_dir, monkeypatch):
+        """Test that a repeat run copies the cached output without processing."""
+        cache = ResultCache(str(temp_dir / "cache"))
+        first = enhance_audio_file(recording, str(temp_dir / "first.wav"), cache=cache)
+        assert first.success
+
+        def fail(*args, **kwargs):
+            raise AssertionError("processed again")
+
+        monkeypatch.setattr(AudioEnhancer, "process_audio_file", fail)
+        second = enhance_audio_file(recording, str(temp_dir / "second.wav"), cache=cache)
+
+        assert second.output_path == str(temp_dir / "second.wav")
+        assert second.processed_duration == first.processed_duration
+        np.testing.assert_array_equal(second.speech_segments, first.speech_segments)
+        with open(first.output_path, "rb") as a, open(second.output_path, "rb") as b:
+            assert a.read() == b.read()
+
+        # Different output-affecting settings miss the cache
+        with pytest.raises(AssertionError):
+            enhance_audio_file(
+                recording, str(temp_dir / "third.wav"), AudioProcessingSettings(target_lufs=-16.0), cache=cache
+            )
+
+    @pytest.mark.unit
+    def test_streaming_is_keyed_when_it_replaces_noisereduce(self, monkeypatch):
+        """Test that streaming changes the key when the in-memory path would use noisereduce."""
+        monkeypatch.setattr(audio_processing_advanced, "NOISEREDUCE_AVAILABLE", True)
+        assert _settings_cache_key(AudioProcessingSettings()) != _settings_cache_key(
+            AudioProcessingSettings(streaming=True)
+        )
+        assert _settings_cache_key(AudioProcessingSettings(noise_reduction_strength=0)) == _settings_cache_key(
+            AudioProcessingSettings(noise_reduction_strength=0, streaming=True)
+        )
+
+    @pytest.mark.unit
+    def test_streaming_settings_share_entries(self, recording, temp_dir, monkeypatch):
+        """Test that settings which only change how the pipeline runs reuse the entry."""
+        monkeypatch.setattr(audio_processing_advanced, "NOISEREDUCE_AVAILABLE", False)
+        cache = ResultCache(str(temp_dir / "cache"))
+        enhance_audio_file(recording, str(temp_dir / "first.wav"), cache=cache)
+        monkeypatch.setattr(AudioEnhancer, "process_audio_file", None)
+
+        result = enhance_audio_file(
+            recording, str(temp_dir / "second.wav"), AudioProcessingSettings(streaming=True), cache=cache
+        )
+        assert result.success
+        assert os.path.exists(result.output_path)
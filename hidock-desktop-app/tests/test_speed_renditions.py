@@ -0,0 +1,114 @@
+"""
+Tests for cached and streamed playback speed renditions.
+"""
+
+import threading
+
+import numpy as np
+import pytest
+from scipy.io import wavfile
+
+import speed_renditions
+from audio_loader import load_audio
+from audio_resampler import resample
+from result_cache import ResultCache
+from speed_renditions import PLAYBACK_RATE, SpeedRenditionCache, SpeedSegmentStream
+
+
+@pytest.fixture
+def recording(temp_dir):
+    path = temp_dir / "recording.wav"
+    rng = np.random.default_rng(7)
+    wavfile.write(str(path), 8000, (rng.standard_normal(8000 * 5) * 4000).astype(np.int16))
+    return str(path)
+
+
+class TestSpeedRenditions:
+    def test_segments_join_into_full_rendition(self, recording):
+        audio, sample_rate = load_audio(recording)
+        expected = resample(audio, sample_rate * 1.5, PLAYBACK_RATE)
+
+        stream = SpeedSegmentStream(recording, 1.5, segment_seconds=1.3)
+        segments = []
+        while True:
+            segment = stream.next_segment()
+            if segment is None:
+                break
+            segments.append((segment, load_audio(segment.path)[0]))
+        stream.close()
+
+        joined = np.concatenate([samples for _, samples in segments])
+        assert len(joined) == len(expected)
+        assert np.max(np.abs(joined - np.clip(expected, -1.0, 1.0))) < 2e-4
+
+        # Source ranges are contiguous and cover the recording
+        assert segments[0][0].source_start == 0.0
+        for (previous, _), (segment, _) in zip(segments, segments[1:]):
+            assert segment.source_start == pytest.approx(previous.source_end)
+        assert segments[-1][0].source_end == pytest.approx(5.0, abs=1e-3)
+
+    def test_stream_starts_at_position(self, recording):
+        stream = SpeedSegmentStream(recording, 2.0, start_time=4.0)
+        segment = stream.next_segment()
+        assert segment.source_start == 4.0
+        assert segment.source_end == pytest.approx(5.0, abs=1e-3)
+        assert stream.next_segment() is None
+        stream.close()
+
+    def test_render_is_cached(self, recording, temp_dir):
+        renditions = SpeedRenditionCache(ResultCache(str(temp_dir / "cache")))
+        assert renditions.get(recording, 0.75) is None
+
+        path = renditions.render_async(recording, 0.75).result()
+        assert renditions.get(recording, 0.75) == path
+        assert renditions.get(recording, 1.25) is None
+
+        samples, sample_rate = load_audio(path)
+        assert sample_rate == PLAYBACK_RATE
+        assert len(samples) / PLAYBACK_RATE == pytest.approx(5.0 / 0.75, abs=1e-3)
+        renditions.shutdown()
+
+    def test_new_speed_replaces_pending_render(self, recording, temp_dir):
+        renditions = SpeedRenditionCache(ResultCache(str(temp_dir / "cache")))
+        # Hold the worker so the first render is still queued when the speed changes
+        gate = threading.Event()
+        renditions._executor.submit(gate.wait)
+
+        abandoned = renditions.render_async(recording, 1.5)
+        assert renditions.render_async(recording, 1.5) is abandoned
+        latest = renditions.render_async(recording, 2.0)
+        gate.set()
+
+        assert latest.result() == renditions.get(recording, 2.0)
+        assert abandoned.cancelled()
+        assert renditions.get(recording, 1.5) is None
+
+        gate.clear()
+        renditions._executor.submit(gate.wait)
+        dropped = renditions.render_async(recording, 0.5)
+        renditions.cancel()
+        gate.set()
+        assert dropped.cancelled()
+
+        # A render already running stops at its next block
+        cancelled = threading.Event()
+        cancelled.set()
+        assert renditions.render(recording, 1.25, cancelled) is None
+        assert renditions.get(recording, 1.25) is None
+        renditions.shutdown()
+
+    def test_formats_without_block_reader_are_decoded_whole(self, temp_dir, monkeypatch):
+        path = temp_dir / "recording.m4a"
+        path.write_bytes(b"\0\0\0\x18ftypM4A \0\0\0\0M4A mp42" + bytes(4096))
+        decoded = []
+
+        def fake_load_audio(file_path, mono=True):
+            decoded.append(file_path)
+            return np.zeros(8000 * 2, dtype=np.float32), 8000
+
+        monkeypatch.setattr(speed_renditions, "load_audio", fake_load_audio)
+        stream = SpeedSegmentStream(str(path), 2.0, start_time=1.0)
+        segment = stream.next_segment()
+        stream.close()
+        assert decoded == [str(path)]
+        assert segment.source_end == pytest.approx(2.0, abs=1e-3)
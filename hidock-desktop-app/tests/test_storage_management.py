@@ -0,0 +1,308 @@
+"""
+Tests for storage management and optimization.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from storage_management import (
+    INOTIFY_AVAILABLE,
+    StorageMonitor,
+    StorageOptimizer,
+    StorageQuota,
+    StorageQuotaManager,
+    StorageUsageHistory,
+    record_file_access,
+    set_storage_cache_dir,
+)
+
+
+def _write(path, size):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"\0" * size)
+    return path
+
+
+@pytest.fixture
+def recordings_dir(temp_dir):
+    """A small recordings tree with nested folders."""
+    root = temp_dir / "recordings"
+    _write(root / "a.hda", 1000)
+    _write(root / "2024" / "b.hda", 2000)
+    _write(root / "2024" / "notes.txt", 10)
+    _write(root / "2024" / "jan" / "c.wav", 3000)
+    return root
+
+
+def _age_directories(root, seconds=3600):
+    """Push directory mtimes into the past so the scan index trusts them."""
+    past = os.stat(root).st_mtime - seconds
+    for dirpath, _, _ in os.walk(root):
+        os.utime(dirpath, (past, past))
+
+
+class TestStorageScanIndex:
+    """Test cases for the incremental scan index."""
+
+    @pytest.mark.unit
+    def test_analysis_matches_tree(self, temp_dir, recordings_dir):
+        """Test that totals and distributions reflect the files on disk."""
+        optimizer = StorageOptimizer([str(recordings_dir)], cache_dir=str(temp_dir / "cache"))
+        analytics = optimizer.analyze_storage()
+
+        assert analytics.total_files == 4
+        assert analytics.total_size == 6010
+        assert analytics.file_type_distribution[".hda"]["count"] == 2
+        assert analytics.file_type_distribution[".hda"]["avg_size"] == 1500
+        assert analytics.size_distribution["small"] == 4
+        assert analytics.age_distribution["recent"] == 4
+
+    @pytest.mark.unit
+    def test_unchanged_directories_are_skipped(self, temp_dir, recordings_dir):
+        """Test that a second scan only re-lists directories that changed."""
+        optimizer = StorageOptimizer([str(recordings_dir)], cache_dir=str(temp_dir / "cache"))
+        _age_directories(recordings_dir)
+        optimizer.analyze_storage()
+
+        stats = optimizer.scan_index.refresh(recordings_dir)
+        assert stats["directories_scanned"] == 0
+        assert stats["directories_skipped"] == 3
+
+        _write(recordings_dir / "2024" / "jan" / "d.wav", 500)
+        (recordings_dir / "a.hda").unlink()
+        stats = optimizer.scan_index.refresh(recordings_dir)
+        assert stats["directories_scanned"] == 2
+        assert stats["files_added"] == 1
+        assert stats["files_removed"] == 1
+
+        analytics = optimizer.analyze_storage()
+        assert analytics.total_files == 4
+        assert analytics.total_size == 5510
+        assert analytics.file_type_distribution[".hda"]["count"] == 1
+
+    @pytest.mark.unit
+    def test_removed_subtree_is_dropped(self, temp_dir, recordings_dir):
+        """Test that deleting a directory removes its files from the aggregates."""
+        optimizer = StorageOptimizer([str(recordings_dir)], cache_dir=str(temp_dir / "cache"))
+        optimizer.analyze_storage()
+
+        for path in (recordings_dir / "2024" / "jan").iterdir():
+            path.unlink()
+        (recordings_dir / "2024" / "jan").rmdir()
+
+        analytics = optimizer.analyze_storage()
+        assert analytics.total_files == 3
+        assert ".wav" not in analytics.file_type_distribution
+
+    @pytest.mark.unit
+    def test_progress_and_cancellation(self, temp_dir, recordings_dir):
+        """Test that progress is reported per directory and a cancelled scan can be resumed."""
+        optimizer = StorageOptimizer([str(recordings_dir)], cache_dir=str(temp_dir / "cache"))
+        updates = []
+
+        def cancel_after_first(stats):
+            updates.append(stats)
+            optimizer.cancel_analysis()
+
+        analytics = optimizer.analyze_storage(progress_callback=cancel_after_first)
+        assert len(updates) == 1
+        assert updates[0]["base_path"] == str(recordings_dir)
+        assert updates[0]["directories_scanned"] == 1
+        assert analytics.total_files == 1
+
+        updates.clear()
+        analytics = optimizer.analyze_storage(progress_callback=updates.append)
+        assert analytics.total_files == 4
+        assert len(updates) == 3
+
+
+class TestDuplicateDetection:
+    """Test cases for staged content-hash duplicate detection."""
+
+    @pytest.mark.unit
+    def test_renamed_copies_are_found(self, temp_dir):
+        """Test that copies are matched by content, not by name."""
+        root = temp_dir / "recordings"
+        payload = os.urandom(200 * 1024)
+        (root / "sub").mkdir(parents=True)
+        (root / "meeting.hda").write_bytes(payload)
+        (root / "sub" / "meeting (copy).hda").write_bytes(payload)
+        # Same name and size as the original but different content
+        (root / "sub" / "meeting.hda").write_bytes(payload[:-1] + b"x")
+
+        optimizer = StorageOptimizer([str(root)], cache_dir=str(temp_dir / "cache"))
+        analytics = optimizer.analyze_storage()
+
+        assert len(analytics.duplicate_files) == 1
+        _, paths = analytics.duplicate_files[0]
+        assert sorted(paths) == sorted([str(root / "meeting.hda"), str(root / "sub" / "meeting (copy).hda")])
+
+    @pytest.mark.unit
+    def test_edge_hash_avoids_full_reads(self, temp_dir):
+        """Test that files differing in their first block are never fully hashed."""
+        root = temp_dir / "recordings"
+        root.mkdir()
+        size = 4 * 1024 * 1024
+        (root / "a.wav").write_bytes(b"a" + b"\0" * (size - 1))
+        (root / "b.wav").write_bytes(b"b" + b"\0" * (size - 1))
+
+        optimizer = StorageOptimizer([str(root)], cache_dir=str(temp_dir / "cache"))
+        analytics = optimizer.analyze_storage()
+
+        assert analytics.duplicate_files == []
+        assert optimizer.duplicate_finder.bytes_read <= 4 * optimizer.duplicate_finder.EDGE_BYTES
+
+        # Hashes are cached, so a second analysis reads nothing
+        optimizer.analyze_storage()
+        assert optimizer.duplicate_finder.bytes_read <= 4 * optimizer.duplicate_finder.EDGE_BYTES
+
+    @pytest.mark.unit
+    def test_remove_duplicates_verifies_content(self, temp_dir):
+        """Test that a duplicate changed after analysis is not deleted."""
+        root = temp_dir / "recordings"
+        root.mkdir()
+        (root / "a.hda").write_bytes(b"same" * 1000)
+        (root / "b.hda").write_bytes(b"same" * 1000)
+
+        optimizer = StorageOptimizer([str(root)], cache_dir=str(temp_dir / "cache"))
+        analytics = optimizer.analyze_storage()
+        suggestion = optimizer.generate_optimization_suggestions(analytics)[0]
+        (duplicate,) = suggestion.files_affected
+        assert suggestion.potential_savings == 4000
+
+        with open(duplicate, "r+b") as f:
+            f.write(b"diff")
+
+        result = optimizer.execute_optimization(suggestion)
+        assert result["files_processed"] == 0
+        assert os.path.exists(duplicate)
+
+
+class TestStorageMonitor:
+    """Test cases for storage monitoring."""
+
+    @pytest.mark.unit
+    @pytest.mark.skipif(not INOTIFY_AVAILABLE, reason="inotify is Linux-only")
+    def test_inotify_refreshes_on_change(self, temp_dir):
+        """Test that creating a file triggers a debounced refresh without polling."""
+        monitor = StorageMonitor([str(temp_dir)], update_interval=3600, debounce_interval=0.05)
+        monitor.stop_monitoring()
+
+        refreshed = threading.Event()
+        original_update = monitor._update_storage_info
+
+        def tracking_update():
+            original_update()
+            refreshed.set()
+
+        monitor._update_storage_info = tracking_update
+        monitor.start_monitoring()
+        try:
+            assert monitor.event_driven
+            _write(temp_dir / "download.hda", 100)
+            assert refreshed.wait(timeout=5)
+        finally:
+            monitor.stop_monitoring()
+        assert not monitor.monitoring_thread.is_alive()
+
+    @pytest.mark.unit
+    @pytest.mark.skipif(not INOTIFY_AVAILABLE, reason="inotify is Linux-only")
+    def test_sqlite_journal_writes_are_ignored(self, temp_dir):
+        """Test that database side files do not trigger refreshes."""
+        monitor = StorageMonitor([str(temp_dir)], update_interval=3600, debounce_interval=0.05)
+        monitor.stop_monitoring()
+
+        refreshed = threading.Event()
+        monitor._update_storage_info = refreshed.set
+        monitor.start_monitoring()
+        try:
+            _write(temp_dir / "storage_optimization.db-journal", 100)
+            (temp_dir / "storage_optimization.db-journal").unlink()
+            assert not refreshed.wait(timeout=0.5)
+        finally:
+            monitor.stop_monitoring()
+
+    @pytest.mark.unit
+    def test_polling_fallback(self, temp_dir):
+        """Test that the monitor polls when inotify is disabled."""
+        monitor = StorageMonitor([str(temp_dir)], update_interval=3600, use_inotify=False)
+        try:
+            assert not monitor.event_driven
+            assert str(temp_dir) in monitor.get_storage_info()
+        finally:
+            monitor.stop_monitoring()
+
+
+class TestStorageUsageHistory:
+    """Test cases for usage time series and access tracking."""
+
+    @pytest.mark.unit
+    def test_growth_and_time_to_full(self, temp_dir):
+        """Test that growth is derived from samples and projected against capacity."""
+        history = StorageUsageHistory(temp_dir / "history.db", min_sample_interval=0)
+        now = time.time()
+        gigabyte = 1024**3
+        for day in range(10, -1, -1):
+            history.record_sample("disk_used", "/data", (50 - day) * gigabyte, 100 * gigabyte, now - day * 86400)
+
+        trend = history.get_growth_trend("disk_used", ["/data"])
+        assert trend["weekly"] == pytest.approx(7 * gigabyte, rel=0.05)
+        assert history.project_time_to_full("/data") == pytest.approx(50, rel=0.05)
+
+    @pytest.mark.unit
+    def test_samples_are_throttled(self, temp_dir):
+        """Test that samples closer than the minimum interval are dropped."""
+        history = StorageUsageHistory(temp_dir / "history.db", min_sample_interval=60)
+        assert history.record_sample("disk_used", "/data", 1, 10, 1000.0)
+        assert not history.record_sample("disk_used", "/data", 2, 10, 1030.0)
+        assert history.record_sample("disk_used", "/data", 3, 10, 1061.0)
+
+    @pytest.mark.unit
+    def test_configured_cache_dir_collects_all_accesses(self, temp_dir, recordings_dir):
+        """Test that accesses recorded without a cache_dir reach the configured optimizer database."""
+        set_storage_cache_dir(str(temp_dir / "cache"))
+        try:
+            played = recordings_dir / "2024" / "b.hda"
+            record_file_access(str(played), "playback")
+            optimizer = StorageOptimizer([str(recordings_dir)])
+            assert optimizer.cache_dir == temp_dir / "cache"
+            with sqlite3.connect(optimizer.db_path) as conn:
+                rows = conn.execute("SELECT file_path, access_count FROM file_tracking").fetchall()
+            assert rows == [(str(played), 1)]
+        finally:
+            set_storage_cache_dir(None)
+
+    @pytest.mark.unit
+    def test_access_patterns_and_eviction(self, temp_dir, recordings_dir):
+        """Test that recorded accesses drive access patterns and eviction order."""
+        optimizer = StorageOptimizer([str(recordings_dir)], cache_dir=str(temp_dir / "cache"))
+        old = time.time() - 200 * 86400
+        for path in recordings_dir.rglob("*"):
+            if path.is_file():
+                os.utime(path, (old, old))
+
+        played = recordings_dir / "2024" / "b.hda"
+        for _ in range(5):
+            record_file_access(str(played), "playback", cache_dir=str(temp_dir / "cache"))
+
+        analytics = optimizer.analyze_storage()
+        assert analytics.access_patterns["frequently_accessed"] == [str(played)]
+        assert str(played) not in analytics.access_patterns["never_accessed"]
+        assert str(played) not in analytics.access_patterns["cold_files"]
+        assert len(analytics.access_patterns["cold_files"]) == 3
+
+        monitor = StorageMonitor([str(recordings_dir)], use_inotify=False, usage_history=optimizer.usage_history)
+        try:
+            quota = StorageQuotaManager(
+                StorageQuota(10**12, 1000, 10**9, 365, False), monitor, storage_optimizer=optimizer
+            )
+            candidates = quota.get_eviction_candidates(bytes_needed=1)
+            assert len(candidates) == 1
+            assert candidates[0]["path"] != str(played)
+            assert "days_until_full" in quota.get_quota_status()
+        finally:
+            monitor.stop_monitoring()
@@ -0,0 +1,83 @@
+"""
+Tests for next-track prediction and preloading.
+"""
+
+import numpy as np
+import pytest
+from scipy.io import wavfile
+
+from audio_player_enhanced import AudioPlaylist, AudioTrack, RepeatMode
+from result_cache import ResultCache
+from speed_renditions import PLAYBACK_RATE, SpeedRenditionCache
+from track_preloader import TrackPreloader
+
+
+@pytest.fixture
+def recordings(temp_dir):
+    paths = []
+    for index in range(2):
+        path = temp_dir / f"track{index}.wav"
+        samples = np.random.default_rng(index).standard_normal(8000) * 3000
+        wavfile.write(str(path), 8000, samples.astype(np.int16))
+        paths.append(str(path))
+    return paths
+
+
+def _playlist(count):
+    playlist = AudioPlaylist()
+    playlist.tracks = [AudioTrack(filepath=f"track{index}.wav", title=str(index)) for index in range(count)]
+    playlist.current_index = 0
+    return playlist
+
+
+class TestPeekNextTrack:
+    def test_sequential_and_repeat(self):
+        playlist = _playlist(2)
+        assert playlist.peek_next_track() is playlist.tracks[1]
+        playlist.current_index = 1
+        assert playlist.peek_next_track() is None
+
+        playlist.repeat_mode = RepeatMode.ALL
+        assert playlist.peek_next_track() is playlist.tracks[0]
+        playlist.repeat_mode = RepeatMode.ONE
+        assert playlist.peek_next_track() is playlist.tracks[1]
+        assert playlist.current_index == 1
+
+    def test_shuffle_moves_to_peeked_track(self):
+        playlist = _playlist(6)
+        playlist.shuffle_enabled = True
+        for _ in range(20):
+            peeked = playlist.peek_next_track()
+            assert playlist.peek_next_track() is peeked
+            assert playlist.next_track() is peeked
+
+
+class TestTrackPreloader:
+    def test_prepares_in_memory_within_budget(self, recordings):
+        preloader = TrackPreloader()
+        assert preloader.get(recordings[0]) is None
+
+        prepared = preloader.preload(recordings[0]).result()
+        assert preloader.get(recordings[0]) is prepared
+        with open(recordings[0], "rb") as f:
+            assert prepared.data == f.read()
+
+        # Preloading another track replaces the first
+        preloader.preload(recordings[1]).result()
+        assert preloader.get(recordings[0]) is None
+        preloader.shutdown()
+
+    def test_large_tracks_stay_on_disk(self, recordings):
+        preloader = TrackPreloader(memory_budget=1024)
+        prepared = preloader.prepare(recordings[0])
+        assert prepared.data is None
+        assert prepared.source() == recordings[0]
+        preloader.shutdown()
+
+    def test_speed_uses_rendition(self, recordings, temp_dir):
+        renditions = SpeedRenditionCache(ResultCache(str(temp_dir / "cache")))
+        preloader = TrackPreloader(renditions)
+        prepared = preloader.prepare(recordings[0], 2.0)
+        assert prepared.playable_path == renditions.get(recordings[0], 2.0)
+        assert wavfile.read(prepared.source())[0] == PLAYBACK_RATE
+        preloader.shutdown()
@@ -0,0 +1,97 @@
+"""
+Tests for the waveform peak pyramid.
+"""
+
+import numpy as np
+import pytest
+from scipy.io import wavfile
+
+import waveform_peaks
+from audio_player_enhanced import AudioProcessor
+from result_cache import ResultCache
+from waveform_peaks import BASE_BUCKET, PeakPyramid, _cached_pyramid, get_peak_pyramid
+
+
+@pytest.fixture
+def recording(temp_dir):
+    """Five minutes of quiet noise at 8 kHz with one full-scale click."""
+    rng = np.random.default_rng(0)
+    samples = (rng.standard_normal(8000 * 300) * 300).astype(np.int16)
+    samples[1234567] = 32000
+    path = temp_dir / "rec.wav"
+    wavfile.write(str(path), 8000, samples)
+    return str(path), samples.astype(np.float32) / 32768.0
+
+
+class TestPeakPyramid:
+    """Test cases for PeakPyramid and its cache."""
+
+    @pytest.mark.unit
+    def test_levels_are_exact_and_block_independent(self, recording):
+        """Test that streamed levels match whole-signal peaks regardless of block size."""
+        _, audio = recording
+        whole = PeakPyramid.from_blocks([audio], 8000)
+        streamed = PeakPyramid.from_blocks(np.array_split(audio, 777), 8000)
+
+        assert len(whole.levels) > 3 and len(whole.levels[-1]) <= 256
+        for level_whole, level_streamed in zip(whole.levels, streamed.levels):
+            np.testing.assert_array_equal(level_whole, level_streamed)
+
+        buckets = audio[: len(audio) // BASE_BUCKET * BASE_BUCKET].reshape(-1, BASE_BUCKET)
+        np.testing.assert_array_equal(whole.levels[0][: len(buckets), 1], buckets.max(axis=1).astype(np.float16))
+        rms = np.sqrt(np.mean(buckets.astype(np.float64) ** 2, axis=1))
+        np.testing.assert_allclose(whole.levels[0][: len(buckets), 2], rms, rtol=1e-3)
+
+    @pytest.mark.unit
+    def test_viewport_keeps_transients(self, recording):
+        """Test that every zoom level shows the click that striding would skip."""
+        path, audio = recording
+        pyramid = PeakPyramid.from_file(path)
+        click_time = 1234567 / 8000
+
+        overview = pyramid.viewport(width=500)
+        assert len(overview.maxs) == 500
+        assert overview.maxs.max() == pytest.approx(32000 / 32768, rel=1e-3)
+
+        # Two seconds are fewer than 100 finest-level buckets, so those are returned as is
+        detail = pyramid.viewport(click_time - 1, click_time + 1, 100)
+        assert len(detail.maxs) <= 100
+        assert detail.seconds_per_point == BASE_BUCKET / 8000
+        assert detail.start_time <= click_time - 1
+        assert detail.maxs.max() == pytest.approx(32000 / 32768, rel=1e-3)
+
+        data, sample_rate = AudioProcessor.extract_waveform_data(path, 1000)
+        assert sample_rate == 8000 and len(data) == 1000
+        assert data.max() == pytest.approx(32000 / 32768, rel=1e-3)
+
+    @pytest.mark.unit
+    def test_pyramid_is_read_back_from_disk(self, recording, temp_dir, monkeypatch):
+        """Test that a second request is served from the sidecar cache without decoding."""
+        path, _ = recording
+        cache = ResultCache(str(temp_dir / "cache"))
+        first = get_peak_pyramid(path, cache=cache)
+        _cached_pyramid.cache_clear()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("decoded again")
+
+        monkeypatch.setattr(PeakPyramid, "from_file", fail)
+        second = get_peak_pyramid(path, cache=cache)
+
+        assert second.num_samples == first.num_samples and second.sample_rate == 8000
+        for level_first, level_second in zip(first.levels, second.levels):
+            np.testing.assert_array_equal(level_first, level_second)
+
+    @pytest.mark.unit
+    def test_formats_without_block_reader_are_decoded_whole(self, temp_dir, monkeypatch):
+        """Test that files soundfile cannot open (m4a) fall back to the full decoder."""
+        path = temp_dir / "rec.m4a"
+        path.write_bytes(b"\0\0\0\x18ftypM4A \0\0\0\0M4A mp42" + bytes(4096))
+        audio = np.sin(np.arange(8000 * 10) / 7.0).astype(np.float32)
+        decoded = []
+        monkeypatch.setattr(waveform_peaks, "load_audio", lambda file_path: decoded.append(file_path) or (audio, 8000))
+
+        pyramid = PeakPyramid.from_file(str(path))
+
+        assert decoded == [str(path)]
+        assert pyramid.num_samples == len(audio)
@@ -0,0 +1,129 @@
+"""
+Next-Track Preloading for the HiDock Desktop Application.
+
+Prepares the track a playlist will move to next while the current one plays,
+so the player can queue it behind the current track and switch without a gap:
+- HTA recordings are converted to WAV once, through the shared conversion cache
+- Playback at other speeds uses the complete speed rendition, rendered ahead
+- Prepared files up to the memory budget are read into memory, so starting
+  them does not wait on the disk; larger ones are played from the file
+Only the most recently requested track is kept, so memory use is bounded by
+one preloaded track.
+"""
+
+import io
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Tuple, Union
+
+from config_and_logger import logger
+from hta_converter import convert_hta_to_wav
+from speed_renditions import SpeedRenditionCache
+
+PRELOAD_MEMORY_BUDGET = 64 * 1024 * 1024  # Bytes of one prepared track held in memory
+
+
+@dataclass
+class PreparedTrack:
+    """A track ready to be handed to the mixer"""
+
+    filepath: str  # Playlist track
+    speed: float
+    playable_path: str  # Original, converted or speed rendition file
+    data: Optional[bytes] = None  # Contents of playable_path when within the memory budget
+
+    def source(self) -> Union[str, io.BytesIO]:
+        """Filename or in-memory file for pygame.mixer.music.load/queue"""
+        return io.BytesIO(self.data) if self.data is not None else self.playable_path
+
+    @property
+    def namehint(self) -> str:
+        return os.path.splitext(self.playable_path)[1].lstrip(".")
+
+
+class TrackPreloader:
+    """Prepares one upcoming track at a time on a background thread"""
+
+    def __init__(
+        self,
+        speed_renditions: Optional[SpeedRenditionCache] = None,
+        memory_budget: int = PRELOAD_MEMORY_BUDGET,
+    ):
+        self.speed_renditions = speed_renditions or SpeedRenditionCache()
+        self.memory_budget = memory_budget
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="track-preload")
+        self._lock = threading.Lock()
+        self._target: Optional[Tuple[str, float]] = None
+        self._future: Optional[Future] = None
+
+    def playable_source(self, filepath: str) -> str:
+        """File the mixer and decoders can read for a track; HTA recordings come from the conversion cache."""
+        if not filepath.lower().endswith(".hta"):
+            return filepath
+
+        converted = convert_hta_to_wav(filepath)
+        if not converted:
+            raise ValueError(f"Failed to convert HTA file {filepath}")
+        return converted
+
+    def prepare(self, filepath: str, speed: float = 1.0) -> PreparedTrack:
+        """Prepare a track synchronously."""
+        playable = self.playable_source(filepath)
+        if speed != 1.0:
+            playable = self.speed_renditions.render(playable, speed)
+
+        data = None
+        if os.path.getsize(playable) <= self.memory_budget:
+            with open(playable, "rb") as f:
+                data = f.read()
+        return PreparedTrack(filepath, speed, playable, data)
+
+    def preload(self, filepath: str, speed: float = 1.0) -> Future:
+        """Start preparing a track, replacing any other preloaded track."""
+        target = (os.path.abspath(filepath), round(speed, 3))
+        with self._lock:
+            if self._target == target and self._future is not None:
+                return self._future
+            if self._future is not None:
+                self._future.cancel()
+            self._target = target
+            self._future = self._executor.submit(self._prepare_logged, filepath, speed)
+            return self._future
+
+    def _prepare_logged(self, filepath: str, speed: float) -> Optional[PreparedTrack]:
+        try:
+            prepared = self.prepare(filepath, speed)
+            logger.info(
+                "TrackPreloader",
+                "preload",
+                f"Preloaded {os.path.basename(filepath)} at {speed}x"
+                + (" into memory" if prepared.data is not None else ""),
+            )
+            return prepared
+        except Exception as e:
+            logger.warning("TrackPreloader", "preload", f"Failed to preload {filepath}: {e}")
+            return None
+
+    def get(self, filepath: str, speed: float = 1.0) -> Optional[PreparedTrack]:
+        """The prepared track if it is the preloaded one and is ready, without waiting."""
+        with self._lock:
+            if self._target != (os.path.abspath(filepath), round(speed, 3)) or self._future is None:
+                return None
+            future = self._future
+        if not future.done() or future.cancelled():
+            return None
+        return future.result()
+
+    def clear(self):
+        """Drop the preloaded track."""
+        with self._lock:
+            if self._future is not None:
+                self._future.cancel()
+            self._target = None
+            self._future = None
+
+    def shutdown(self):
+        self.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -19,6 +19,7 @@ from typing import Any, Dict
 
 from ai_service import ai_service
 from config_and_logger import logger
+from storage_management import record_file_access
 
 # import base64  # Future: base64 encoding for audio data
 # import tempfile  # Future: temporary file operations
@@ -278,6 +279,8 @@ async def process_audio_file_for_insights(
         )
         return {"error": "Audio file not found."}
 
+    record_file_access(audio_file_path, "transcription")
+
     try:
         # Check if it's an HTA file and convert it first
         ext = os.path.splitext(audio_file_path)[1].lower()
@@ -331,21 +334,11 @@ async def process_audio_file_for_insights(
                 audio_file_path
             )
 
-    # Clean up temporary WAV file if created
-    if temp_wav_file and os.path.exists(temp_wav_file):
-        try:
-            os.remove(temp_wav_file)
-            logger.info(
-                "TranscriptionModule",
-                "process_audio_file",
-                f"Cleaned up temporary file: {temp_wav_file}",
-            )
-        except Exception as e:
-            logger.warning(
-                "TranscriptionModule",
-                "process_audio_file",
-                f"Could not clean up temporary file: {e}",
-            )
+    # Clean up temporary WAV file if created; cached conversions stay for the next feature
+    if temp_wav_file:
+        from hta_converter import get_hta_converter
+
+        get_hta_converter().cleanup_converted_file(temp_wav_file)
 
     return {
         "transcription": full_transcription,
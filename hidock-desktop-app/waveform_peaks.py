@@ -0,0 +1,217 @@
+"""
+Waveform Peak Pyramid for the HiDock Desktop Application.
+
+Summarizes a recording as min/max/RMS per bucket of samples at several zoom
+levels, so waveforms can be drawn for any viewport without decoding audio:
+- All levels are computed in one streaming pass over the file
+- Min/max peaks keep short transients visible at every zoom level, which
+  plain sample striding loses
+- Pyramids are stored as compact float16 sidecar arrays in the result cache,
+  keyed by the file's path, size and modification time
+"""
+
+import os
+import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from audio_loader import load_audio, open_audio_stream
+from config_and_logger import logger
+from result_cache import ResultCache, get_result_cache
+
+PEAK_VERSION = 1
+BASE_BUCKET = 256  # Samples per bucket at the finest level
+LEVEL_FACTOR = 4  # Buckets merged per bucket of the next level
+MIN_LEVEL_BUCKETS = 256  # Stop adding levels once one has no more buckets than this
+
+
+@dataclass
+class WaveformPeaks:
+    """Peaks of one viewport, one entry per display point"""
+
+    mins: np.ndarray
+    maxs: np.ndarray
+    rms: np.ndarray
+    start_time: float  # Seconds
+    seconds_per_point: float
+    sample_rate: int
+
+
+class PeakPyramid:
+    """Min/max/RMS summaries of a recording at BASE_BUCKET * LEVEL_FACTOR**level samples per bucket"""
+
+    def __init__(self, sample_rate: int, num_samples: int, levels: List[np.ndarray]):
+        self.sample_rate = sample_rate
+        self.num_samples = num_samples
+        self.levels = levels  # Each shaped (buckets, 3): min, max, rms
+
+    @property
+    def duration(self) -> float:
+        return self.num_samples / self.sample_rate if self.sample_rate else 0.0
+
+    @staticmethod
+    def bucket_size(level: int) -> int:
+        return BASE_BUCKET * LEVEL_FACTOR**level
+
+    @classmethod
+    def from_blocks(cls, blocks: Iterable[np.ndarray], sample_rate: int) -> "PeakPyramid":
+        """Build all levels from mono float blocks of any size."""
+        mins, maxs, sums = [], [], []
+        carry = np.zeros(0, dtype=np.float32)
+        num_samples = 0
+
+        for block in blocks:
+            num_samples += len(block)
+            if len(carry):
+                block = np.concatenate([carry, block])
+            whole = len(block) // BASE_BUCKET * BASE_BUCKET
+            buckets = block[:whole].reshape(-1, BASE_BUCKET)
+            if len(buckets):
+                mins.append(buckets.min(axis=1))
+                maxs.append(buckets.max(axis=1))
+                sums.append(np.einsum("ij,ij->i", buckets, buckets, dtype=np.float64))
+            carry = block[whole:]
+
+        counts_last = len(carry)
+        if counts_last:
+            mins.append(carry.min(keepdims=True))
+            maxs.append(carry.max(keepdims=True))
+            sums.append(np.array([np.dot(carry, carry)], dtype=np.float64))
+
+        if not mins:
+            return cls(sample_rate, 0, [np.zeros((0, 3), dtype=np.float16)])
+
+        mins = np.concatenate(mins)
+        maxs = np.concatenate(maxs)
+        sums = np.concatenate(sums)
+        counts = np.full(len(sums), BASE_BUCKET, dtype=np.int64)
+        if counts_last:
+            counts[-1] = counts_last
+
+        levels = []
+        while True:
+            levels.append(np.stack([mins, maxs, np.sqrt(sums / counts)], axis=1).astype(np.float16))
+            if len(mins) <= MIN_LEVEL_BUCKETS:
+                break
+            starts = np.arange(0, len(mins), LEVEL_FACTOR)
+            mins = np.minimum.reduceat(mins, starts)
+            maxs = np.maximum.reduceat(maxs, starts)
+            sums = np.add.reduceat(sums, starts)
+            counts = np.add.reduceat(counts, starts)
+
+        return cls(sample_rate, num_samples, levels)
+
+    @classmethod
+    def from_file(cls, file_path: str, block_size: int = 262144) -> "PeakPyramid":
+        """Build a pyramid in one pass over an audio file."""
+        try:
+            sample_rate, _, _, read_blocks = open_audio_stream(file_path, block_size)
+            return cls.from_blocks(read_blocks(), sample_rate)
+        except ValueError:
+            # Formats without a block reader are decoded whole
+            audio_data, sample_rate = load_audio(file_path)
+            return cls.from_blocks([audio_data], sample_rate)
+
+    def save(self, path: str):
+        np.savez(
+            path,
+            header=np.array([PEAK_VERSION, self.sample_rate, self.num_samples], dtype=np.int64),
+            **{f"level{index}": level for index, level in enumerate(self.levels)},
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "PeakPyramid":
+        with np.load(path) as data:
+            version, sample_rate, num_samples = (int(value) for value in data["header"])
+            if version != PEAK_VERSION:
+                raise ValueError(f"Unsupported peak file version {version}")
+            levels = [data[f"level{index}"] for index in range(len(data.files) - 1)]
+        return cls(sample_rate, num_samples, levels)
+
+    def viewport(self, start_time: float = 0.0, end_time: Optional[float] = None, width: int = 1000) -> WaveformPeaks:
+        """
+        Peaks for a time range at no more than width points
+
+        Uses the coarsest level that still has at least one bucket per
+        point, then merges buckets down to width points.
+        """
+        start = min(max(int(start_time * self.sample_rate), 0), self.num_samples)
+        end = self.num_samples if end_time is None else min(int(end_time * self.sample_rate), self.num_samples)
+        end = max(end, start)
+        samples_per_point = max((end - start) / max(width, 1), 1.0)
+
+        level = 0
+        while level + 1 < len(self.levels) and self.bucket_size(level + 1) <= samples_per_point:
+            level += 1
+        bucket = self.bucket_size(level)
+        first = start // bucket
+        last = -(-end // bucket)
+        data = self.levels[level][first:last].astype(np.float32)
+
+        if len(data) > width:
+            edges = np.unique(np.linspace(0, len(data), width + 1).astype(np.int64)[:-1])
+            counts = np.diff(np.append(edges, len(data)))
+            mins = np.minimum.reduceat(data[:, 0], edges)
+            maxs = np.maximum.reduceat(data[:, 1], edges)
+            rms = np.sqrt(np.add.reduceat(data[:, 2] ** 2, edges) / counts)
+        else:
+            mins, maxs, rms = data[:, 0], data[:, 1], data[:, 2]
+
+        points = max(len(mins), 1)
+        return WaveformPeaks(
+            mins=mins,
+            maxs=maxs,
+            rms=rms,
+            start_time=first * bucket / self.sample_rate if self.sample_rate else 0.0,
+            seconds_per_point=(last - first) * bucket / points / self.sample_rate if self.sample_rate else 0.0,
+            sample_rate=self.sample_rate,
+        )
+
+
+def get_peak_pyramid(file_path: str, use_cache: bool = True, cache: Optional[ResultCache] = None) -> PeakPyramid:
+    """
+    Peak pyramid of an audio file, computed once per file version
+
+    Pyramids are kept in memory and in the result cache under
+    ~/.hidock/cache, so only the first request for a file decodes it.
+    """
+    file_path = os.path.abspath(file_path)
+    stat = os.stat(file_path)
+    if not use_cache:
+        return PeakPyramid.from_file(file_path)
+    return _cached_pyramid(file_path, stat.st_mtime_ns, stat.st_size, cache)
+
+
+@lru_cache(maxsize=16)
+def _cached_pyramid(file_path: str, mtime_ns: int, size: int, cache: Optional[ResultCache]) -> PeakPyramid:
+    try:
+        cache = cache or get_result_cache()
+        key = ResultCache.make_key("waveform", PEAK_VERSION, file_path, mtime_ns, size)
+        cached = cache.get_file(key)
+        if cached:
+            return PeakPyramid.load(cached[0])
+    except Exception as e:
+        logger.warning("waveform_peaks", "_cached_pyramid", f"Peak cache unavailable: {e}")
+        cache = None
+
+    pyramid = PeakPyramid.from_file(file_path)
+    logger.info(
+        "waveform_peaks",
+        "_cached_pyramid",
+        f"Computed {len(pyramid.levels)} peak levels for {os.path.basename(file_path)}",
+    )
+
+    if cache is not None:
+        handle, temp_path = tempfile.mkstemp(suffix=".npz")
+        os.close(handle)
+        try:
+            pyramid.save(temp_path)
+            cache.put_file(key, temp_path)
+        except Exception as e:
+            logger.warning("waveform_peaks", "_cached_pyramid", f"Failed to cache peaks: {e}")
+        finally:
+            os.remove(temp_path)
+    return pyramid